@@ -1,23 +1,109 @@
 """Application factory with startup/shutdown lifecycle for the FastAPI project."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
-import torch
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
-from app.api import health, sentiment, stats
+from app.api import admin, health, metrics, sentiment, stats
+from app.core.admission import RequestBudgetMiddleware
+from app.core.cache import LRUTTLCache
 from app.core.config import settings
 from app.core.context import context
+from app.core.exceptions import (
+    ModelNotReadyError,
+    OverloadedError,
+    RequestAbandonedError,
+)
 from app.core.logger import configure_logger
-from app.core.security import API_KEY_NAME
-from app.db.mongo import get_mongo_client
+from app.core.metrics import monitor_event_loop_lag
+from app.core.security import ADMIN_KEY_NAME, API_KEY_NAME
+from app.db.mongo import ensure_indexes, get_mongo_client, warm_up_connections
+from app.repositories.review_repository import ReviewWriteBuffer
+from app.services.registry import DEFAULT_MODEL, LoadedModel, ModelRegistry
+from app.services.stats import invalidate_sentiment_stats
 
 # Initialize logger
 logger = configure_logger(settings.log_level)
 
+# Seconds between attempts to create the MongoDB indexes
+INDEX_RETRY_SECONDS = 5.0
+
+
+async def _ensure_indexes(db) -> None:
+    """
+    Create the MongoDB indexes in the background so startup never waits on it,
+    retrying until they exist: readiness waits for them, so no write is
+    accepted without the unique rollup index.
+    """
+    while True:
+        try:
+            await ensure_indexes(db)
+            logger.info("MongoDB indexes ensured.")
+            return
+        except Exception as e:
+            logger.error(
+                f"Failed to ensure MongoDB indexes, retrying in "
+                f"{INDEX_RETRY_SECONDS:.0f}s: {e}"
+            )
+            await asyncio.sleep(INDEX_RETRY_SECONDS)
+
+
+async def _warm_up_connections(client: AsyncIOMotorClient) -> None:
+    """
+    Open MongoDB pool connections in the background while the model loads.
+    """
+    try:
+        await warm_up_connections(client, settings.mongo_warmup_connections)
+        logger.info("MongoDB connection pool warmed up.")
+    except Exception as e:
+        logger.error(f"Failed to warm up MongoDB connections: {e}")
+
+
+def _use_default_model(loaded: LoadedModel) -> None:
+    """
+    Point the context at a new version of the default model.
+
+    Called by the registry on the event loop, so requests see either the old
+    version or the new one, never a mix of both.
+    """
+    if loaded.name != DEFAULT_MODEL:
+        return
+
+    context.model = loaded.model
+    context.tokenizer = loaded.tokenizer
+    context.device = loaded.device
+    context.engine = loaded.engine
+    context.model_version = loaded.namespace
+
+
+async def _start_inference(indexes_task: asyncio.Task) -> None:
+    """
+    Load the default model, start its batching engine and warm it up in the
+    background.
+
+    The registry imports torch and transformers on first load rather than at
+    module level, and the blocking load runs in a thread, so the server accepts
+    connections (and answers liveness probes) while the model is still loading.
+
+    Readiness also waits for the MongoDB indexes, so no review is stored (and
+    no rollup upserted) before the unique rollup index exists.
+
+    Args:
+        indexes_task (asyncio.Task): Background creation of the indexes.
+    """
+    try:
+        await context.get_registry().get(DEFAULT_MODEL)
+        await indexes_task
+        context.model_state = "ready"
+        logger.info("Model ready to serve predictions.")
+    except Exception as e:
+        context.model_state = "failed"
+        logger.exception(f"Failed to load the model: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -27,32 +113,83 @@ async def lifespan(app: FastAPI):
     This function is called on startup and shutdown of the app.
 
     - Initializes MongoDB connection and stores it in the global context.
-    - Loads a pre-trained sentiment analysis model from HuggingFace Transformers.
-    - Sets device to CUDA (GPU) if available, otherwise CPU.
+    - Ensures the MongoDB indexes needed by the queries and opens the pool
+      connections ahead of traffic (both in the background).
+    - Loads the default sentiment model in the background (CUDA if available,
+      optionally quantized), starts the micro-batching inference engine in front
+      of it and warms it up with synthetic batches; readiness flips once it is
+      done and the indexes exist. Other registered models are loaded on first use.
+    - Creates the prediction cache for repeated review texts.
+    - Creates the per-product stats response cache.
+    - Starts the review write-behind buffer when enabled, and drains it on
+      shutdown before the MongoDB connection is closed.
+    - Starts the event-loop lag monitor exported on /metrics.
+    - Flushes queued log records on shutdown.
     """
     # BD set up
     client: AsyncIOMotorClient = get_mongo_client()
     db = client[settings.db_name]
     context.db = db
     logger.info("MongoDB connection established.")
+    indexes_task = asyncio.create_task(_ensure_indexes(db))
+    warmup_task = asyncio.create_task(_warm_up_connections(client))
+
+    # Load ML model without blocking startup; other models load on first use
+    context.registry = ModelRegistry(
+        {DEFAULT_MODEL: settings.model_name, **settings.models},
+        memory_budget_bytes=int(settings.model_memory_budget_mb * 2**20),
+        warmup_batch_sizes=settings.model_warmup_batch_sizes,
+        on_swap=_use_default_model,
+        allowed_models=settings.admin_allowed_models,
+    )
+    context.model_state = "loading"
+    model_task = asyncio.create_task(_start_inference(indexes_task))
+
+    context.prediction_cache = LRUTTLCache(
+        max_entries=settings.prediction_cache_max_entries,
+        max_bytes=settings.prediction_cache_max_bytes,
+        ttl_seconds=settings.prediction_cache_ttl_seconds,
+    )
+    context.stats_cache = LRUTTLCache(
+        max_entries=settings.stats_cache_max_entries,
+        max_bytes=settings.stats_cache_max_bytes,
+        ttl_seconds=settings.stats_cache_ttl_seconds,
+    )
 
-    # Load ML model
-    logger.info(f"Loading model: {settings.model_name}")
-    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
-    model = AutoModelForSequenceClassification.from_pretrained(settings.model_name)
-    model.eval()
+    if settings.review_write_mode == "write_behind":
+        context.review_writer = ReviewWriteBuffer(
+            db,
+            max_batch_size=settings.write_buffer_max_batch,
+            flush_interval_ms=settings.write_buffer_flush_ms,
+            max_pending=settings.write_buffer_max_pending,
+            on_flush=lambda product_ids: invalidate_sentiment_stats(*product_ids),
+        )
+        await context.review_writer.start()
+        logger.info("Review write-behind buffer started.")
 
-    # Inject into global context
-    context.tokenizer = tokenizer
-    context.model = model
-    context.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    logger.info(f"Model loaded on device: {context.device}")
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
 
     yield
 
+    lag_monitor.cancel()
+    model_task.cancel()
+    await asyncio.gather(model_task, return_exceptions=True)
+    await context.registry.close()
+    if context.review_writer is not None:
+        await context.review_writer.stop()
+        logger.info(
+            f"Review write buffer drained: {context.review_writer.written} stored, "
+            f"{context.review_writer.failed} failed"
+        )
+    logger.info(f"Prediction cache stats: {context.prediction_cache.stats()}")
+    indexes_task.cancel()
+    warmup_task.cancel()
     client.close()
     logger.info("MongoDB connection closed")
 
+    # Flush log records still queued for the background writer
+    await logger.complete()
+
 
 def create_app() -> FastAPI:
     """
@@ -80,10 +217,38 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    @app.exception_handler(ModelNotReadyError)
+    async def model_not_ready_handler(request: Request, exc: ModelNotReadyError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "5"},
+        )
+
+    @app.exception_handler(OverloadedError)
+    async def overloaded_handler(request: Request, exc: OverloadedError):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(RequestAbandonedError)
+    async def request_abandoned_handler(request: Request, exc: RequestAbandonedError):
+        return JSONResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            content={"detail": str(exc)},
+        )
+
+    # Track each request's deadline and client connection for load shedding
+    app.add_middleware(RequestBudgetMiddleware)
+
     # Register API routers
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(sentiment.router)
     app.include_router(stats.router)
+    app.include_router(admin.router)
 
     # Customize OpenAPI to support API Key header
     def custom_openapi():
@@ -104,7 +269,12 @@ def create_app() -> FastAPI:
                 "type": "apiKey",
                 "in": "header",
                 "name": API_KEY_NAME,
-            }
+            },
+            "AdminKeyHeader": {
+                "type": "apiKey",
+                "in": "header",
+                "name": ADMIN_KEY_NAME,
+            },
         }
 
         for path in openapi_schema["paths"].values():
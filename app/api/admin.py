@@ -0,0 +1,125 @@
+"""API routes for reloading and rolling back models without downtime."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Path, status
+
+from app.core.exceptions import ErrorResponse
+from app.core.security import verify_admin_key
+from app.models.admin import ModelReloadRequest, ModelStatus
+from app.services.admin import list_models, reload_model, rollback_model
+
+router = APIRouter()
+
+
+@router.get(
+    "/admin/models",
+    response_model=List[ModelStatus],
+    status_code=status.HTTP_200_OK,
+    tags=["Admin"],
+    summary="List the registered models",
+    description="""
+Returns every registered model with its state, the version currently serving and
+the status of its last reload.
+
+Authentication via admin key (`X-Admin-Key`) is required.
+""",
+    responses={
+        401: {"model": ErrorResponse, "description": "Missing or invalid admin key."},
+    },
+    dependencies=[Depends(verify_admin_key)],
+)
+async def get_models() -> List[ModelStatus]:
+    """
+    Describe every registered model.
+
+    Returns:
+        List[ModelStatus]: State and versions of each model.
+    """
+    return list_models()
+
+
+@router.post(
+    "/admin/models/{name}/reload",
+    response_model=ModelStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Admin"],
+    summary="Reload a model without downtime",
+    description="""
+Loads a new version of a model in the **background**, warms it up and swaps it in.
+
+### Input (optional):
+- `model_id` (string): Model to load; the current one is reloaded if omitted.
+  Only the registered models (`MODEL_NAME`, `MODELS`) and `ADMIN_ALLOWED_MODELS`
+  are accepted
+
+### Notes:
+- The current version keeps serving until the new one is ready; requests already
+  queued on it finish on the old version
+- Predictions cached for the old version are never served for the new one
+- Both versions are held in memory while the new one loads
+- Poll `GET /admin/models` for the outcome; a failed reload leaves the current
+  version in place and reports the `error`
+- Authentication via admin key (`X-Admin-Key`) is required
+""",
+    responses={
+        202: {"description": "Reload started."},
+        401: {"model": ErrorResponse, "description": "Missing or invalid admin key."},
+        403: {"model": ErrorResponse, "description": "The model is not allowed."},
+        404: {"model": ErrorResponse, "description": "Unknown model name."},
+        409: {"model": ErrorResponse, "description": "A reload is in progress."},
+    },
+    dependencies=[Depends(verify_admin_key)],
+)
+async def post_model_reload(
+    payload: Optional[ModelReloadRequest] = None,
+    name: str = Path(..., max_length=50, description="Registered model name."),
+) -> ModelStatus:
+    """
+    Start reloading a model in the background.
+
+    Args:
+        payload (Optional[ModelReloadRequest]): The model version to load.
+        name (str): Registered model name.
+
+    Returns:
+        ModelStatus: State of the model once the reload has started.
+    """
+    return reload_model(name, payload.model_id if payload else None)
+
+
+@router.post(
+    "/admin/models/{name}/rollback",
+    response_model=ModelStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Admin"],
+    summary="Roll a model back to its previous version",
+    description="""
+Reloads, without downtime, the version a model had before its last reload.
+
+Authentication via admin key (`X-Admin-Key`) is required.
+""",
+    responses={
+        202: {"description": "Rollback started."},
+        401: {"model": ErrorResponse, "description": "Missing or invalid admin key."},
+        404: {"model": ErrorResponse, "description": "Unknown model name."},
+        409: {
+            "model": ErrorResponse,
+            "description": "No previous version, or a reload is in progress.",
+        },
+    },
+    dependencies=[Depends(verify_admin_key)],
+)
+async def post_model_rollback(
+    name: str = Path(..., max_length=50, description="Registered model name."),
+) -> ModelStatus:
+    """
+    Start restoring the previous version of a model.
+
+    Args:
+        name (str): Registered model name.
+
+    Returns:
+        ModelStatus: State of the model once the rollback has started.
+    """
+    return rollback_model(name)
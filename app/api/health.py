@@ -1,23 +1,24 @@
-"""Health check endpoint for the API."""
+"""Liveness and readiness endpoints for the API."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 
-from app.models.health import HealthResponse
+from app.models.health import HealthResponse, ReadinessResponse
+from app.services.health import check_readiness
 
 router = APIRouter()
 
 
 @router.get(
-    "/health",
+    "/health/live",
     response_model=HealthResponse,
     tags=["Health"],
-    summary="Health check for API availability",
+    summary="Liveness check for API availability",
     description="""
-Returns the health status of the API.
+Returns the health status of the API process.
 
-Useful for:
-- Readiness/liveness checks in production
-- Monitoring from orchestrators (e.g., Kubernetes)
+Answers as soon as the server is up, even while the model is still loading, so
+orchestrators (e.g., Kubernetes liveness probes) do not restart a pod that is
+warming up. `/health` is kept as an alias.
 
 ### Response:
 ``` json
@@ -28,8 +29,52 @@ Useful for:
 
 This endpoint does not require authentication.""",
 )
+@router.get("/health", response_model=HealthResponse, include_in_schema=False)
 async def health_check():
     """
     Returns a simple confirmation that the API is up and running.
     """
     return HealthResponse(status="healthy")
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    tags=["Health"],
+    summary="Readiness check for serving predictions",
+    description="""
+Reports whether this instance should receive traffic.
+
+Checks that:
+- `model`: the model is loaded and warmed up with synthetic batches
+- `mongo`: MongoDB answers a ping within `READINESS_MONGO_TIMEOUT_MS`
+- `queue`: the inference queue is below `READINESS_MAX_QUEUE_RATIO` of its capacity
+
+Returns **200** when every check passes and **503** otherwise, so load balancers
+only route to warm, unsaturated instances.
+
+### Response:
+``` json
+{
+"status": "ready",
+"checks": {
+    "model": {"ok": true, "detail": "ready"},
+    "mongo": {"ok": true, "detail": "ping 0.8 ms"},
+    "queue": {"ok": true, "detail": "3/1024 queued"}
+}
+}
+```
+
+This endpoint does not require authentication.""",
+    responses={
+        503: {"model": ReadinessResponse, "description": "A readiness check failed."}
+    },
+)
+async def readiness_check(response: Response):
+    """
+    Returns the result of the readiness checks.
+    """
+    readiness = await check_readiness()
+    if readiness.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
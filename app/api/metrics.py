@@ -0,0 +1,37 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.core.metrics import metrics_registry
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    tags=["Health"],
+    summary="Prometheus metrics",
+    description="""
+Exposes the service metrics in the Prometheus text format.
+
+Includes:
+- Per-stage latency histograms of sentiment requests (`predict`, `store`) and of
+  the inference engine (`queue_wait`, `tokenization`, `forward`)
+- MongoDB stats query latency
+- Inference batch sizes, queue depth and padding efficiency
+- Prediction and stats cache hits/misses
+- Event-loop lag
+
+Under `python -m app.serve`, latency histograms and counters are aggregated over
+every worker; queue depth, padding efficiency, model and cache state describe the
+worker answering the scrape.
+
+This endpoint does not require authentication.""",
+)
+async def get_metrics() -> Response:
+    """
+    Render every registered metric in the Prometheus exposition format.
+    """
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
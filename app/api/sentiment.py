@@ -1,11 +1,23 @@
 """API route for sentiment analysis."""
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
 
+from app.core.config import settings
+from app.core.context import context
 from app.core.exceptions import ErrorResponse, bad_request_exception
 from app.core.security import verify_api_key
-from app.models.review import ReviewRequest, ReviewResponse
-from app.services.sentiment import analyze_and_store_sentiment
+from app.models.review import (
+    BatchReviewRequest,
+    BatchReviewResponse,
+    ReviewRequest,
+    ReviewResponse,
+)
+from app.services.sentiment import (
+    analyze_and_store_sentiment,
+    analyze_and_store_sentiment_batch,
+    analyze_and_store_sentiment_stream,
+)
 
 router = APIRouter()
 
@@ -39,6 +51,17 @@ Analyze the **sentiment** of a product review and store the result in the databa
             "description": "The review field is empty or invalid.",
         },
         401: {"model": ErrorResponse, "description": "Missing or invalid API key."},
+        429: {
+            "model": ErrorResponse,
+            "description": "The inference backlog is too long; retry after "
+            "`Retry-After` seconds.",
+        },
+        503: {"model": ErrorResponse, "description": "The model is still loading."},
+        504: {
+            "model": ErrorResponse,
+            "description": "The `X-Request-Deadline-Ms` deadline passed before "
+            "the review was analyzed.",
+        },
     },
     dependencies=[Depends(verify_api_key)],
 )
@@ -59,3 +82,144 @@ async def predict_sentiment(payload: ReviewRequest) -> ReviewResponse:
         raise bad_request_exception("Review text cannot be empty.")
 
     return await analyze_and_store_sentiment(payload)
+
+
+@router.post(
+    "/reviews/sentiment/batch",
+    response_model=BatchReviewResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Sentiment"],
+    summary="Analyze the sentiment of several product reviews",
+    description="""
+Analyze a **batch** of product reviews in one call and store all the results.
+
+### Input:
+- `reviews` (list): Items with the same shape as `POST /reviews/sentiment`
+
+### Output:
+- `results`: One entry per review, in request order, with either:
+  - `result`: The predicted `sentiment` and `confidence`
+  - `error`: Why that review could not be analyzed or stored
+
+### Notes:
+- Reviews are classified together and stored with a single bulk insert
+- A failing review does not fail the rest of the batch
+- The maximum number of reviews per call is configurable (`BATCH_REQUEST_MAX_ITEMS`)
+- Authentication via API key (`X-API-Key`) is required
+""",
+    responses={
+        201: {"description": "Batch processed; see per-review results."},
+        400: {
+            "model": ErrorResponse,
+            "description": "The batch is empty or exceeds the maximum size.",
+        },
+        401: {"model": ErrorResponse, "description": "Missing or invalid API key."},
+        429: {
+            "model": ErrorResponse,
+            "description": "The inference backlog is too long for every review "
+            "of the batch; retry after `Retry-After` seconds. When only some "
+            "models are overloaded, their reviews fail individually.",
+        },
+        503: {"model": ErrorResponse, "description": "The model is still loading."},
+        504: {
+            "model": ErrorResponse,
+            "description": "The `X-Request-Deadline-Ms` deadline passed before "
+            "the review was analyzed.",
+        },
+    },
+    dependencies=[Depends(verify_api_key)],
+)
+async def predict_sentiment_batch(payload: BatchReviewRequest) -> BatchReviewResponse:
+    """
+    Analyze the sentiment of a batch of reviews and store the results.
+
+    Args:
+        payload (BatchReviewRequest): The reviews to analyze.
+
+    Returns:
+        BatchReviewResponse: Per-review predictions or errors.
+
+    Raises:
+        HTTPException (400): If the batch exceeds the configured maximum size.
+    """
+    if len(payload.reviews) > settings.batch_request_max_items:
+        raise bad_request_exception(
+            f"A batch cannot contain more than "
+            f"{settings.batch_request_max_items} reviews."
+        )
+
+    return await analyze_and_store_sentiment_batch(payload.reviews)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response that can be sent while the request body is still being read.
+
+    Starlette's ``StreamingResponse`` listens for disconnects by consuming
+    ``receive`` messages, which would steal the body chunks of a duplex upload.
+    Disconnects surface here through ``Request.stream()`` instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+@router.post(
+    "/reviews/sentiment/stream",
+    response_class=NDJSONStreamingResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["Sentiment"],
+    summary="Analyze a stream of product reviews (NDJSON)",
+    description="""
+Analyze a **newline-delimited JSON** stream of product reviews and store the results.
+
+### Input (`Content-Type: application/x-ndjson`):
+One review per line, with the same shape as `POST /reviews/sentiment`:
+```
+{"product_id": "SKU-98765", "review": "Great product, really love it!"}
+{"product_id": "SKU-12345", "review": "Stopped working after a week."}
+```
+
+### Output (`application/x-ndjson`):
+One line per input line, streamed back as soon as its chunk is processed:
+```
+{"index": 0, "result": {"sentiment": "positive", "confidence": 0.99}, "error": null}
+{"index": 1, "result": {"sentiment": "negative", "confidence": 0.97}, "error": null}
+```
+
+### Notes:
+- The body is parsed incrementally and processed in fixed-size chunks
+  (`STREAM_CHUNK_SIZE`), so memory use does not grow with the upload size
+- Invalid lines are reported in their own result and do not stop the stream
+- Chunks refused by admission control, or past the `X-Request-Deadline-Ms`
+  deadline, are reported as per-line errors
+- Authentication via API key (`X-API-Key`) is required
+""",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Stream of per-review results.",
+        },
+        401: {"model": ErrorResponse, "description": "Missing or invalid API key."},
+        503: {"model": ErrorResponse, "description": "The model is still loading."},
+    },
+    dependencies=[Depends(verify_api_key)],
+)
+async def predict_sentiment_stream(request: Request) -> NDJSONStreamingResponse:
+    """
+    Analyze an NDJSON stream of reviews and stream the results back.
+
+    Args:
+        request (Request): FastAPI request object carrying the NDJSON body.
+
+    Returns:
+        NDJSONStreamingResponse: One JSON result per input line.
+
+    Raises:
+        ModelNotReadyError: If the model is not ready, before streaming starts.
+    """
+    context.get_engine()
+
+    return NDJSONStreamingResponse(analyze_and_store_sentiment_stream(request.stream()))
@@ -1,15 +1,51 @@
 """API route for fwtching product-level sentiment stats."""
 
-from fastapi import APIRouter, Depends, Path, status
+import hashlib
+from datetime import datetime
+from typing import Literal, Optional, Union
 
-from app.core.exceptions import ErrorResponse
-from app.core.security import verify_api_key
-from app.models.stats import SentimentStatsResponse
-from app.services.stats import compute_sentiment_stats_by_product
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
+
+from app.core.config import settings
+from app.core.exceptions import ErrorResponse, bad_request_exception
+from app.core.security import API_KEY_NAME, verify_api_key
+from app.models.stats import (
+    BulkStatsRequest,
+    BulkStatsResponse,
+    SentimentStatsResponse,
+    SentimentTrendResponse,
+)
+from app.services.stats import (
+    compute_sentiment_stats_bulk,
+    compute_sentiment_stats_by_product,
+    compute_sentiment_trend,
+)
 
 router = APIRouter()
 
 
+def _cache_headers(stats: SentimentStatsResponse) -> dict:
+    """
+    Build the HTTP caching headers (ETag, Cache-Control, Vary) for a stats body.
+    """
+    digest = hashlib.sha1(stats.model_dump_json().encode("utf-8")).hexdigest()
+    return {
+        "ETag": f'"{digest}"',
+        "Cache-Control": f"max-age={int(settings.stats_cache_ttl_seconds)}",
+        "Vary": API_KEY_NAME,
+    }
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header (possibly a list of weak tags) against an ETag.
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get(
     "/reviews/stats/{product_id}",
     response_model=SentimentStatsResponse,
@@ -34,11 +70,17 @@ Returns the **sentiment distribution** for all reviews associated with a given p
 }
 ```
 
+### Caching:
+- Responses carry an `ETag` and a short `Cache-Control: max-age`
+- Send the ETag back in `If-None-Match` to get a `304 Not Modified` when the
+  stats did not change
+
 ### Note:
 - Authentication via API key (`X-API-Key`) is required
     """,
     responses={
         200: {"description": "Sentiment statistics successfully retrieved."},
+        304: {"description": "Stats unchanged since the ETag sent in If-None-Match."},
         404: {
             "model": ErrorResponse,
             "description": "No reviews found for this product.",
@@ -48,19 +90,167 @@ Returns the **sentiment distribution** for all reviews associated with a given p
     dependencies=[Depends(verify_api_key)],
 )
 async def get_stats(
-    product_id: str = Path(..., description="ID of the product to fetch stats for")
-) -> SentimentStatsResponse:
+    request: Request,
+    response: Response,
+    product_id: str = Path(..., description="ID of the product to fetch stats for"),
+) -> Union[SentimentStatsResponse, Response]:
     """
     Get sentiment distribution (positive/neutral/negative) for a given product.
 
     Args:
         request (Request): FastAPI request object.
+        response (Response): Outgoing response, used to set caching headers.
         product_id (str): ID of the product.
 
     Returns:
-        SentimentStatsResponse: Stats grouped by sentiment label.
+        SentimentStatsResponse: Stats grouped by sentiment label, or an empty
+        304 response if the client's ETag is still current.
 
     Raises:
         404: If no reviews are found for the given product.
     """
-    return await compute_sentiment_stats_by_product(product_id)
+    stats = await compute_sentiment_stats_by_product(product_id)
+    headers = _cache_headers(stats)
+
+    if _etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return stats
+
+
+@router.get(
+    "/reviews/stats/{product_id}/trend",
+    response_model=SentimentTrendResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get sentiment over time by product",
+    tags=["Sentiment"],
+    description="""
+Returns the **sentiment distribution per hour or day** for a given product.
+
+**Path parameter:**
+- `product_id`: The ID of the product to compute the trend for
+
+**Query parameters:**
+- `granularity`: `hour` (default) or `day`
+- `from`: Start of the range, ISO 8601 (defaults to 24 hours / 30 days before `to`)
+- `to`: End of the range, exclusive, ISO 8601 (defaults to now)
+
+Naive timestamps are taken as UTC and buckets are aligned to UTC hours/days.
+
+**Example response:**
+```json
+{
+  "product_id": "SKU-98765",
+  "granularity": "hour",
+  "buckets": [
+    {"start": "2025-01-01T13:00:00Z", "total": 42,
+     "positive": 0.75, "neutral": 0.15, "negative": 0.10}
+  ]
+}
+```
+
+### Notes:
+- Read from hourly/daily rollups updated as reviews are stored, so the cost
+  does not depend on how many reviews the product has
+- Buckets without reviews are omitted
+- Only reviews stored with an ingestion time are counted
+- Authentication via API key (`X-API-Key`) is required
+    """,
+    responses={
+        200: {"description": "Sentiment trend successfully retrieved."},
+        400: {
+            "model": ErrorResponse,
+            "description": "The range is empty or spans too many buckets.",
+        },
+        401: {"model": ErrorResponse, "description": "Missing or invalid API key."},
+    },
+    dependencies=[Depends(verify_api_key)],
+)
+async def get_trend(
+    product_id: str = Path(..., description="ID of the product to fetch the trend for"),
+    granularity: Literal["hour", "day"] = Query("hour", description="Bucket width."),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start."),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end."),
+) -> SentimentTrendResponse:
+    """
+    Get the sentiment distribution per time bucket for a given product.
+
+    Args:
+        product_id (str): ID of the product.
+        granularity (str): "hour" or "day".
+        start (Optional[datetime]): Start of the range.
+        end (Optional[datetime]): End of the range (exclusive).
+
+    Returns:
+        SentimentTrendResponse: Sentiment distribution per bucket, oldest first.
+
+    Raises:
+        400: If the range is empty or spans too many buckets.
+    """
+    return await compute_sentiment_trend(product_id, granularity, start, end)
+
+
+@router.post(
+    "/reviews/stats/bulk",
+    response_model=BulkStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get sentiment stats for several products",
+    tags=["Sentiment"],
+    description="""
+Returns the **sentiment distribution** of several products in one call.
+
+**Body:**
+```json
+{"product_ids": ["SKU-98765", "SKU-12345"]}
+```
+
+**Example response:**
+```json
+{
+  "stats": {
+    "SKU-98765": {"product_id": "SKU-98765",
+                  "positive": 0.70, "neutral": 0.15, "negative": 0.15}
+  },
+  "missing": ["SKU-12345"]
+}
+```
+
+### Notes:
+- All products are resolved with a single `$in` query instead of one query each
+- Products without reviews are listed in `missing` instead of failing with 404
+- The maximum number of products per call is configurable
+  (`BULK_STATS_MAX_PRODUCTS`)
+- Authentication via API key (`X-API-Key`) is required
+    """,
+    responses={
+        200: {"description": "Sentiment statistics successfully retrieved."},
+        400: {
+            "model": ErrorResponse,
+            "description": "Too many product IDs.",
+        },
+        401: {"model": ErrorResponse, "description": "Missing or invalid API key."},
+    },
+    dependencies=[Depends(verify_api_key)],
+)
+async def post_bulk_stats(payload: BulkStatsRequest) -> BulkStatsResponse:
+    """
+    Get the sentiment distribution of several products.
+
+    Args:
+        payload (BulkStatsRequest): The product IDs to look up.
+
+    Returns:
+        BulkStatsResponse: Stats by product ID and the products without reviews.
+
+    Raises:
+        HTTPException (400): If more than the configured maximum of products
+            is requested.
+    """
+    if len(payload.product_ids) > settings.bulk_stats_max_products:
+        raise bad_request_exception(
+            f"A bulk stats request cannot contain more than "
+            f"{settings.bulk_stats_max_products} products."
+        )
+
+    return await compute_sentiment_stats_bulk(payload.product_ids)
@@ -0,0 +1,127 @@
+"""Per-request deadlines and client disconnect tracking for load shedding."""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Header carrying the time (in milliseconds) the client is willing to wait
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+
+class RequestBudget:
+    """
+    How long a request may still run, and whether its client is still there.
+
+    Queued inference work checks its request's budget right before the
+    forward pass, and is dropped once the budget is spent.
+
+    Attributes:
+        deadline (Optional[float]): ``time.monotonic()`` value after which the
+            client no longer wants the response (None = no deadline).
+        disconnected (bool): Whether the client closed the connection.
+    """
+
+    __slots__ = ("deadline", "disconnected")
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self.disconnected = False
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed.
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def abandoned_reason(self) -> Optional[str]:
+        """
+        "disconnected" or "deadline" if the work is no longer wanted, else None.
+        """
+        if self.disconnected:
+            return "disconnected"
+        if self.expired:
+            return "deadline"
+        return None
+
+
+# Budget of the request being handled (None outside HTTP requests)
+current_budget: ContextVar[Optional[RequestBudget]] = ContextVar(
+    "current_budget", default=None
+)
+
+
+class RequestBudgetMiddleware:
+    """
+    ASGI middleware attaching a ``RequestBudget`` to every HTTP request.
+
+    The deadline is read from the ``X-Request-Deadline-Ms`` header. Once the
+    request body has been read, a background task keeps listening on the
+    connection so a client disconnect is noticed while the request waits for
+    inference. The handler itself is never cancelled, so a database write in
+    progress is not interrupted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            budget = RequestBudget(_parse_deadline(scope))
+        except ValueError:
+            response = JSONResponse(
+                {"detail": f"{DEADLINE_HEADER} must be a positive number."},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        body_read = asyncio.Event()
+
+        async def tracked_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                budget.disconnected = True
+            elif not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        async def watch_disconnect() -> None:
+            await body_read.wait()
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            budget.disconnected = True
+
+        token = current_budget.set(budget)
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await self.app(scope, tracked_receive, send)
+        finally:
+            watcher.cancel()
+            current_budget.reset(token)
+
+
+def _parse_deadline(scope: Scope) -> Optional[float]:
+    """
+    Turn the deadline header of a request into a ``time.monotonic()`` value.
+
+    Raises:
+        ValueError: If the header is not a positive number.
+    """
+    name = DEADLINE_HEADER.lower().encode("latin-1")
+    for key, value in scope["headers"]:
+        if key == name:
+            timeout_ms = float(value)
+            if not timeout_ms > 0:
+                raise ValueError(timeout_ms)
+            return time.monotonic() + timeout_ms / 1000
+    return None
@@ -0,0 +1,191 @@
+"""In-process LRU cache with TTL expiry and entry/memory bounds."""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Objects holding no references to other objects
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), type)
+
+
+def estimate_size(key: Hashable, value: Any) -> int:
+    """
+    Estimate (in bytes) of the memory held by a cache entry.
+
+    The key and value are followed recursively through containers, object
+    attributes (``__dict__`` and ``__slots__``) and pydantic models, counting
+    each object once. Objects shared with the rest of the process (interned
+    strings, small ints) are counted too, so the estimate errs on the high side.
+    """
+    seen = set()
+    total = 0
+    stack = [key, value]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, _LEAF_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+
+    return total
+
+
+class LRUTTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a fixed TTL.
+
+    The cache is bounded both by number of entries and by an approximate memory
+    budget; the least recently used entries are evicted first when either limit
+    is exceeded. It is meant to be used from the event loop and is not
+    thread-safe.
+
+    Attributes:
+        max_entries (int): Maximum number of entries (0 disables the cache).
+        max_bytes (int): Approximate memory budget for keys and values.
+        ttl_seconds (float): Time after which an entry is considered stale.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not found or expired.
+        evictions (int): Number of entries evicted to honour the bounds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        sizeof: Callable[[Hashable, Any], int] = estimate_size,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._sizeof = sizeof
+        self._timer = timer
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether the cache stores anything at all.
+        """
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Approximate memory currently held by the cached entries.
+        """
+        return self._bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a key, refreshing its recency on a hit.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= self._timer():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to cache.
+        """
+        if not self.enabled:
+            return
+
+        size = self._sizeof(key, value)
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (value, self._timer() + self.ttl_seconds, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry, if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Drop every entry. Hit/miss counters are kept.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            Dict[str, float]: Entries, bytes, hits, misses, evictions and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
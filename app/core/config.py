@@ -1,8 +1,28 @@
 """Configuration module for environment and settings management."""
 
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
 
+class ApiKeyConfig(BaseModel):
+    """
+    An additional API key and how the model schedules its requests.
+
+    Attributes:
+        key (str): API key clients send in the ``X-API-Key`` header.
+        traffic_class (str): "interactive" requests are always served before
+            "bulk" ones, which only use the capacity left over.
+        weight (float): Share of its class's model capacity the key gets while
+            other keys of the class have requests queued.
+    """
+
+    key: str
+    traffic_class: Literal["interactive", "bulk"] = "interactive"
+    weight: float = Field(1.0, gt=0)
+
+
 class Settings(BaseSettings):
     """
     Application configuration loaded from environment variables.
@@ -10,16 +30,133 @@ class Settings(BaseSettings):
     Attributes:
         mongo_uri (str): MongoDB connection URI.
         db_name (str): Name of the MongoDB database.
-        api_key (str): API key used for authentication.
+        mongo_max_pool_size (int): Maximum connections per MongoDB server.
+        mongo_min_pool_size (int): Connections the driver keeps open when idle.
+        mongo_wait_queue_timeout_ms (Optional[int]): Maximum time to wait for a
+            free pooled connection (None waits indefinitely).
+        mongo_compressors (str): Comma-separated wire compressors in order of
+            preference ("zstd", "snappy", "zlib"; empty disables compression).
+        mongo_write_concern (str): Write concern "w" ("majority" or a number).
+        mongo_journal (Optional[bool]): Whether writes wait for the journal.
+        mongo_warmup_connections (int): Connections opened at startup.
+        api_key (str): API key used for authentication (interactive, weight 1).
+        api_keys (Dict[str, ApiKeyConfig]): Additional API keys, by client name,
+            with their traffic class and scheduling weight.
+        admin_api_key (Optional[str]): Key required by the ``/admin`` endpoints
+            (None disables them).
+        admin_allowed_models (List[str]): Model identifiers a reload may load,
+            besides ``model_name`` and ``models``.
         model_name (str): Hugging Face model identifier for sentiment analysis.
+        models (Dict[str, str]): Additional models selectable per request, as
+            name -> Hugging Face identifier (the default one is "default").
+        model_memory_budget_mb (float): Memory budget for the weights of loaded
+            models; least recently used ones are unloaded above it (0 = no limit).
         log_level (str): Logging level (default: "DEBUG").
+        log_format (str): "text" for human-readable lines or "json" for one JSON
+            object per line.
+        log_async (bool): Write logs from a background thread fed by a queue
+            instead of blocking the caller on stdout.
+        log_diagnose (bool): Show variable values in logged tracebacks (slow,
+            and may leak request data).
+        log_sample_rate (float): Fraction of per-request INFO lines kept
+            (warnings and errors are always kept).
+        inference_backend (str): Engine running the model ("torch" or "onnx").
+        onnx_cache_dir (str): Directory where ONNX exports are cached.
+        onnx_tolerance (float): Max probability difference allowed between the
+            ONNX export and the PyTorch model.
+        model_quantization (str): "none" or "dynamic_int8" (PyTorch CPU only).
+        quantization_min_agreement (float): Minimum share of the bundled sample on
+            which the quantized model must agree with the fp32 one.
+        batch_max_size (int): Maximum number of reviews per forward pass.
+        batch_max_wait_ms (float): Maximum time to wait for a batch to fill up.
+        inference_workers (int): Number of threads running forward passes.
+        inference_queue_size (int): Maximum number of reviews queued for inference.
+        inference_max_queue_latency_ms (float): Estimated queueing delay above
+            which requests are refused with a 429 (0 = wait for room instead).
+        torch_num_threads (int): Intra-op threads per worker (0 = cores / workers).
+        sequence_length_buckets (List[int]): Token-length bounds used to group the
+            reviews of a batch so each group is padded only to its own length.
+        serve_workers (int): Worker processes started by ``python -m app.serve``.
+        serve_pin_cores (bool): Pin each launcher worker to its own core slice.
+        model_warmup_batch_sizes (List[int]): Batch sizes run at every length
+            bucket before the model is reported ready (empty skips warm-up).
+        readiness_max_queue_ratio (float): Share of the inference queue in use
+            above which the instance reports itself as not ready.
+        readiness_mongo_timeout_ms (float): Timeout of the readiness MongoDB ping.
+        batch_request_max_items (int): Maximum reviews per batch sentiment request.
+        stream_chunk_size (int): Reviews per chunk when processing NDJSON streams.
+        stream_max_line_bytes (int): Maximum size of a single NDJSON line.
+        prediction_cache_max_entries (int): Max cached predictions (0 disables it).
+        prediction_cache_max_bytes (int): Approximate memory budget of the cache.
+        prediction_cache_ttl_seconds (float): Lifetime of a cached prediction.
+        stats_cache_max_entries (int): Max cached stats responses (0 disables it).
+        stats_cache_max_bytes (int): Approximate memory budget of the stats cache.
+        stats_cache_ttl_seconds (float): Lifetime of a cached stats response, which
+            bounds staleness for writes made by other replicas.
+        trend_max_buckets (int): Maximum time buckets returned by one sentiment
+            trend request.
+        bulk_stats_max_products (int): Maximum products per bulk stats request.
+        review_write_mode (str): "sync" stores each review before responding;
+            "write_behind" buffers it and writes it in the background.
+        write_buffer_max_batch (int): Maximum reviews written per buffer flush.
+        write_buffer_flush_ms (float): Maximum time a buffered review waits.
+        write_buffer_max_pending (int): Buffered reviews above which requests wait
+            for a flush (backpressure).
     """
 
     mongo_uri: str
     db_name: str
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 10
+    mongo_wait_queue_timeout_ms: Optional[int] = None
+    mongo_compressors: str = ""
+    mongo_write_concern: str = "1"
+    mongo_journal: Optional[bool] = None
+    mongo_warmup_connections: int = 10
     api_key: str
+    api_keys: Dict[str, ApiKeyConfig] = {}
+    admin_api_key: Optional[str] = None
+    admin_allowed_models: List[str] = []
     model_name: str = "distilbert-base-uncased-finetuned-sst-2-english"
+    models: Dict[str, str] = {}
+    model_memory_budget_mb: float = 0.0
     log_level: str = "DEBUG"
+    log_format: Literal["text", "json"] = "text"
+    log_async: bool = True
+    log_diagnose: bool = False
+    log_sample_rate: float = 1.0
+    inference_backend: Literal["torch", "onnx"] = "torch"
+    onnx_cache_dir: str = ".cache/onnx"
+    onnx_tolerance: float = 1e-3
+    model_quantization: Literal["none", "dynamic_int8"] = "none"
+    quantization_min_agreement: float = 0.95
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+    inference_workers: int = 1
+    inference_queue_size: int = 1024
+    inference_max_queue_latency_ms: float = 1000.0
+    torch_num_threads: int = 0
+    sequence_length_buckets: List[int] = [16, 32, 64, 128, 256]
+    serve_workers: int = 1
+    serve_pin_cores: bool = True
+    model_warmup_batch_sizes: List[int] = [1, 8, 32]
+    readiness_max_queue_ratio: float = 0.9
+    readiness_mongo_timeout_ms: float = 500.0
+    batch_request_max_items: int = 256
+    stream_chunk_size: int = 256
+    stream_max_line_bytes: int = 65536
+    prediction_cache_max_entries: int = 10000
+    prediction_cache_max_bytes: int = 16 * 1024 * 1024
+    prediction_cache_ttl_seconds: float = 3600.0
+    stats_cache_max_entries: int = 10000
+    stats_cache_max_bytes: int = 4 * 1024 * 1024
+    stats_cache_ttl_seconds: float = 5.0
+    trend_max_buckets: int = 1000
+    bulk_stats_max_products: int = 500
+    review_write_mode: Literal["sync", "write_behind"] = "sync"
+    write_buffer_max_batch: int = 500
+    write_buffer_flush_ms: float = 50.0
+    write_buffer_max_pending: int = 10000
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,20 @@
 """Global application context for shared resources like DB and ML model."""
 
-from typing import Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
-import torch
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.cache import LRUTTLCache
+from app.core.exceptions import ModelNotReadyError
+from app.repositories.review_repository import ReviewWriteBuffer
+from app.services.registry import ModelRegistry
+
+if TYPE_CHECKING:
+    # Heavy imports, only needed for annotations
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    from app.services.inference import BatchingEngine
 
 
 class AppContext:
@@ -16,12 +26,30 @@ class AppContext:
         model (AutoModelForSequenceClassification): Loaded transformer model.
         tokenizer (AutoTokenizer): Tokenizer associated with the model.
         device (torch.device): Device where the model will run (CPU/GPU).
+        engine (BatchingEngine): Micro-batching engine wrapping the default model.
+        model_version (str): Prediction cache namespace of the default model,
+            changed by every reload.
+        registry (ModelRegistry): Named models selectable per request, each with
+            its own engine (the default model included).
+        model_state (str): "loading" until the default model is loaded and warmed
+            up, then "ready" (or "failed" on error).
+        prediction_cache (LRUTTLCache): Cache of predictions keyed by review text.
+        stats_cache (LRUTTLCache): Cache of stats responses keyed by product ID.
+        review_writer (ReviewWriteBuffer): Write-behind buffer for reviews, set
+            only when ``settings.review_write_mode`` is "write_behind".
     """
 
     db: Optional[AsyncIOMotorDatabase] = None
-    model: Optional[AutoModelForSequenceClassification] = None
-    tokenizer: Optional[AutoTokenizer] = None
-    device: Optional[torch.device] = None
+    model: Optional["AutoModelForSequenceClassification"] = None
+    tokenizer: Optional["AutoTokenizer"] = None
+    device: Optional["torch.device"] = None
+    engine: Optional["BatchingEngine"] = None
+    model_version: Optional[str] = None
+    registry: Optional[ModelRegistry] = None
+    model_state: Literal["loading", "ready", "failed"] = "loading"
+    prediction_cache: Optional[LRUTTLCache] = None
+    stats_cache: Optional[LRUTTLCache] = None
+    review_writer: Optional[ReviewWriteBuffer] = None
 
     def get_db(self) -> AsyncIOMotorDatabase:
         """
@@ -37,7 +65,7 @@ class AppContext:
             raise RuntimeError("Database connection is not initialized.")
         return self.db
 
-    def get_model(self) -> tuple[AutoModelForSequenceClassification, AutoTokenizer]:
+    def get_model(self) -> tuple["AutoModelForSequenceClassification", "AutoTokenizer"]:
         """
         Get the initialized ML model and tokenizer.
 
@@ -51,7 +79,7 @@ class AppContext:
             raise RuntimeError("Model or tokenizer is not initialized.")
         return self.model, self.tokenizer
 
-    def get_device(self) -> torch.device:
+    def get_device(self) -> "torch.device":
         """
         Get the configured device (CPU or CUDA).
 
@@ -65,5 +93,61 @@ class AppContext:
             raise RuntimeError("Device is not initialized.")
         return self.device
 
+    def get_engine(self) -> "BatchingEngine":
+        """
+        Get the running batching inference engine.
+
+        Returns:
+            BatchingEngine: The engine serving model predictions.
+
+        Raises:
+            ModelNotReadyError: If the model is still loading or failed to load.
+        """
+        if self.engine is None or self.model_state != "ready":
+            raise ModelNotReadyError(f"Model is not ready ({self.model_state}).")
+        return self.engine
+
+    def get_registry(self) -> ModelRegistry:
+        """
+        Get the registry of models selectable per request.
+
+        Returns:
+            ModelRegistry: The model registry.
+
+        Raises:
+            RuntimeError: If the registry has not been initialized.
+        """
+        if self.registry is None:
+            raise RuntimeError("Model registry is not initialized.")
+        return self.registry
+
+    def get_prediction_cache(self) -> LRUTTLCache:
+        """
+        Get the prediction cache placed in front of the model.
+
+        Returns:
+            LRUTTLCache: The prediction cache.
+
+        Raises:
+            RuntimeError: If the cache has not been initialized.
+        """
+        if self.prediction_cache is None:
+            raise RuntimeError("Prediction cache is not initialized.")
+        return self.prediction_cache
+
+    def get_stats_cache(self) -> LRUTTLCache:
+        """
+        Get the cache of per-product stats responses.
+
+        Returns:
+            LRUTTLCache: The stats cache.
+
+        Raises:
+            RuntimeError: If the cache has not been initialized.
+        """
+        if self.stats_cache is None:
+            raise RuntimeError("Stats cache is not initialized.")
+        return self.stats_cache
+
 
 context = AppContext()
@@ -4,6 +4,38 @@ from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
 
 
+class ModelNotReadyError(RuntimeError):
+    """
+    Raised when a prediction is requested before the model finished loading.
+
+    Mapped to a 503 response with a ``Retry-After`` header.
+    """
+
+
+class OverloadedError(RuntimeError):
+    """
+    Raised when the inference backlog exceeds its latency budget.
+
+    Mapped to a 429 response with a ``Retry-After`` header.
+
+    Attributes:
+        retry_after (int): Seconds after which the backlog should have cleared.
+    """
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RequestAbandonedError(RuntimeError):
+    """
+    Raised when queued inference is dropped because its request's deadline
+    passed or its client disconnected.
+
+    Mapped to a 504 response.
+    """
+
+
 class ErrorResponse(BaseModel):
     """
     Generic error response returned by the API.
@@ -23,6 +55,16 @@ def unauthorized_exception(detail: str = "Invalid or missing API key") -> HTTPEx
     )
 
 
+def forbidden_exception(detail: str = "Forbidden") -> HTTPException:
+    """
+    Raise a 403 Forbidden exception with a custom error message.
+    """
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=detail,
+    )
+
+
 def not_found_exception(resource: str = "Resource") -> HTTPException:
     """
     Raise a 404 Not Found exception with a custom error message.
@@ -41,3 +83,13 @@ def bad_request_exception(detail: str = "Bad request") -> HTTPException:
         status_code=status.HTTP_400_BAD_REQUEST,
         detail=detail,
     )
+
+
+def conflict_exception(detail: str = "Conflict") -> HTTPException:
+    """
+    Raise a 409 Conflict exception with a custom error message.
+    """
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=detail,
+    )
@@ -1,15 +1,124 @@
 """Logging configuration using loguru."""
 
+import asyncio
+import os
+import queue
+import random
 import sys
+import threading
+from typing import Optional, TextIO
 
 from loguru import logger
 from loguru._logger import Logger
 
+from app.core.config import settings
+
+# Logger for per-request INFO lines, subject to ``settings.log_sample_rate``.
+# Messages use loguru's lazy "{field}" formatting with keyword arguments, so
+# they are only formatted when emitted and the fields appear in JSON output.
+request_logger = logger.bind(sampled=True)
+
+# Level above which sampled records are always kept
+_SAMPLED_MAX_LEVEL = logger.level("INFO").no
+
+
+class BackgroundWriter:
+    """
+    Log sink handing formatted lines to a thread that writes them to a stream.
+
+    The caller only pays for an in-process queue put, never for a blocked
+    stdout. Loguru's own ``enqueue`` option goes through a multiprocessing pipe
+    and pickles every record, which costs more than the write it saves.
+    Forked processes start their own writer thread.
+
+    Attributes:
+        stream (TextIO): Stream the lines are written to.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._stopped = False
+        self._start()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def write(self, message: str) -> None:
+        """
+        Queue a formatted log line.
+        """
+        self._queue.put(message)
+
+    def isatty(self) -> bool:
+        """
+        Whether the stream is a terminal (loguru only colorizes terminals).
+        """
+        return self.stream.isatty()
+
+    async def complete(self) -> None:
+        """
+        Wait until every queued line is written (``await logger.complete()``).
+        """
+        await asyncio.to_thread(self._queue.join)
+
+    def stop(self) -> None:
+        """
+        Write the queued lines and stop the thread (called by ``logger.remove``).
+        """
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _start(self) -> None:
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _after_fork(self) -> None:
+        # The parent's thread (and anything it had queued) stays in the parent
+        if not self._stopped:
+            self._start()
+
+    def _run(self) -> None:
+        while True:
+            message = self._queue.get()
+            try:
+                if message is None:
+                    return
+                self.stream.write(message)
+                if self._queue.empty():
+                    self.stream.flush()
+            finally:
+                self._queue.task_done()
+
+
+def _sampling_filter(sample_rate: float):
+    """
+    Build a sink filter keeping a ``sample_rate`` fraction of sampled records.
+
+    Only INFO and lower records logged through ``request_logger`` are sampled;
+    warnings and errors are always kept.
+    """
+
+    def keep(record) -> bool:
+        if not record["extra"].get("sampled"):
+            return True
+        if record["level"].no > _SAMPLED_MAX_LEVEL:
+            return True
+        return random.random() < sample_rate  # nosec B311 - not security related
+
+    return keep
+
 
 def configure_logger(level: str = "DEBUG") -> Logger:
     """
     Configure the global logger.
 
+    The sink, output format and sampling follow ``settings``: with
+    ``log_async`` lines are written to stdout by a background thread, so the
+    event loop never blocks on it; ``log_format`` "json" emits one JSON object
+    per line; ``log_diagnose`` adds variable values to tracebacks.
+
     Args:
         level (str): Logging level (DEBUG, INFO, WARNING, ERROR)
 
@@ -21,7 +130,7 @@ def configure_logger(level: str = "DEBUG") -> Logger:
 
     # Add a new logger with the specified level and format
     logger.add(
-        sys.stdout,
+        BackgroundWriter(sys.stdout) if settings.log_async else sys.stdout,
         level=level.upper(),
         format=(
             "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
@@ -29,8 +138,14 @@ def configure_logger(level: str = "DEBUG") -> Logger:
             "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
             "<level>{message}</level>"
         ),
+        filter=(
+            _sampling_filter(settings.log_sample_rate)
+            if settings.log_sample_rate < 1
+            else None
+        ),
+        serialize=settings.log_format == "json",
         backtrace=True,
-        diagnose=True,
+        diagnose=settings.log_diagnose,
     )
 
     return logger
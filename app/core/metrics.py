@@ -0,0 +1,221 @@
+"""Prometheus metrics for the API hot paths.
+
+Under the multi-process launcher (``python -m app.serve``), metric values are
+written to files in ``PROMETHEUS_MULTIPROC_DIR`` and aggregated across workers
+at scrape time (prometheus_client's multiprocess mode).
+"""
+
+import asyncio
+import os
+from typing import Iterator
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Latency buckets (seconds) tuned for millisecond-scale stages
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+SENTIMENT_STAGE_SECONDS = Histogram(
+    "sentiment_request_stage_seconds",
+    "Time spent in each stage of a sentiment request.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+INFERENCE_STAGE_SECONDS = Histogram(
+    "inference_stage_seconds",
+    "Time spent by the inference engine in each stage of a batch.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of reviews per batch collected by the inference engine.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+INFERENCE_QUEUE_WAIT_SECONDS = Histogram(
+    "inference_queue_wait_seconds",
+    "Time reviews wait for a forward pass, per traffic class.",
+    ["traffic_class"],
+    buckets=LATENCY_BUCKETS,
+)
+
+INFERENCE_SHED = Counter(
+    "inference_shed",
+    "Reviews refused at admission or dropped before the forward pass.",
+    ["reason"],
+)
+
+STATS_QUERY_SECONDS = Histogram(
+    "stats_query_seconds",
+    "Time spent reading a product's sentiment distribution from MongoDB.",
+    buckets=LATENCY_BUCKETS,
+)
+
+MONGO_POOL_CHECKOUT_SECONDS = Histogram(
+    "mongo_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections",
+    "Connections currently open in the MongoDB pool.",
+    multiprocess_mode="livesum",
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a periodic event-loop callback was due and when it ran.",
+    buckets=LATENCY_BUCKETS,
+)
+
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds",
+    "Most recent event-loop lag measurement (worst worker).",
+    multiprocess_mode="livemax",
+)
+
+
+class AppStateCollector(Collector):
+    """
+    Exposes engine and cache state read from the application context at scrape
+    time, so the request path pays nothing for these metrics.
+
+    The state is read in the process answering the scrape, so under the
+    multi-process launcher these metrics describe that worker only.
+    """
+
+    def describe(self) -> Iterator:
+        # Nothing to describe up front; avoids collecting at registration time
+        return iter(())
+
+    def collect(self) -> Iterator:
+        # Imported lazily: the context depends on modules that record metrics
+        from app.core.context import context
+
+        queue_depth = GaugeMetricFamily(
+            "inference_queue_depth",
+            "Reviews waiting for a forward pass.",
+            labels=["model"],
+        )
+        padding = GaugeMetricFamily(
+            "inference_padding_efficiency",
+            "Real tokens divided by padded tokens processed by the engine.",
+            labels=["model"],
+        )
+        loaded_bytes = GaugeMetricFamily(
+            "model_weights_bytes",
+            "Memory held by loaded model weights.",
+            labels=["model"],
+        )
+        version = GaugeMetricFamily(
+            "model_version",
+            "Version of each model currently serving (bumped by every reload).",
+            labels=["model", "model_id"],
+        )
+        if context.registry is not None:
+            for loaded in context.registry.loaded:
+                queue_depth.add_metric([loaded.name], loaded.engine.queue_depth)
+                padding.add_metric([loaded.name], loaded.engine.padding_efficiency)
+                loaded_bytes.add_metric([loaded.name], loaded.size_bytes)
+                version.add_metric([loaded.name, loaded.model_id], loaded.version)
+        yield queue_depth
+        yield padding
+        yield loaded_bytes
+        yield version
+
+        write_buffer = GaugeMetricFamily(
+            "review_write_buffer_depth", "Reviews buffered and not yet stored."
+        )
+        if context.review_writer is not None:
+            write_buffer.add_metric([], context.review_writer.depth)
+        yield write_buffer
+
+        hits = CounterMetricFamily(
+            "cache_hits", "Cache lookups served.", labels=["cache"]
+        )
+        misses = CounterMetricFamily(
+            "cache_misses", "Cache lookups not found or expired.", labels=["cache"]
+        )
+        entries = GaugeMetricFamily(
+            "cache_entries", "Entries currently cached.", labels=["cache"]
+        )
+        for name, cache in (
+            ("prediction", context.prediction_cache),
+            ("stats", context.stats_cache),
+        ):
+            if cache is None:
+                continue
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            entries.add_metric([name], len(cache))
+        yield hits
+        yield misses
+        yield entries
+
+
+APP_STATE_COLLECTOR = AppStateCollector()
+REGISTRY.register(APP_STATE_COLLECTOR)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Registry to render on a scrape.
+
+    In multiprocess mode the metrics of every worker are merged from
+    ``PROMETHEUS_MULTIPROC_DIR``; otherwise this process's registry is used.
+
+    Returns:
+        CollectorRegistry: Registry holding the metrics to expose.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(APP_STATE_COLLECTOR)
+    return registry
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """
+    Periodically measure how late the event loop runs a scheduled wake-up.
+
+    A blocked loop (e.g. synchronous work in a request handler) shows up as lag.
+
+    Args:
+        interval (float): Seconds between measurements.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
@@ -1,5 +1,9 @@
 """API Key authentication system for route protection."""
 
+import hmac
+from contextvars import ContextVar
+from typing import Optional
+
 from fastapi import Security
 from fastapi.security.api_key import APIKeyHeader
 
@@ -9,23 +13,110 @@ from app.core.exceptions import unauthorized_exception
 # Name of the header clients must use to send the API key
 API_KEY_NAME = "X-API-Key"
 
+# Name of the header operators must use to send the admin key
+ADMIN_KEY_NAME = "X-Admin-Key"
+
+# Client name of ``settings.api_key``
+DEFAULT_CLIENT = "default"
+
 # Dependency extractor from FastAPI's APIKeyHeader
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
+admin_key_header = APIKeyHeader(
+    name=ADMIN_KEY_NAME, scheme_name="AdminKeyHeader", auto_error=False
+)
+
+
+class ApiKeyInfo:
+    """
+    The client an API key belongs to and how its requests are scheduled.
+
+    Attributes:
+        name (str): Client name the key is configured under.
+        traffic_class (str): "interactive" or "bulk".
+        weight (float): Share of its class's model capacity the client gets.
+    """
+
+    __slots__ = ("name", "traffic_class", "weight")
+
+    def __init__(
+        self, name: str, traffic_class: str = "interactive", weight: float = 1.0
+    ):
+        self.name = name
+        self.traffic_class = traffic_class
+        self.weight = weight
+
+
+# Client of the request being handled (None outside authenticated requests)
+current_client: ContextVar[Optional[ApiKeyInfo]] = ContextVar(
+    "current_client", default=None
+)
+
+
+def resolve_api_key(api_key: Optional[str]) -> Optional[ApiKeyInfo]:
+    """
+    Find the client an API key belongs to.
+
+    Keys are compared in constant time, so response timing does not reveal how
+    much of a key was right.
 
+    Args:
+        api_key (Optional[str]): The API key from the request header.
+
+    Returns:
+        Optional[ApiKeyInfo]: The key's client, or None if the key is unknown.
+    """
+    if not api_key:
+        return None
 
-async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
+    candidate = api_key.encode()
+    if hmac.compare_digest(candidate, settings.api_key.encode()):
+        return ApiKeyInfo(DEFAULT_CLIENT)
+    for name, config in settings.api_keys.items():
+        if hmac.compare_digest(candidate, config.key.encode()):
+            return ApiKeyInfo(name, config.traffic_class, config.weight)
+    return None
+
+
+async def verify_api_key(api_key: str = Security(api_key_header)) -> ApiKeyInfo:
     """
     Dependency to enforce API key authentication.
 
+    The key's client is also made available to the rest of the request through
+    ``current_client``, so the inference engine can schedule its reviews.
+
     Args:
         api_key (str): The API key from the request header.
 
     Returns:
-        str: The API key if valid.
+        ApiKeyInfo: The client the key belongs to.
 
     Raises:
         HTTPException: If API key is missing or invalid.
     """
-    if not api_key or api_key != settings.api_key:
+    client = resolve_api_key(api_key)
+    if client is None:
         raise unauthorized_exception("Invalid or missing API key.")
-    return api_key
+    current_client.set(client)
+    return client
+
+
+async def verify_admin_key(admin_key: str = Security(admin_key_header)) -> None:
+    """
+    Dependency to enforce admin key authentication on the ``/admin`` endpoints.
+
+    Client API keys are never accepted, so no client can reload models. The
+    endpoints reject every request while ``settings.admin_api_key`` is unset.
+
+    Args:
+        admin_key (str): The admin key from the request header.
+
+    Raises:
+        HTTPException: If the admin key is missing or invalid.
+    """
+    expected = settings.admin_api_key
+    if (
+        not admin_key
+        or not expected
+        or not hmac.compare_digest(admin_key.encode(), expected.encode())
+    ):
+        raise unauthorized_exception("Invalid or missing admin key.")
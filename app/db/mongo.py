@@ -1,15 +1,139 @@
-"""MongoDB client factory using Motor."""
+"""MongoDB client factory, connection pool tuning and index management."""
 
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, monitoring
 
 from app.core.config import settings
+from app.core.metrics import MONGO_POOL_CHECKOUT_SECONDS, MONGO_POOL_CONNECTIONS
+
+# Indexes required by the queries of each collection
+INDEXES = {
+    "reviews": [
+        IndexModel(
+            [("product_id", ASCENDING), ("sentiment", ASCENDING)],
+            name="product_id_sentiment",
+        ),
+    ],
+    "review_rollups": [
+        IndexModel(
+            [
+                ("product_id", ASCENDING),
+                ("granularity", ASCENDING),
+                ("bucket", ASCENDING),
+            ],
+            name="product_id_granularity_bucket",
+            unique=True,
+        ),
+    ],
+}
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Reports connection pool checkout waits and open connections to Prometheus.
+
+    A checkout that waits means every connection of the pool was busy, which
+    is the signal that ``mongo_max_pool_size`` is too small for the load.
+    """
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKOUT_SECONDS.labels(outcome="ok").observe(event.duration)
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_SECONDS.labels(outcome="failed").observe(event.duration)
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.inc()
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.dec()
+
+    # Remaining pool events are not reported
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+def client_options() -> dict:
+    """
+    Connection pool, compression and write concern options taken from settings.
+
+    Returns:
+        dict: Keyword arguments for the MongoDB client.
+    """
+    write_concern = settings.mongo_write_concern
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "w": int(write_concern) if write_concern.isdigit() else write_concern,
+        "event_listeners": [PoolMetricsListener()],
+    }
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    if settings.mongo_journal is not None:
+        options["journal"] = settings.mongo_journal
+    return options
 
 
 def get_mongo_client() -> AsyncIOMotorClient:
     """
     Create and return a MongoDB client instance.
 
+    The pool size, wait-queue timeout, wire compression and write concern come
+    from settings and override the same options given in the URI.
+
     Returns:
         AsyncIOMotorClient: An asynchronous MongoDB client.
     """
-    return AsyncIOMotorClient(settings.mongo_uri)
+    return AsyncIOMotorClient(settings.mongo_uri, **client_options())
+
+
+async def warm_up_connections(client: AsyncIOMotorClient, connections: int) -> None:
+    """
+    Open pool connections ahead of traffic with concurrent ``ping`` commands.
+
+    Concurrent commands each need their own connection, so the pool grows to
+    ``connections`` (bounded by its max size) before the first request arrives.
+
+    Args:
+        client (AsyncIOMotorClient): The MongoDB client to warm up.
+        connections (int): Number of connections to open.
+    """
+    connections = min(connections, settings.mongo_max_pool_size)
+    await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(max(connections, 0)))
+    )
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """
+    Create the indexes the repositories rely on, if they do not exist yet.
+
+    ``create_indexes`` is idempotent, so this is safe to run on every startup.
+
+    Args:
+        db (AsyncIOMotorDatabase): The MongoDB database instance.
+    """
+    for collection, indexes in INDEXES.items():
+        await db[collection].create_indexes(indexes)
@@ -0,0 +1,53 @@
+"""Pydantic models for the model administration endpoints."""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ModelReloadRequest(BaseModel):
+    """
+    Input model for reloading a registered model.
+
+    Attributes:
+        model_id (Optional[str]): Hugging Face model identifier of the new
+            version (defaults to reloading the current one); must be one of
+            the registered models or ``ADMIN_ALLOWED_MODELS``.
+    """
+
+    model_id: Optional[str] = Field(
+        None,
+        max_length=200,
+        example="distilbert-base-uncased-finetuned-sst-2-english",
+        description=(
+            "Model to load, from the registered models or ADMIN_ALLOWED_MODELS; "
+            "the current one is reloaded if omitted."
+        ),
+    )
+
+
+class ModelStatus(BaseModel):
+    """
+    Output model describing a registered model.
+
+    Attributes:
+        name (str): Name the model is selected by.
+        state (str): Lifecycle state of the model.
+        model_id (str): Hugging Face model identifier currently registered.
+        version (Optional[int]): Version currently serving, if loaded.
+        pending_model_id (Optional[str]): Model being loaded by a reload.
+        previous_model_id (Optional[str]): Model a rollback would restore.
+        error (Optional[str]): Why the last reload failed, if it did.
+    """
+
+    name: str = Field(..., example="default")
+    state: Literal["ready", "reloading", "warming_up", "loading", "unloaded"] = Field(
+        ..., example="ready"
+    )
+    model_id: str = Field(
+        ..., example="distilbert-base-uncased-finetuned-sst-2-english"
+    )
+    version: Optional[int] = Field(None, example=2)
+    pending_model_id: Optional[str] = Field(None, example=None)
+    previous_model_id: Optional[str] = Field(None, example=None)
+    error: Optional[str] = Field(None, example=None)
@@ -1,4 +1,6 @@
-"""Pydantic model for health check response."""
+"""Pydantic models for health check responses."""
+
+from typing import Dict, Literal
 
 from pydantic import BaseModel, Field
 
@@ -12,3 +14,33 @@ class HealthResponse(BaseModel):
     """
 
     status: str = Field(..., example="healthy", description="API status indicator.")
+
+
+class ReadinessCheck(BaseModel):
+    """
+    Result of one readiness check.
+
+    Attributes:
+        ok (bool): Whether the check passed.
+        detail (str): Human-readable state of the checked dependency.
+    """
+
+    ok: bool = Field(..., example=True, description="Whether the check passed.")
+    detail: str = Field(..., example="ready", description="State of the dependency.")
+
+
+class ReadinessResponse(BaseModel):
+    """
+    Output model for the readiness check.
+
+    Attributes:
+        status (str): "ready" when every check passes, "not_ready" otherwise.
+        checks (Dict[str, ReadinessCheck]): Result of each check, by name.
+    """
+
+    status: Literal["ready", "not_ready"] = Field(
+        ..., example="ready", description="Overall readiness."
+    )
+    checks: Dict[str, ReadinessCheck] = Field(
+        ..., description="Model warm-up, MongoDB ping and inference queue checks."
+    )
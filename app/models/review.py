@@ -1,6 +1,6 @@
 """Pydantic models for review requests and responses."""
 
-from typing import Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +12,7 @@ class ReviewRequest(BaseModel):
     Attributes:
         product_id (str): Unique identifier of the product being reviewed.
         review (str): Text content of the review.
+        model (Optional[str]): Registered model to analyze the review with.
     """
 
     product_id: str = Field(
@@ -30,6 +31,13 @@ class ReviewRequest(BaseModel):
         description="The full text of the user review.",
     )
 
+    model: Optional[str] = Field(
+        None,
+        max_length=50,
+        example="default",
+        description="Registered model to analyze the review with (default if omitted).",
+    )
+
 
 class ReviewResponse(BaseModel):
     """
@@ -50,3 +58,52 @@ class ReviewResponse(BaseModel):
         example=0.92,
         description="Confidence score for the predicted sentiment label.",
     )
+
+
+class BatchReviewRequest(BaseModel):
+    """
+    Input model for submitting several product reviews in a single call.
+
+    Attributes:
+        reviews (List[ReviewRequest]): Reviews to analyze.
+    """
+
+    reviews: List[ReviewRequest] = Field(
+        ...,
+        min_length=1,
+        description="Reviews to analyze, processed as a single batch.",
+    )
+
+
+class BatchReviewItem(BaseModel):
+    """
+    Result of analyzing one review of a batch.
+
+    Attributes:
+        index (int): Position of the review in the request.
+        result (ReviewResponse | None): Prediction, if the review succeeded.
+        error (str | None): Error message, if the review failed.
+    """
+
+    index: int = Field(..., ge=0, example=0, description="Position in the request.")
+    result: Optional[ReviewResponse] = Field(
+        None, description="Sentiment prediction for the review."
+    )
+    error: Optional[str] = Field(
+        None,
+        example="Review text cannot be empty.",
+        description="Reason the review could not be processed.",
+    )
+
+
+class BatchReviewResponse(BaseModel):
+    """
+    Output model for a batch sentiment request.
+
+    Attributes:
+        results (List[BatchReviewItem]): One entry per submitted review, in order.
+    """
+
+    results: List[BatchReviewItem] = Field(
+        ..., description="Per-review predictions or errors, in request order."
+    )
@@ -1,4 +1,7 @@
-"""Pydantic model for sentiment statistics response."""
+"""Pydantic models for sentiment statistics responses."""
+
+from datetime import datetime
+from typing import Dict, List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -40,3 +43,75 @@ class SentimentStatsResponse(BaseModel):
         example=0.10,
         description="Percentage of reviews classified as negative.",
     )
+
+
+class SentimentTrendBucket(BaseModel):
+    """
+    Sentiment distribution of the reviews received in one time bucket.
+
+    Attributes:
+        start (datetime): Start of the bucket (UTC).
+        total (int): Number of reviews received in the bucket.
+        positive (float): Percentage of positive reviews.
+        neutral (float): Percentage of neutral reviews.
+        negative (float): Percentage of negative reviews.
+    """
+
+    start: datetime = Field(
+        ..., example="2025-01-01T13:00:00Z", description="Start of the bucket (UTC)."
+    )
+    total: int = Field(..., ge=1, example=42, description="Reviews in the bucket.")
+    positive: float = Field(..., ge=0.0, le=1.0, example=0.75)
+    neutral: float = Field(..., ge=0.0, le=1.0, example=0.15)
+    negative: float = Field(..., ge=0.0, le=1.0, example=0.10)
+
+
+class SentimentTrendResponse(BaseModel):
+    """
+    Output model representing a product's sentiment over time.
+
+    Attributes:
+        product_id (str): Identifier of the product.
+        granularity (str): Width of each bucket ("hour" or "day").
+        buckets (List[SentimentTrendBucket]): Buckets with reviews, oldest first.
+    """
+
+    product_id: str = Field(..., example="SKU-98765")
+    granularity: Literal["hour", "day"] = Field(..., example="hour")
+    buckets: List[SentimentTrendBucket] = Field(
+        ..., description="Buckets with at least one review, oldest first."
+    )
+
+
+class BulkStatsRequest(BaseModel):
+    """
+    Input model for looking up the sentiment stats of several products.
+
+    Attributes:
+        product_ids (List[str]): Products to fetch stats for.
+    """
+
+    product_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        example=["SKU-98765", "SKU-12345"],
+        description="Products to fetch stats for (duplicates are ignored).",
+    )
+
+
+class BulkStatsResponse(BaseModel):
+    """
+    Output model with the sentiment stats of several products.
+
+    Attributes:
+        stats (Dict[str, SentimentStatsResponse]): Stats by product ID, for the
+            products with reviews.
+        missing (List[str]): Requested products without any review.
+    """
+
+    stats: Dict[str, SentimentStatsResponse] = Field(
+        ..., description="Stats by product ID, for products with reviews."
+    )
+    missing: List[str] = Field(
+        ..., example=["SKU-12345"], description="Products without any review."
+    )
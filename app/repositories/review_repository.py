@@ -1,28 +1,339 @@
 """Repository for storing and retrieving review data from MongoDB."""
 
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
+from app.core.logger import logger
 from app.models.review import ReviewRequest, ReviewResponse
+from app.repositories.stats_repository import ROLLUP_GRANULARITIES, bucket_start
+
+
+def _to_document(
+    review: ReviewRequest, result: ReviewResponse, created_at: datetime
+) -> dict:
+    """
+    Build the MongoDB document stored for a classified review.
+    """
+    return {
+        "product_id": review.product_id,
+        "review": review.review,
+        "sentiment": result.sentiment,
+        "confidence": result.confidence,
+        "created_at": created_at,
+    }
+
+
+def _counter_increments(sentiments: Counter) -> dict:
+    """
+    Build the atomic ``$inc`` applied to a product's sentiment counters.
+    """
+    return {"$inc": {**sentiments, "total": sum(sentiments.values())}}
+
+
+async def _mark_new_counters_backfilled(
+    db: AsyncIOMotorDatabase, created: Dict[str, int]
+) -> None:
+    """
+    Mark counters created by a write as ``backfilled`` when the write stored
+    the product's first reviews.
+
+    A counter created by an upsert only covers the reviews stored from then
+    on. If reviews of the product existed before, they are missing from it,
+    so it stays unflagged and reads fall back to the aggregation until
+    ``rebuild-counters`` is run. Any review inserted before the count below is
+    included in it, and any inserted later is added to the counter by its own
+    ``$inc``, so a matching count means the counter is complete.
+
+    Args:
+        db (AsyncIOMotorDatabase): The MongoDB database instance.
+        created (Dict[str, int]): Reviews stored by the write for each product
+            whose counter it created.
+    """
+    for product_id, stored in created.items():
+        existing = await db.reviews.count_documents({"product_id": product_id})
+        if existing == stored:
+            await db.review_counters.update_one(
+                {"_id": product_id}, {"$set": {"backfilled": True}}
+            )
+
+
+def _rollup_updates(documents: Iterable[dict]) -> List[UpdateOne]:
+    """
+    Build the upserts incrementing the hourly and daily rollups of stored reviews.
+
+    Reviews falling in the same product and bucket share a single ``$inc``.
+    """
+    per_bucket: Dict[Tuple[str, str, datetime], Counter] = {}
+    for doc in documents:
+        for granularity in ROLLUP_GRANULARITIES:
+            key = (
+                doc["product_id"],
+                granularity,
+                bucket_start(doc["created_at"], granularity),
+            )
+            per_bucket.setdefault(key, Counter())[doc["sentiment"]] += 1
+
+    return [
+        UpdateOne(
+            {"product_id": product_id, "granularity": granularity, "bucket": bucket},
+            _counter_increments(counts),
+            upsert=True,
+        )
+        for (product_id, granularity, bucket), counts in per_bucket.items()
+    ]
 
 
 async def save_review(
     db: AsyncIOMotorDatabase,
     review: ReviewRequest,
     result: ReviewResponse,
+    created_at: Optional[datetime] = None,
 ) -> None:
     """
     Persist the review and sentiment result to the database.
 
+    The product's sentiment counters and its hourly and daily rollups are
+    incremented right after the insert, concurrently. A counter created by
+    this write is marked ``backfilled`` if this is the product's first review.
+
     Args:
         db (AsyncIOMotorDatabase): The MongoDB database instance.
         review (ReviewRequest): The input review.
         result (ReviewResponse): The predicted sentiment and confidence.
+        created_at (Optional[datetime]): Ingestion time (defaults to now, UTC).
     """
-    await db.reviews.insert_one(
-        {
-            "product_id": review.product_id,
-            "review": review.review,
-            "sentiment": result.sentiment,
-            "confidence": result.confidence,
-        }
+    document = _to_document(review, result, created_at or datetime.now(timezone.utc))
+    await db.reviews.insert_one(document)
+
+    counter, _ = await asyncio.gather(
+        db.review_counters.update_one(
+            {"_id": review.product_id},
+            _counter_increments(Counter([result.sentiment])),
+            upsert=True,
+        ),
+        db.review_rollups.bulk_write(_rollup_updates([document]), ordered=False),
     )
+    if counter.upserted_id is not None:
+        await _mark_new_counters_backfilled(db, {review.product_id: 1})
+
+
+async def save_reviews(
+    db: AsyncIOMotorDatabase,
+    reviews: List[ReviewRequest],
+    results: List[ReviewResponse],
+    created_at: Optional[List[datetime]] = None,
+) -> Set[int]:
+    """
+    Persist several reviews and their sentiment results with one bulk insert.
+
+    The insert is unordered, so a failing document does not prevent the rest
+    of the batch from being written. Counters and hourly/daily rollups are then
+    incremented with one ``bulk_write`` each, covering only the documents that
+    were stored. Counters created by the batch are marked ``backfilled`` for
+    products whose first reviews it stored.
+
+    Args:
+        db (AsyncIOMotorDatabase): The MongoDB database instance.
+        reviews (List[ReviewRequest]): The input reviews.
+        results (List[ReviewResponse]): The predictions, aligned with ``reviews``.
+        created_at (Optional[List[datetime]]): Ingestion time of each review
+            (defaults to now, UTC).
+
+    Returns:
+        Set[int]: Positions (within ``reviews``) of the documents that failed.
+    """
+    if not reviews:
+        return set()
+
+    created_at = created_at or [datetime.now(timezone.utc)] * len(reviews)
+    documents = [
+        _to_document(r, res, ts) for r, res, ts in zip(reviews, results, created_at)
+    ]
+
+    failed: Set[int] = set()
+    try:
+        await db.reviews.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        failed = {error["index"] for error in e.details.get("writeErrors", [])}
+
+    stored = [doc for i, doc in enumerate(documents) if i not in failed]
+
+    per_product: dict[str, Counter] = {}
+    for doc in stored:
+        per_product.setdefault(doc["product_id"], Counter())[doc["sentiment"]] += 1
+
+    if per_product:
+        products = list(per_product)
+        counters, _ = await asyncio.gather(
+            db.review_counters.bulk_write(
+                [
+                    UpdateOne({"_id": pid}, _counter_increments(counts), upsert=True)
+                    for pid, counts in per_product.items()
+                ],
+                ordered=False,
+            ),
+            db.review_rollups.bulk_write(_rollup_updates(stored), ordered=False),
+        )
+        await _mark_new_counters_backfilled(
+            db,
+            {
+                products[i]: sum(per_product[products[i]].values())
+                for i in counters.upserted_ids
+            },
+        )
+
+    return failed
+
+
+class ReviewWriteBuffer:
+    """
+    Write-behind buffer that takes review persistence off the request path.
+
+    Reviews are queued in memory and written by a background task with
+    :func:`save_reviews` (one unordered ``insert_many`` plus one counter and
+    one rollup ``bulk_write``) once ``max_batch_size`` reviews are pending or
+    ``flush_interval_ms`` has elapsed. When ``max_pending`` reviews are
+    waiting, :meth:`add` blocks until a flush frees room, so a slow database
+    slows producers down instead of growing the buffer without bound.
+
+    Reviews still buffered when the process dies are lost; :meth:`stop` must be
+    awaited on shutdown to drain the buffer.
+
+    Attributes:
+        db (AsyncIOMotorDatabase): The MongoDB database instance.
+        max_batch_size (int): Maximum reviews written per flush.
+        flush_interval_ms (float): Maximum time a review waits before a flush.
+        max_pending (int): Buffered reviews above which producers wait.
+        on_flush (Callable[[Set[str]], None]): Called with the products whose
+            reviews were just stored.
+        written (int): Number of reviews stored so far.
+        failed (int): Number of reviews that could not be stored.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        max_batch_size: int = 500,
+        flush_interval_ms: float = 50.0,
+        max_pending: int = 10000,
+        on_flush: Optional[Callable[[Set[str]], None]] = None,
+    ):
+        self.db = db
+        self.max_batch_size = max_batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_pending = max(max_pending, max_batch_size)
+        self.on_flush = on_flush
+        self.written = 0
+        self.failed = 0
+
+        self._pending: List[Tuple[ReviewRequest, ReviewResponse, datetime]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of reviews buffered and not yet written.
+        """
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """
+        Start the background flush task.
+        """
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Flush every buffered review, then stop the background task.
+        """
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    async def add(self, review: ReviewRequest, result: ReviewResponse) -> None:
+        """
+        Queue a review for the next flush, waiting while the buffer is full.
+
+        The review is stored with the time it was queued, not flushed.
+
+        Args:
+            review (ReviewRequest): The input review.
+            result (ReviewResponse): The predicted sentiment and confidence.
+
+        Raises:
+            RuntimeError: If the buffer is not running.
+        """
+        if self._task is None or self._stopping:
+            raise RuntimeError("Review write buffer is not running.")
+
+        created_at = datetime.now(timezone.utc)
+        await self._slots.acquire()
+        self._pending.append((review, result, created_at))
+        if len(self._pending) >= self.max_batch_size:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        """
+        Flush whenever a batch fills up or the interval elapses, until stopped
+        and drained.
+        """
+        while not self._stopping or self._pending:
+            if not self._stopping and len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), self.flush_interval_ms / 1000
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+
+            if self._pending:
+                await self._flush()
+
+    async def _flush(self) -> None:
+        """
+        Write up to ``max_batch_size`` buffered reviews.
+        """
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        reviews = [review for review, _, _ in batch]
+
+        try:
+            failed = await save_reviews(
+                self.db,
+                reviews,
+                [result for _, result, _ in batch],
+                [created_at for _, _, created_at in batch],
+            )
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} buffered reviews: {e}")
+            failed = set(range(len(batch)))
+        else:
+            if failed:
+                logger.error(f"Failed to write {len(failed)} buffered reviews")
+
+        self.written += len(batch) - len(failed)
+        self.failed += len(failed)
+
+        for _ in batch:
+            self._slots.release()
+
+        if self.on_flush is not None:
+            stored = {r.product_id for i, r in enumerate(reviews) if i not in failed}
+            self.on_flush(stored)
@@ -1,16 +1,53 @@
 """Repository for sentiment statistics from MongoDB."""
 
-from collections import Counter
-from typing import Dict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+
+# Width of the time buckets sentiment rollups are kept at
+ROLLUP_GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Reviews created this recently may still be buffered or being written when a
+# counter rebuild starts, so they are recounted per product at the end instead
+COUNTER_REBUILD_MARGIN = timedelta(minutes=5)
+
+# Collection the counters are rebuilt into before being installed
+REBUILT_COUNTERS = "review_counters_rebuild"
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """
+    Truncate a UTC timestamp to the start of its rollup bucket.
+
+    Args:
+        timestamp (datetime): UTC timestamp (naive values are taken as UTC).
+        granularity (str): "hour" or "day".
+
+    Returns:
+        datetime: Start of the bucket, timezone-aware (UTC).
+    """
+    timestamp = timestamp.astimezone(timezone.utc) if timestamp.tzinfo else timestamp
+    start = timestamp.replace(minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    if granularity == "day":
+        start = start.replace(hour=0)
+    return start
 
 
 async def fetch_sentiment_distribution_by_product(
     db: AsyncIOMotorDatabase, product_id: str
 ) -> Dict[str, float]:
     """
-    Aggregate sentiment statistics for a specific product.
+    Read the sentiment distribution of a product from its precomputed counters.
+
+    Counters are maintained incrementally by the review repository, so this is a
+    single primary-key lookup regardless of how many reviews the product has.
+    Counters are only trusted once ``backfilled`` (they cover every review of
+    the product); until then, e.g. for reviews stored before counters existed,
+    the distribution comes from a server-side aggregation over ``reviews``.
 
     Args:
         db (AsyncIOMotorDatabase): MongoDB database instance.
@@ -19,17 +56,228 @@ async def fetch_sentiment_distribution_by_product(
     Returns:
         Dict[str, float]: Sentiment distribution for the product.
     """
-    cursor = db.reviews.find({"product_id": product_id}, {"sentiment": 1})
-    sentiments = [doc async for doc in cursor]
-    total = len(sentiments)
+    counters = await db.review_counters.find_one({"_id": product_id})
+    if counters is None or not counters.get("backfilled"):
+        counters = await aggregate_sentiment_counts(db, product_id)
+
+    return _distribution(counters)
+
+
+async def fetch_sentiment_distributions(
+    db: AsyncIOMotorDatabase, product_ids: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Read the sentiment distribution of several products in one round trip.
+
+    All counters are fetched with a single ``$in`` query on their primary key.
+    Products without backfilled counters are resolved together by one
+    ``$in``-filtered aggregation over the ``reviews`` collection (a second
+    round trip, only when needed).
+
+    Args:
+        db (AsyncIOMotorDatabase): MongoDB database instance.
+        product_ids (List[str]): Product IDs to look up.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Sentiment distribution of each product
+        with reviews; products without reviews are left out.
+    """
+    counters = {
+        doc["_id"]: doc
+        async for doc in db.review_counters.find(
+            {"_id": {"$in": product_ids}, "backfilled": True}
+        )
+    }
+
+    uncounted = [pid for pid in product_ids if pid not in counters]
+    if uncounted:
+        pipeline = [
+            {"$match": {"product_id": {"$in": uncounted}}},
+            {
+                "$group": {
+                    "_id": {"product_id": "$product_id", "sentiment": "$sentiment"},
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        async for doc in db.reviews.aggregate(pipeline):
+            counts = counters.setdefault(doc["_id"]["product_id"], {"total": 0})
+            counts[doc["_id"]["sentiment"]] = doc["count"]
+            counts["total"] += doc["count"]
+
+    distributions = {pid: _distribution(counts) for pid, counts in counters.items()}
+    return {pid: dist for pid, dist in distributions.items() if dist}
+
+
+def _distribution(counters: Dict[str, int]) -> Dict[str, float]:
+    """
+    Turn per-label review counts into proportions (empty if there are none).
+    """
+    total = counters.get("total", 0)
 
     if total == 0:
         return {}
 
-    counter = Counter(doc["sentiment"] for doc in sentiments)
-
     return {
-        "positive": round(counter.get("positive", 0) / total, 2),
-        "neutral": round(counter.get("neutral", 0) / total, 2),
-        "negative": round(counter.get("negative", 0) / total, 2),
+        label: round(counters.get(label, 0) / total, 2) for label in SENTIMENT_LABELS
     }
+
+
+async def aggregate_sentiment_counts(
+    db: AsyncIOMotorDatabase, product_id: str, since: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Count a product's reviews per sentiment label with a ``$group`` aggregation.
+
+    Only the grouped counts leave the server, and the query is covered by the
+    ``{product_id: 1, sentiment: 1}`` index created at startup.
+
+    Args:
+        db (AsyncIOMotorDatabase): MongoDB database instance.
+        product_id (str): Product ID to filter reviews.
+        since (Optional[datetime]): Only count reviews created from then on.
+
+    Returns:
+        Dict[str, int]: Review count per sentiment label, plus ``total``.
+    """
+    match = {"product_id": product_id}
+    if since is not None:
+        match["created_at"] = {"$gte": since}
+    pipeline = [
+        {"$match": match},
+        {"$group": {"_id": "$sentiment", "count": {"$sum": 1}}},
+    ]
+    counts = {doc["_id"]: doc["count"] async for doc in db.reviews.aggregate(pipeline)}
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+async def rebuild_sentiment_counters(db: AsyncIOMotorDatabase) -> int:
+    """
+    Recompute every product's sentiment counters from the ``reviews`` collection.
+
+    Safe to run while reviews are being written. The reviews created before a
+    cutoff (``COUNTER_REBUILD_MARGIN`` before the start, so none of them is
+    still being written) are counted server-side into a temporary collection
+    with ``$out``. Each product's counter is then set to those counts plus a
+    recount of its later reviews, and marked ``backfilled``. The counter is
+    only set if no increment landed on it since it was read (otherwise it is
+    recounted), so concurrent writes are never lost. A review recounted while
+    its own increment is still in flight is counted twice, a window of a
+    single write per product.
+
+    Args:
+        db (AsyncIOMotorDatabase): MongoDB database instance.
+
+    Returns:
+        int: Number of products with counters after the rebuild.
+    """
+    cutoff = datetime.now(timezone.utc) - COUNTER_REBUILD_MARGIN
+    pipeline = [
+        # Reviews without ``created_at`` predate it, so they are counted here
+        {"$match": {"created_at": {"$not": {"$gte": cutoff}}}},
+        {
+            "$group": {
+                "_id": "$product_id",
+                **{
+                    label: {"$sum": {"$cond": [{"$eq": ["$sentiment", label]}, 1, 0]}}
+                    for label in SENTIMENT_LABELS
+                },
+                "total": {"$sum": 1},
+            }
+        },
+        {"$out": REBUILT_COUNTERS},
+    ]
+    await db.reviews.aggregate(pipeline).to_list(length=None)
+
+    rebuilt = db[REBUILT_COUNTERS]
+    counted = set()
+    async for base in rebuilt.find():
+        await _install_counter(db, base["_id"], base, cutoff)
+        counted.add(base["_id"])
+    for product_id in await db.reviews.distinct(
+        "product_id", {"created_at": {"$gte": cutoff}}
+    ):
+        if product_id not in counted:
+            await _install_counter(db, product_id, {}, cutoff)
+    await rebuilt.drop()
+
+    return await db.review_counters.count_documents({})
+
+
+async def _install_counter(
+    db: AsyncIOMotorDatabase, product_id: str, base: Dict[str, int], since: datetime
+) -> None:
+    """
+    Set a product's counter to its rebuilt counts plus its reviews created since
+    the cutoff, unless an increment lands on it in the meantime.
+    """
+    while True:
+        live = await db.review_counters.find_one({"_id": product_id})
+        recent = await aggregate_sentiment_counts(db, product_id, since)
+        counts = {
+            field: base.get(field, 0) + recent.get(field, 0)
+            for field in (*SENTIMENT_LABELS, "total")
+        }
+        counts["backfilled"] = True
+
+        if live is None:
+            try:
+                await db.review_counters.insert_one({"_id": product_id, **counts})
+                return
+            except DuplicateKeyError:
+                continue  # Created by a concurrent write: count again
+
+        # Matches only if no review was counted since ``live`` was read
+        result = await db.review_counters.update_one(
+            {"_id": product_id, "total": live["total"]}, {"$set": counts}
+        )
+        if result.matched_count:
+            return
+
+
+async def fetch_sentiment_trend(
+    db: AsyncIOMotorDatabase,
+    product_id: str,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+) -> List[Dict]:
+    """
+    Read a product's sentiment counts per time bucket from its rollups.
+
+    Rollups are maintained incrementally by the review repository, so this is
+    an index range scan over one document per bucket and never touches the
+    ``reviews`` collection. Duplicate documents of a bucket, upserted
+    concurrently before the unique index was created, are merged.
+
+    Args:
+        db (AsyncIOMotorDatabase): MongoDB database instance.
+        product_id (str): Product ID to read the rollups of.
+        granularity (str): "hour" or "day".
+        start (datetime): Start of the first bucket (inclusive).
+        end (datetime): End of the range (exclusive).
+
+    Returns:
+        List[Dict]: One document per bucket with reviews, oldest first, with the
+        bucket start and the count per sentiment label plus ``total``.
+    """
+    cursor = db.review_rollups.find(
+        {
+            "product_id": product_id,
+            "granularity": granularity,
+            "bucket": {"$gte": start, "$lt": end},
+        },
+        {"_id": 0, "bucket": 1, "total": 1, **{label: 1 for label in SENTIMENT_LABELS}},
+    ).sort("bucket", 1)
+
+    trend: List[Dict] = []
+    async for doc in cursor:
+        if trend and trend[-1]["bucket"] == doc["bucket"]:
+            # Bucket upserted twice before its unique index existed: merge them
+            for field, count in doc.items():
+                if field != "bucket":
+                    trend[-1][field] = trend[-1].get(field, 0) + count
+        else:
+            trend.append(doc)
+    return trend
@@ -0,0 +1,31 @@
+"""One-shot command to backfill per-product sentiment counters.
+
+Usage:
+    python -m app.scripts.rebuild_counters
+"""
+
+import asyncio
+
+from app.core.config import settings
+from app.core.logger import configure_logger
+from app.db.mongo import get_mongo_client
+from app.repositories.stats_repository import rebuild_sentiment_counters
+
+logger = configure_logger(settings.log_level)
+
+
+async def main() -> None:
+    """
+    Rebuild the ``review_counters`` collection from the stored reviews.
+    """
+    client = get_mongo_client()
+    try:
+        logger.info("Rebuilding sentiment counters from the reviews collection...")
+        products = await rebuild_sentiment_counters(client[settings.db_name])
+        logger.info(f"Sentiment counters rebuilt for {products} products")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
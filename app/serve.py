@@ -0,0 +1,219 @@
+"""Multi-process launcher serving the API with one shared copy of the torch model.
+
+The model is loaded once in the parent process and its weights are moved to
+shared memory. Worker processes are then forked: each inherits the listening
+socket and the weights (read-only, so their pages are never copied), is pinned
+to its own slice of CPU cores and sizes its torch thread pool to that slice.
+With the ONNX backend only the export is prepared once: ONNX Runtime sessions
+cannot be shared, so each worker holds its own copy of the weights.
+Workers that die are restarted on the same cores. Prometheus metrics are kept
+in a shared directory (``PROMETHEUS_MULTIPROC_DIR``) so ``/metrics`` reports
+every worker, whichever one answers the scrape.
+
+Usage:
+    python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logger import configure_logger
+
+logger = configure_logger(settings.log_level)
+
+
+def available_cores() -> List[int]:
+    """
+    CPU cores this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def core_slices(num_workers: int, cores: Sequence[int]) -> List[List[int]]:
+    """
+    Split the cores into one contiguous, near-equal slice per worker.
+
+    With more workers than cores, cores are shared round-robin.
+
+    Args:
+        num_workers (int): Number of worker processes.
+        cores (Sequence[int]): Cores available to the server.
+
+    Returns:
+        List[List[int]]: Cores assigned to each worker.
+    """
+    if num_workers >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(num_workers)]
+
+    size, extra = divmod(len(cores), num_workers)
+    slices, start = [], 0
+    for i in range(num_workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(list(cores[start:end]))
+        start = end
+    return slices
+
+
+def use_multiprocess_metrics(argv: List[str]) -> str:
+    """
+    Make sure prometheus_client writes metrics to a directory shared by every
+    worker, and that it only holds this run's metrics.
+
+    Metrics are created when the ``app`` package is imported, which happens
+    before this module runs, so without ``PROMETHEUS_MULTIPROC_DIR`` the
+    launcher sets it to a new directory and re-executes itself. Files left in a
+    configured directory by earlier runs are removed, as they would be added to
+    this run's metrics.
+
+    Args:
+        argv (List[str]): Command-line arguments to re-execute with.
+
+    Returns:
+        str: The metrics directory.
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+        os.execv(sys.executable, [sys.executable, "-m", "app.serve", *argv])
+
+    own_suffix = f"_{os.getpid()}.db"
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        if not stale.endswith(own_suffix):
+            os.remove(stale)
+    return path
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    Create the listening socket shared by every worker.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, cores: List[int], pin_cores: bool) -> None:
+    """
+    Serve the application on the shared socket (worker process entry point).
+
+    Args:
+        sock (socket.socket): Listening socket inherited from the parent.
+        cores (List[int]): Cores this worker is pinned to.
+        pin_cores (bool): Whether to restrict the worker to ``cores``.
+    """
+    if pin_cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    # One torch thread per pinned core, split between the inference threads
+    if not settings.torch_num_threads:
+        settings.torch_num_threads = max(
+            1, len(cores) // max(1, settings.inference_workers)
+        )
+
+    from app.main import app
+
+    logger.info(
+        f"Worker {os.getpid()} serving on cores {cores} "
+        f"(torch_num_threads={settings.torch_num_threads})"
+    )
+    config = uvicorn.Config(app, log_level=settings.log_level.lower())
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def supervise(
+    spawn: Callable[[List[int]], multiprocessing.Process], slices: List[List[int]]
+) -> None:
+    """
+    Run one worker per core slice, restarting any that dies on the same slice,
+    until SIGTERM or SIGINT.
+
+    Args:
+        spawn (Callable[[List[int]], multiprocessing.Process]): Starts a worker
+            pinned to the given cores.
+        slices (List[List[int]]): Cores assigned to each worker.
+    """
+    from prometheus_client import multiprocess
+
+    workers: Dict[int, multiprocessing.Process] = {
+        i: spawn(cores) for i, cores in enumerate(slices)
+    }
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for proc in workers.values():
+            proc.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while not stopping:
+        wait([proc.sentinel for proc in workers.values()])
+        for i, proc in list(workers.items()):
+            if proc.is_alive() or stopping:
+                continue
+            logger.warning(
+                f"Worker {proc.pid} exited with code {proc.exitcode}; restarting"
+            )
+            # Drop the dead worker's live gauges from the aggregated metrics
+            multiprocess.mark_process_dead(proc.pid)
+            time.sleep(1)  # Avoid a tight restart loop on startup failures
+            workers[i] = spawn(slices[i])
+
+    for proc in workers.values():
+        proc.join()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.serve_workers)
+    args = parser.parse_args(argv)
+
+    metrics_dir = use_multiprocess_metrics(sys.argv[1:] if argv is None else argv)
+    logger.info(f"Prometheus multiprocess metrics in {metrics_dir}")
+
+    from app.services.model_loader import preload_model
+
+    preload_model()
+
+    sock = bind_socket(args.host, args.port)
+    slices = core_slices(max(1, args.workers), available_cores())
+    ctx = multiprocessing.get_context("fork")
+
+    def spawn(cores: List[int]) -> multiprocessing.Process:
+        proc = ctx.Process(
+            target=run_worker, args=(sock, cores, settings.serve_pin_cores)
+        )
+        proc.start()
+        return proc
+
+    logger.info(f"Serving on {args.host}:{args.port} with {len(slices)} workers")
+    supervise(spawn, slices)
+
+    sock.close()
+    logger.info("All workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Business logic for reloading and rolling back models at runtime."""
+
+from typing import List, Optional
+
+from app.core.context import context
+from app.core.exceptions import (
+    conflict_exception,
+    forbidden_exception,
+    not_found_exception,
+)
+from app.models.admin import ModelStatus
+
+
+def model_status(name: str) -> ModelStatus:
+    """
+    Describe a registered model.
+
+    Args:
+        name (str): Registered model name.
+
+    Returns:
+        ModelStatus: Current state and versions of the model.
+
+    Raises:
+        HTTPException (404): If no model is registered under ``name``.
+    """
+    registry = context.get_registry()
+    if name not in registry.specs:
+        raise not_found_exception(f"Model '{name}'")
+
+    current = registry.current(name)
+    return ModelStatus(
+        name=name,
+        state=registry.state(name),
+        model_id=registry.specs[name],
+        version=current.version if current is not None else None,
+        pending_model_id=registry.pending(name),
+        previous_model_id=registry.previous(name),
+        error=registry.last_error(name),
+    )
+
+
+def list_models() -> List[ModelStatus]:
+    """
+    Describe every registered model.
+    """
+    return [model_status(name) for name in context.get_registry().names]
+
+
+def reload_model(name: str, model_id: Optional[str] = None) -> ModelStatus:
+    """
+    Start loading a new version of a model in the background.
+
+    The current version keeps serving until the new one is warmed up and
+    swapped in.
+
+    Args:
+        name (str): Registered model name.
+        model_id (Optional[str]): Model to load (defaults to the current one).
+
+    Returns:
+        ModelStatus: State of the model once the reload has started.
+
+    Raises:
+        HTTPException (403): If ``model_id`` is not an allowed model.
+        HTTPException (404): If no model is registered under ``name``.
+        HTTPException (409): If the model is already being reloaded.
+    """
+    registry = context.get_registry()
+    try:
+        registry.reload(name, model_id)
+    except KeyError:
+        raise not_found_exception(f"Model '{name}'")
+    except PermissionError as e:
+        raise forbidden_exception(str(e))
+    except RuntimeError as e:
+        raise conflict_exception(str(e))
+
+    return model_status(name)
+
+
+def rollback_model(name: str) -> ModelStatus:
+    """
+    Start restoring the version a model had before its last reload.
+
+    Args:
+        name (str): Registered model name.
+
+    Returns:
+        ModelStatus: State of the model once the rollback has started.
+
+    Raises:
+        HTTPException (404): If no model is registered under ``name``.
+        HTTPException (409): If the model was never reloaded or is already
+            being reloaded.
+    """
+    registry = context.get_registry()
+    try:
+        registry.rollback(name)
+    except KeyError:
+        raise not_found_exception(f"Model '{name}'")
+    except (ValueError, RuntimeError) as e:
+        raise conflict_exception(str(e))
+
+    return model_status(name)
@@ -0,0 +1,254 @@
+"""Inference backends executing the sentiment model (PyTorch or ONNX Runtime)."""
+
+import os
+from pathlib import Path
+from typing import List, Mapping
+
+import numpy as np
+import torch
+from torch.nn.functional import softmax
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.core.logger import logger
+
+# Sample reviews used to check that an exported model matches the original one
+VALIDATION_TEXTS = [
+    "Absolutely loved the build quality and performance!",
+    "It stopped working after two days, total waste of money.",
+    "It is okay, nothing special but does the job.",
+    "Great product, really love it!",
+]
+
+
+class TorchBackend:
+    """
+    Runs the model in eager-mode PyTorch.
+
+    Attributes:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        device (torch.device): Device where the model runs.
+    """
+
+    name = "torch"
+    tensor_type = "pt"
+
+    def __init__(self, model: AutoModelForSequenceClassification, device: torch.device):
+        self.model = model
+        self.device = device
+
+        # Move the model once, not on every request
+        self.model.to(self.device)
+
+    def predict_proba(self, inputs: Mapping[str, torch.Tensor]) -> np.ndarray:
+        """
+        Run one forward pass and return class probabilities.
+
+        Args:
+            inputs (Mapping[str, torch.Tensor]): Tokenized batch.
+
+        Returns:
+            np.ndarray: Probabilities of shape (batch, num_labels).
+        """
+        inputs = {key: val.to(self.device) for key, val in inputs.items()}
+
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probabilities = softmax(outputs.logits, dim=1)
+
+        return probabilities.cpu().numpy()
+
+
+class OnnxBackend:
+    """
+    Runs an ONNX export of the model with ONNX Runtime's CPU execution provider.
+
+    Attributes:
+        model_path (Path): Location of the exported ONNX model.
+        num_threads (int): Intra-op threads used by the ONNX Runtime session.
+    """
+
+    name = "onnx"
+    tensor_type = "np"
+
+    def __init__(self, model_path: Path, num_threads: int = 0):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError(
+                "INFERENCE_BACKEND=onnx requires the 'onnxruntime' package."
+            ) from e
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def predict_proba(self, inputs: Mapping[str, np.ndarray]) -> np.ndarray:
+        """
+        Run one forward pass and return class probabilities.
+
+        Args:
+            inputs (Mapping[str, np.ndarray]): Tokenized batch.
+
+        Returns:
+            np.ndarray: Probabilities of shape (batch, num_labels).
+        """
+        feed = {name: inputs[name].astype(np.int64) for name in self._input_names}
+        (logits,) = self.session.run(["logits"], feed)
+
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+class _LogitsOnly(torch.nn.Module):
+    """
+    Wrapper exposing only the logits, so the ONNX graph has a single output.
+    """
+
+    def __init__(self, model: AutoModelForSequenceClassification):
+        super().__init__()
+        self.model = model
+
+    def forward(self, **inputs: torch.Tensor) -> torch.Tensor:
+        return self.model(**inputs).logits
+
+
+def export_onnx(
+    model: AutoModelForSequenceClassification,
+    tokenizer: AutoTokenizer,
+    path: Path,
+) -> Path:
+    """
+    Export the model to ONNX with dynamic batch and sequence axes.
+
+    The file is written next to its final location and renamed into place, so
+    concurrent workers never load a partially written export.
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        path (Path): Destination of the exported model.
+
+    Returns:
+        Path: Location of the exported model.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+    sample = tokenizer(VALIDATION_TEXTS[:2], return_tensors="pt", padding=True)
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model).cpu(),
+            (),
+            str(tmp_path),
+            kwargs=dict(sample),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+
+    os.replace(tmp_path, path)
+    logger.info(f"Model exported to ONNX: {path}")
+    return path
+
+
+def compare_backends(
+    tokenizer: AutoTokenizer,
+    reference: TorchBackend,
+    candidate: OnnxBackend,
+    texts: List[str] = VALIDATION_TEXTS,
+) -> float:
+    """
+    Maximum absolute difference between the probabilities of two backends.
+
+    Args:
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        reference (TorchBackend): Backend taken as ground truth.
+        candidate (OnnxBackend): Backend being validated.
+        texts (List[str]): Reviews to compare on.
+
+    Returns:
+        float: Largest per-class probability difference.
+    """
+    expected = reference.predict_proba(
+        tokenizer(texts, return_tensors=reference.tensor_type, padding=True)
+    )
+    actual = candidate.predict_proba(
+        tokenizer(texts, return_tensors=candidate.tensor_type, padding=True)
+    )
+    return float(np.abs(expected - actual).max())
+
+
+def onnx_model_path(model_name: str) -> Path:
+    """
+    Location of the cached ONNX export for a model.
+    """
+    return Path(settings.onnx_cache_dir) / f"{model_name.replace('/', '--')}.onnx"
+
+
+def create_backend(
+    model: AutoModelForSequenceClassification,
+    tokenizer: AutoTokenizer,
+    device: torch.device,
+    model_name: str,
+    num_threads: int = 0,
+):
+    """
+    Build the inference backend selected by ``settings.inference_backend``.
+
+    The ONNX backend reuses a cached export when available and otherwise exports
+    the loaded model. Either way its output is checked against the PyTorch model
+    and startup fails if the difference exceeds ``settings.onnx_tolerance``
+    (unless the model's weights were already freed by the launcher, after it
+    checked the export).
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        device (torch.device): Device for the PyTorch backend.
+        model_name (str): Hugging Face model identifier, naming the ONNX export.
+        num_threads (int): Intra-op threads for the ONNX Runtime session.
+
+    Returns:
+        TorchBackend | OnnxBackend: The backend executing forward passes.
+
+    Raises:
+        RuntimeError: If the ONNX output does not match the PyTorch model.
+    """
+    if settings.inference_backend == "torch":
+        return TorchBackend(model, device)
+
+    # Export first: the ONNX export runs on CPU, before the model is moved
+    path = onnx_model_path(model_name)
+    if not path.exists():
+        export_onnx(model, tokenizer, path)
+
+    onnx_backend = OnnxBackend(path, num_threads)
+    if next(model.parameters()).is_meta:
+        # Weights freed by the launcher, which already checked this export
+        logger.info(f"Using ONNX Runtime backend ({path})")
+        return onnx_backend
+
+    diff = compare_backends(tokenizer, TorchBackend(model, device), onnx_backend)
+    if diff > settings.onnx_tolerance:
+        raise RuntimeError(
+            f"ONNX model output differs from PyTorch by {diff:.2e} "
+            f"(tolerance {settings.onnx_tolerance:.0e}); delete {path} to re-export."
+        )
+
+    logger.info(f"Using ONNX Runtime backend ({path}, max diff {diff:.2e})")
+    return onnx_backend
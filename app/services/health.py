@@ -0,0 +1,70 @@
+"""Readiness checks for the model, MongoDB and the inference queue."""
+
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.context import context
+from app.models.health import ReadinessCheck, ReadinessResponse
+from app.services.registry import DEFAULT_MODEL
+
+
+def _check_model() -> ReadinessCheck:
+    """
+    The default model is ready once it is loaded and warmed up.
+    """
+    state = context.model_state
+    if state == "loading" and context.registry is not None:
+        state = context.registry.state(DEFAULT_MODEL)
+        state = "loading" if state == "unloaded" else state
+    return ReadinessCheck(ok=context.model_state == "ready", detail=state)
+
+
+async def _check_mongo() -> ReadinessCheck:
+    """
+    Ping MongoDB, bounded by ``settings.readiness_mongo_timeout_ms``.
+    """
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            context.get_db().command("ping"),
+            settings.readiness_mongo_timeout_ms / 1000,
+        )
+    except asyncio.TimeoutError:
+        return ReadinessCheck(ok=False, detail="ping timed out")
+    except Exception as e:
+        return ReadinessCheck(ok=False, detail=f"ping failed: {e}")
+
+    return ReadinessCheck(
+        ok=True, detail=f"ping {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+
+
+def _check_queue() -> ReadinessCheck:
+    """
+    The inference queue must have room below ``settings.readiness_max_queue_ratio``.
+    """
+    if context.engine is None:
+        return ReadinessCheck(ok=False, detail="engine not started")
+
+    engine = context.engine
+    return ReadinessCheck(
+        ok=engine.saturation < settings.readiness_max_queue_ratio,
+        detail=f"{engine.queue_depth}/{engine.max_queue_size} queued",
+    )
+
+
+async def check_readiness() -> ReadinessResponse:
+    """
+    Run every readiness check.
+
+    Returns:
+        ReadinessResponse: Overall status and the result of each check.
+    """
+    checks = {
+        "model": _check_model(),
+        "mongo": await _check_mongo(),
+        "queue": _check_queue(),
+    }
+    ready = all(check.ok for check in checks.values())
+    return ReadinessResponse(status="ready" if ready else "not_ready", checks=checks)
@@ -0,0 +1,686 @@
+"""Dynamic micro-batching inference engine for the sentiment model."""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.admission import RequestBudget, current_budget
+from app.core.exceptions import OverloadedError, RequestAbandonedError
+from app.core.logger import logger
+from app.core.metrics import (
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_QUEUE_WAIT_SECONDS,
+    INFERENCE_SHED,
+    INFERENCE_STAGE_SECONDS,
+)
+from app.core.security import DEFAULT_CLIENT, ApiKeyInfo, current_client
+from app.models.review import ReviewResponse
+from app.services.scheduling import FairQueue
+
+# Minimum confidence required to report a polar (positive/negative) label
+CONFIDENCE_THRESHOLD = 0.75
+
+# Sentiment labels a model class can map to
+SENTIMENTS = ("negative", "neutral", "positive")
+
+# Weight of the latest batch in the moving average of the batch latency
+BATCH_LATENCY_SMOOTHING = 0.2
+
+# Client of reviews queued outside an authenticated request (e.g. tests, scripts)
+_UNAUTHENTICATED = ApiKeyInfo(DEFAULT_CLIENT)
+
+
+def threads_per_worker(num_workers: int, configured: int = 0) -> int:
+    """
+    Number of intra-op threads each inference worker should use.
+
+    Args:
+        num_workers (int): Number of workers running forward passes concurrently.
+        configured (int): Explicit thread count (0 splits the cores evenly).
+
+    Returns:
+        int: Threads per worker, so that workers do not oversubscribe cores.
+    """
+    return configured or max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+def max_sequence_length(
+    model: AutoModelForSequenceClassification, tokenizer: AutoTokenizer
+) -> int:
+    """
+    Longest sequence the model accepts, taken from its config and tokenizer.
+
+    Tokenizers without a limit report a huge sentinel value, which is ignored.
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+
+    Returns:
+        int: Maximum number of tokens per sequence.
+    """
+    limits = [
+        getattr(model.config, "max_position_embeddings", None),
+        getattr(tokenizer, "model_max_length", None),
+    ]
+    return min(limit for limit in limits if limit and limit < 1_000_000)
+
+
+def sentiment_labels(model: AutoModelForSequenceClassification) -> List[str]:
+    """
+    Sentiment reported for each class index of the model.
+
+    Class names from the model config are matched on their prefix ("pos",
+    "neg", "neu"); models with generic names (``LABEL_0``...) are assumed to
+    be binary negative/positive classifiers.
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+
+    Returns:
+        List[str]: "negative", "neutral" or "positive" for each class index.
+    """
+    id2label = getattr(model.config, "id2label", None) or {}
+    labels = []
+    for i in range(len(id2label)):
+        name = str(id2label.get(i, "")).lower()
+        labels.append(
+            next(
+                (label for label in SENTIMENTS if name.startswith(label[:3])),
+                None,
+            )
+        )
+
+    if labels and all(labels):
+        return labels
+    return ["negative", "positive"]
+
+
+class _PendingItem:
+    """
+    A review waiting in the inference queue, with the future its caller awaits,
+    and the budget and client of the request it belongs to.
+    """
+
+    __slots__ = ("text", "future", "budget", "client", "enqueued_at")
+
+    def __init__(
+        self,
+        text: str,
+        future: asyncio.Future,
+        budget: Optional[RequestBudget],
+        client: ApiKeyInfo,
+    ):
+        self.text = text
+        self.future = future
+        self.budget = budget
+        self.client = client
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingEngine:
+    """
+    Collects concurrent prediction requests into padded batches.
+
+    Requests are queued and background workers drain the queue into batches
+    bounded by ``max_batch_size`` and ``max_wait_ms``, run one forward pass per
+    batch and resolve each waiting request with its own result.
+
+    The queue is drained by traffic class of the requesting API key: queued
+    "interactive" reviews always go first, "bulk" ones fill the remaining
+    capacity, and the keys of a class share it according to their weights.
+
+    Forward passes run on a dedicated thread pool so the event loop stays free
+    to serve health checks and database-bound endpoints while the model works.
+    The model itself is executed by a backend (PyTorch or ONNX Runtime).
+
+    Within a batch, reviews are grouped by token length into buckets and each
+    bucket is padded only to its own longest sequence, so one long review does
+    not make every short one pay for the full sequence length.
+
+    With a ``max_queue_latency_ms`` budget, requests are refused with
+    ``OverloadedError`` when the estimated time to clear the backlog ahead of
+    them exceeds it, instead of waiting for room in the queue. Queued reviews
+    whose request deadline passed, or whose client disconnected, are dropped
+    right before the forward pass.
+
+    Attributes:
+        backend (TorchBackend | OnnxBackend): Backend executing forward passes.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        max_batch_size (int): Maximum number of reviews per forward pass.
+        max_wait_ms (float): Maximum time to wait for a batch to fill up.
+        num_workers (int): Number of executor threads running forward passes.
+        max_queue_size (int): Maximum number of reviews waiting for inference,
+            per traffic class.
+        torch_threads (int): Intra-op threads per worker (0 splits the cores).
+        max_length (int): Maximum tokens per review (longer ones are truncated).
+        length_buckets (Sequence[int]): Upper token-length bound of each bucket.
+        labels (Sequence[str]): Sentiment of each class index of the model.
+        max_queue_latency_ms (float): Estimated queueing delay above which new
+            requests are refused (0 disables admission control).
+        batch_seconds (Optional[float]): Moving average of the time per batch,
+            once a batch has run.
+        real_tokens (int): Non-padding tokens processed so far.
+        padded_tokens (int): Tokens processed so far, padding included.
+    """
+
+    def __init__(
+        self,
+        backend,
+        tokenizer: AutoTokenizer,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        num_workers: int = 1,
+        max_queue_size: int = 1024,
+        torch_threads: int = 0,
+        max_length: int = 512,
+        length_buckets: Sequence[int] = (16, 32, 64, 128, 256),
+        labels: Sequence[str] = ("negative", "positive"),
+        max_queue_latency_ms: float = 0.0,
+    ):
+        self.backend = backend
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max_queue_size
+        self.torch_threads = threads_per_worker(self.num_workers, torch_threads)
+        self.max_length = max_length
+        self.length_buckets = sorted(b for b in length_buckets if b < max_length)
+        self.labels = list(labels)
+        self.max_queue_latency_ms = max_queue_latency_ms
+        self.batch_seconds: Optional[float] = None
+        self.real_tokens = 0
+        self.padded_tokens = 0
+
+        self._stats_lock = threading.Lock()
+
+        self._queue = FairQueue(maxsize=max_queue_size)
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._stopped = False
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of reviews currently waiting for a forward pass.
+        """
+        return self._queue.qsize()
+
+    @property
+    def saturation(self) -> float:
+        """
+        Share of the interactive queue capacity currently in use (0 when
+        unbounded). A bulk backlog does not count, as it never delays
+        interactive requests.
+        """
+        if self.max_queue_size <= 0:
+            return 0.0
+        return self._queue.qsize("interactive") / self.max_queue_size
+
+    def estimated_wait(
+        self, extra: int = 0, traffic_class: str = "interactive"
+    ) -> float:
+        """
+        Estimated time (seconds) for the backlog served before a review of
+        ``traffic_class``, plus ``extra`` more reviews, to go through the model.
+
+        Args:
+            extra (int): Reviews about to be queued.
+            traffic_class (str): Class of the reviews about to be queued.
+
+        Returns:
+            float: Estimated delay (0 until a batch has run).
+        """
+        if self.batch_seconds is None:
+            return 0.0
+        backlog = self._queue.qsize_ahead(traffic_class) + self._in_flight + extra
+        batches = math.ceil(backlog / self.max_batch_size)
+        return batches * self.batch_seconds / self.num_workers
+
+    @property
+    def padding_efficiency(self) -> float:
+        """
+        Share of processed tokens that were real tokens rather than padding.
+        """
+        if self.padded_tokens == 0:
+            return 1.0
+        return self.real_tokens / self.padded_tokens
+
+    async def start(self) -> None:
+        """
+        Start the inference thread pool and the background batching workers.
+        """
+        if self._workers:
+            return
+
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_workers,
+            thread_name_prefix="inference",
+            initializer=torch.set_num_threads,
+            initargs=(self.torch_threads,),
+        )
+        self._workers = [
+            asyncio.create_task(self._run()) for _ in range(self.num_workers)
+        ]
+        logger.info(
+            f"Batching engine started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait_ms}, workers={self.num_workers}, "
+            f"torch_threads={self.torch_threads}, backend={self.backend.name})"
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop the background workers and fail any request still waiting.
+        """
+        self._stopped = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self._fail_queued()
+
+        logger.info(
+            f"Batching engine stopped "
+            f"(padding efficiency {self.padding_efficiency:.2f})"
+        )
+
+    async def drain(self, poll_interval: float = 0.005) -> None:
+        """
+        Wait until every queued request has been served.
+
+        Args:
+            poll_interval (float): Seconds between checks.
+        """
+        while self._queue.qsize() or self._in_flight:
+            await asyncio.sleep(poll_interval)
+
+    async def warm_up(self, batch_sizes: Sequence[int] = (1,)) -> float:
+        """
+        Run synthetic batches through the backend once per representative shape.
+
+        Every length bucket, plus the maximum sequence length, is run at each
+        batch size on every worker thread, so allocator growth and kernel
+        selection happen before real traffic arrives. Warm-up batches are not
+        recorded in the metrics or the padding stats.
+
+        Args:
+            batch_sizes (Sequence[int]): Batch sizes to run (capped at
+                ``max_batch_size``).
+
+        Returns:
+            float: Time spent warming up, in seconds.
+
+        Raises:
+            RuntimeError: If the engine has not been started.
+        """
+        if self._executor is None:
+            raise RuntimeError("Inference engine is not started.")
+
+        loop = asyncio.get_running_loop()
+        sizes = sorted({min(max(1, size), self.max_batch_size) for size in batch_sizes})
+        lengths = [*self.length_buckets, self.max_length]
+
+        start = time.perf_counter()
+        for length in lengths:
+            for size in sizes:
+                await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            self._executor, self._warm_up_batch, size, length
+                        )
+                        for _ in range(self.num_workers)
+                    )
+                )
+        elapsed = time.perf_counter() - start
+
+        logger.info(
+            f"Inference engine warmed up in {elapsed:.2f}s "
+            f"(sequence lengths {lengths}, batch sizes {sizes})"
+        )
+        return elapsed
+
+    async def predict(self, text: str) -> ReviewResponse:
+        """
+        Queue a review for inference and wait for its prediction.
+
+        When the queue is full the caller waits for room, which bounds the
+        amount of work buffered in front of the model.
+
+        Args:
+            text (str): Review text to classify.
+
+        Returns:
+            ReviewResponse: Sentiment label and confidence score.
+
+        Raises:
+            RuntimeError: If the engine has been stopped.
+            OverloadedError: If the backlog exceeds the latency budget.
+            RequestAbandonedError: If the request's deadline passed, or its
+                client disconnected, before the review reached the model.
+        """
+        client = current_client.get() or _UNAUTHENTICATED
+        self._admit(1, client)
+        future = asyncio.get_running_loop().create_future()
+        await self._enqueue(_PendingItem(text, future, current_budget.get(), client))
+        return await future
+
+    async def predict_many(
+        self, texts: List[str]
+    ) -> List[Union[ReviewResponse, Exception]]:
+        """
+        Queue several reviews at once and wait for all their predictions.
+
+        The reviews are enqueued back to back, so they are picked up by the
+        same batch (and the same tokenizer call) whenever they fit in it.
+
+        Args:
+            texts (List[str]): Review texts to classify.
+
+        Returns:
+            List[Union[ReviewResponse, Exception]]: One prediction per text, or
+            the exception raised while computing it (``RequestAbandonedError``
+            for reviews dropped before the forward pass).
+
+        Raises:
+            RuntimeError: If the engine has been stopped.
+            OverloadedError: If the backlog exceeds the latency budget.
+        """
+        client = current_client.get() or _UNAUTHENTICATED
+        self._admit(len(texts), client)
+        loop = asyncio.get_running_loop()
+        budget = current_budget.get()
+        futures = [loop.create_future() for _ in texts]
+        for text, future in zip(texts, futures):
+            await self._enqueue(_PendingItem(text, future, budget, client))
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def _enqueue(self, item: _PendingItem) -> None:
+        """
+        Queue a review in its client's traffic class, waiting for room.
+        """
+        client = item.client
+        await self._queue.put(item, client.traffic_class, client.name, client.weight)
+        if self._stopped:
+            # Queued after stop() emptied the queue: no worker will serve it
+            self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        """
+        Fail every review still queued. Each one taken off the queue makes room
+        for a caller waiting to queue, which then fails its own review.
+        """
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if not item.future.done():
+                item.future.set_exception(
+                    RuntimeError("Inference engine is shut down.")
+                )
+
+    def _admit(self, count: int, client: ApiKeyInfo) -> None:
+        """
+        Refuse new requests once stopped, as no worker would ever serve them,
+        or when the backlog served before them (or a full queue) exceeds the
+        latency budget.
+        """
+        if self._stopped:
+            raise RuntimeError("Inference engine is shut down.")
+        if not self.max_queue_latency_ms:
+            return
+
+        traffic_class = client.traffic_class
+        wait = self.estimated_wait(count, traffic_class)
+        full = 0 < self.max_queue_size < self._queue.qsize(traffic_class) + count
+        if full or wait * 1000 > self.max_queue_latency_ms:
+            INFERENCE_SHED.labels(reason="overloaded").inc(count)
+            raise OverloadedError(
+                f"Inference backlog too long (~{wait:.1f}s); retry later.",
+                retry_after=max(1, math.ceil(wait)),
+            )
+
+    def _shed(self, batch: List[_PendingItem]) -> List[_PendingItem]:
+        """
+        Drop the reviews no one is waiting for anymore, before the forward pass.
+        """
+        kept = []
+        for item in batch:
+            if item.future.done():
+                # The caller already gave up (e.g. its task was cancelled)
+                INFERENCE_SHED.labels(reason="cancelled").inc()
+                continue
+            reason = item.budget.abandoned_reason if item.budget else None
+            if reason is not None:
+                INFERENCE_SHED.labels(reason=reason).inc()
+                item.future.set_exception(
+                    RequestAbandonedError(
+                        "Client disconnected."
+                        if reason == "disconnected"
+                        else "Request deadline exceeded."
+                    )
+                )
+                continue
+            kept.append(item)
+        return kept
+
+    async def _collect_batch(self) -> List[_PendingItem]:
+        """
+        Wait for the first request, then gather more until the batch is full
+        or the wait budget is exhausted.
+
+        Reviews count as in flight as soon as they leave the queue, so
+        ``drain`` waits for the batch being collected too.
+        """
+        batch = [await self._queue.get()]
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        try:
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    self._in_flight += 1
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # The items already taken off the queue would never be served
+            self._fail(batch, RuntimeError("Inference engine is shut down."))
+            self._in_flight -= len(batch)
+            raise
+
+        return batch
+
+    async def _run(self) -> None:
+        """
+        Worker loop: collect a batch, run it off the event loop and dispatch
+        the results.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            collected = await self._collect_batch()
+            batch = self._shed(collected)
+            # Dropped reviews are no longer in flight; the rest stay until served
+            self._in_flight -= len(collected) - len(batch)
+            if not batch:
+                continue
+
+            now = time.perf_counter()
+            queue_wait = INFERENCE_STAGE_SECONDS.labels(stage="queue_wait")
+            for item in batch:
+                waited = now - item.enqueued_at
+                queue_wait.observe(waited)
+                INFERENCE_QUEUE_WAIT_SECONDS.labels(
+                    traffic_class=item.client.traffic_class
+                ).observe(waited)
+            INFERENCE_BATCH_SIZE.observe(len(batch))
+
+            try:
+                start = time.perf_counter()
+                results = await loop.run_in_executor(
+                    self._executor, self._forward, [item.text for item in batch]
+                )
+                self._record_batch_latency(time.perf_counter() - start)
+            except asyncio.CancelledError:
+                # Stopped mid-batch: its callers are no longer in the queue
+                self._fail(batch, RuntimeError("Inference engine is shut down."))
+                raise
+            except Exception as e:
+                logger.exception(f"Batched inference failed: {e}")
+                self._fail(batch, e)
+                continue
+            finally:
+                self._in_flight -= len(batch)
+
+            for item, result in zip(batch, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: List[_PendingItem], error: Exception) -> None:
+        """
+        Resolve every still-pending request of a batch with an error.
+        """
+        for item in batch:
+            if not item.future.done():
+                item.future.set_exception(error)
+
+    def _record_batch_latency(self, seconds: float) -> None:
+        """
+        Fold the latency of a batch into the moving average used for admission.
+        """
+        if self.batch_seconds is None:
+            self.batch_seconds = seconds
+        else:
+            self.batch_seconds += BATCH_LATENCY_SMOOTHING * (
+                seconds - self.batch_seconds
+            )
+
+    def _forward(self, texts: List[str]) -> List[ReviewResponse]:
+        """
+        Tokenize a batch of reviews, run one forward pass per length bucket and
+        build the responses.
+
+        Args:
+            texts (List[str]): Review texts to classify.
+
+        Returns:
+            List[ReviewResponse]: One prediction per input text, in order.
+        """
+        with INFERENCE_STAGE_SECONDS.labels(stage="tokenization").time():
+            encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+
+        results: List[Optional[ReviewResponse]] = [None] * len(texts)
+        padded = 0
+        for bucket in self._bucket_by_length(lengths):
+            width = max(lengths[i] for i in bucket)
+            padded += width * len(bucket)
+
+            inputs = self._pad(encoded, bucket, width)
+            with INFERENCE_STAGE_SECONDS.labels(stage="forward").time():
+                probabilities = self.backend.predict_proba(inputs)
+            for i, row in zip(bucket, probabilities):
+                results[i] = _to_response(
+                    float(row.max()), self.labels[int(row.argmax())]
+                )
+
+        real = sum(lengths)
+        with self._stats_lock:
+            self.real_tokens += real
+            self.padded_tokens += padded
+
+        logger.debug(
+            "Ran batched inference on {reviews} reviews "
+            "(padding efficiency {efficiency:.2f})",
+            reviews=len(texts),
+            efficiency=real / padded,
+        )
+        return results
+
+    def _warm_up_batch(self, batch_size: int, length: int) -> None:
+        """
+        Run one forward pass on ``batch_size`` synthetic reviews of ``length``
+        tokens.
+        """
+        encoded = self.tokenizer(
+            ["good " * length] * batch_size, truncation=True, max_length=length
+        )
+        width = max(len(ids) for ids in encoded["input_ids"])
+        self.backend.predict_proba(self._pad(encoded, list(range(batch_size)), width))
+
+    def _bucket_by_length(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group review positions by the smallest length bucket that fits them.
+
+        Args:
+            lengths (List[int]): Token length of each review.
+
+        Returns:
+            List[List[int]]: Positions of the reviews in each non-empty bucket.
+        """
+        buckets: Dict[int, List[int]] = {}
+        for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+            bucket = bisect_left(self.length_buckets, lengths[i])
+            buckets.setdefault(bucket, []).append(i)
+        return list(buckets.values())
+
+    def _pad(self, encoded, positions: List[int], width: int) -> Dict[str, object]:
+        """
+        Pad the selected encoded reviews to ``width`` tokens.
+
+        Args:
+            encoded (BatchEncoding): Unpadded tokenizer output for the whole batch.
+            positions (List[int]): Reviews belonging to the bucket.
+            width (int): Length of the longest review in the bucket.
+
+        Returns:
+            Dict[str, object]: Padded arrays in the backend's tensor type.
+        """
+        inputs = {}
+        for key, rows in encoded.items():
+            fill = self.tokenizer.pad_token_id if key == "input_ids" else 0
+            array = np.full((len(positions), width), fill, dtype=np.int64)
+            for row, i in enumerate(positions):
+                array[row, : len(rows[i])] = rows[i]
+            inputs[key] = (
+                torch.from_numpy(array) if self.backend.tensor_type == "pt" else array
+            )
+        return inputs
+
+
+def _to_response(confidence: float, predicted_label: str) -> ReviewResponse:
+    """
+    Map a model prediction to a sentiment label.
+
+    Args:
+        confidence (float): Probability of the predicted class.
+        predicted_label (str): Sentiment of the predicted class.
+
+    Returns:
+        ReviewResponse: Sentiment label and rounded confidence score.
+    """
+    sentiment_label = "neutral"
+    if confidence >= CONFIDENCE_THRESHOLD:
+        sentiment_label = predicted_label
+
+    return ReviewResponse(sentiment=sentiment_label, confidence=round(confidence, 2))
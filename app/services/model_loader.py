@@ -0,0 +1,170 @@
+"""Loading of the sentiment model and construction of its inference engine.
+
+This module imports torch and transformers, so it is only imported once the
+application has started serving (see ``app.lifespan``), never at import time.
+"""
+
+from typing import Optional, Tuple
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.backends import create_backend
+from app.services.inference import (
+    BatchingEngine,
+    max_sequence_length,
+    sentiment_labels,
+    threads_per_worker,
+)
+from app.services.quantization import quantize_model
+
+# Model loaded by the multi-process launcher before forking its workers
+_preloaded: Optional[
+    Tuple[AutoModelForSequenceClassification, AutoTokenizer, torch.device]
+] = None
+
+
+def preload_model() -> None:
+    """
+    Load the default model on CPU and move its weights to shared memory.
+
+    Called by the launcher in the parent process: forked workers then reuse
+    the same read-only weight pages instead of each loading its own copy.
+
+    With the ONNX backend, the torch weights are not served: the model is
+    exported and checked once here, then its weights are freed. Each worker
+    runs its own ONNX Runtime session, which holds its own copy of the weights
+    (sessions are neither fork-safe nor shareable across processes).
+    """
+    global _preloaded
+
+    model, tokenizer, device = load_model(settings.model_name, torch.device("cpu"))
+
+    if settings.inference_backend == "onnx":
+        create_backend(model, tokenizer, device, settings.model_name)
+        release_weights(model)
+        logger.info("ONNX export checked; workers load their own sessions.")
+    else:
+        model.share_memory()
+        logger.info("Model preloaded into shared memory.")
+
+    _preloaded = (model, tokenizer, device)
+
+
+def release_weights(model: torch.nn.Module) -> None:
+    """
+    Free a model's weights once an ONNX Runtime session holds its own copy.
+
+    The parameters are moved to the meta device: the model keeps its config
+    and parameter shapes (so ``parameter_bytes`` still reports its size), but
+    no memory.
+    """
+    model.to(torch.device("meta"))
+
+
+def load_model(
+    model_name: str,
+    device: Optional[torch.device] = None,
+    use_preloaded: bool = True,
+) -> Tuple[AutoModelForSequenceClassification, AutoTokenizer, torch.device]:
+    """
+    Load a model and its tokenizer, optionally quantized.
+
+    Returns the model preloaded by the launcher when it is the one requested,
+    unless ``use_preloaded`` is False (a reload must read the weights again).
+
+    Args:
+        model_name (str): Hugging Face model identifier.
+        device (Optional[torch.device]): Device to run on (default: CUDA if
+            available, otherwise CPU).
+        use_preloaded (bool): Whether the preloaded model may be returned.
+
+    Returns:
+        Tuple[AutoModelForSequenceClassification, AutoTokenizer, torch.device]:
+        The model in eval mode, its tokenizer and the device it runs on.
+    """
+    if use_preloaded and _preloaded is not None and model_name == settings.model_name:
+        return _preloaded
+
+    logger.info(f"Loading model: {model_name}")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    if device is None:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = quantize_model(model, tokenizer, device)
+    return model, tokenizer, device
+
+
+def parameter_bytes(model: torch.nn.Module) -> int:
+    """
+    Memory held by the model's parameters and buffers.
+
+    Packed quantized weights are not counted, so this underestimates int8 models.
+    """
+    tensors = [*model.parameters(), *model.buffers()]
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def build_engine(
+    model: AutoModelForSequenceClassification,
+    tokenizer: AutoTokenizer,
+    device: torch.device,
+    model_name: str,
+) -> BatchingEngine:
+    """
+    Create the batching engine on the configured backend (not started yet).
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        device (torch.device): Device the model runs on.
+        model_name (str): Hugging Face model identifier.
+
+    Returns:
+        BatchingEngine: Engine ready to be started on the event loop.
+    """
+    num_threads = threads_per_worker(
+        settings.inference_workers, settings.torch_num_threads
+    )
+    backend = create_backend(model, tokenizer, device, model_name, num_threads)
+    return BatchingEngine(
+        backend,
+        tokenizer,
+        max_batch_size=settings.batch_max_size,
+        max_wait_ms=settings.batch_max_wait_ms,
+        num_workers=settings.inference_workers,
+        max_queue_size=settings.inference_queue_size,
+        max_queue_latency_ms=settings.inference_max_queue_latency_ms,
+        torch_threads=settings.torch_num_threads,
+        max_length=max_sequence_length(model, tokenizer),
+        length_buckets=settings.sequence_length_buckets,
+        labels=sentiment_labels(model),
+    )
+
+
+def load_inference_engine(
+    model_name: str = settings.model_name, use_preloaded: bool = True
+) -> Tuple[
+    AutoModelForSequenceClassification, AutoTokenizer, torch.device, BatchingEngine
+]:
+    """
+    Load a model and build its engine. Blocking; meant to run in a thread.
+
+    Args:
+        model_name (str): Hugging Face model identifier.
+        use_preloaded (bool): Whether the model preloaded by the launcher may
+            be reused.
+
+    Returns:
+        Tuple: (model, tokenizer, device, engine)
+    """
+    model, tokenizer, device = load_model(model_name, use_preloaded=use_preloaded)
+    logger.info(f"Model {model_name} loaded on device: {device}")
+    engine = build_engine(model, tokenizer, device, model_name)
+    if settings.inference_backend == "onnx":
+        # Only the ONNX Runtime session's copy of the weights is used
+        release_weights(model)
+    return model, tokenizer, device, engine
@@ -0,0 +1,157 @@
+"""Dynamic int8 quantization of the sentiment model, with accuracy validation."""
+
+import io
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.backends import TorchBackend
+
+# Labelled reviews used to validate the quantized model at startup
+SAMPLE_PATH = (
+    Path(__file__).resolve().parents[1] / "resources" / "quantization_sample.jsonl"
+)
+
+# Class index predicted by the model for each label
+LABEL_TO_CLASS = {"negative": 0, "positive": 1}
+
+
+def load_labelled_sample(path: Path = SAMPLE_PATH) -> Tuple[List[str], np.ndarray]:
+    """
+    Load the bundled labelled reviews.
+
+    Args:
+        path (Path): JSONL file with ``review`` and ``label`` fields.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Review texts and their expected class index.
+    """
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return (
+        [row["review"] for row in rows],
+        np.array([LABEL_TO_CLASS[row["label"]] for row in rows]),
+    )
+
+
+def model_size_bytes(model: torch.nn.Module) -> int:
+    """
+    Size of the serialized model weights, including packed quantized params.
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def _evaluate(
+    backend: TorchBackend, tokenizer: AutoTokenizer, texts: List[str]
+) -> Tuple[np.ndarray, float]:
+    """
+    Predict the class of every text and time the forward pass (in ms).
+    """
+    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+    backend.predict_proba(inputs)  # Warm-up
+
+    start = time.perf_counter()
+    probabilities = backend.predict_proba(inputs)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    return probabilities.argmax(axis=1), latency_ms
+
+
+def validate_quantized_model(
+    fp32_model: AutoModelForSequenceClassification,
+    int8_model: torch.nn.Module,
+    tokenizer: AutoTokenizer,
+) -> Dict[str, float]:
+    """
+    Compare the quantized model with the fp32 one on the bundled sample.
+
+    Args:
+        fp32_model (AutoModelForSequenceClassification): Original model.
+        int8_model (torch.nn.Module): Dynamically quantized copy.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+
+    Returns:
+        Dict[str, float]: Accuracy of both models, their agreement, latency and
+        weight size.
+    """
+    texts, labels = load_labelled_sample()
+    cpu = torch.device("cpu")
+
+    fp32_pred, fp32_ms = _evaluate(TorchBackend(fp32_model, cpu), tokenizer, texts)
+    int8_pred, int8_ms = _evaluate(TorchBackend(int8_model, cpu), tokenizer, texts)
+
+    return {
+        "fp32_accuracy": float((fp32_pred == labels).mean()),
+        "int8_accuracy": float((int8_pred == labels).mean()),
+        "agreement": float((fp32_pred == int8_pred).mean()),
+        "fp32_latency_ms": round(fp32_ms, 2),
+        "int8_latency_ms": round(int8_ms, 2),
+        "fp32_size_mb": round(model_size_bytes(fp32_model) / 2**20, 1),
+        "int8_size_mb": round(model_size_bytes(int8_model) / 2**20, 1),
+    }
+
+
+def quantize_model(
+    model: AutoModelForSequenceClassification,
+    tokenizer: AutoTokenizer,
+    device: torch.device,
+) -> torch.nn.Module:
+    """
+    Apply the quantization mode selected by ``settings.model_quantization``.
+
+    ``dynamic_int8`` quantizes the weights of every Linear layer to int8
+    (activations are quantized on the fly). The result is validated against the
+    fp32 model on the bundled labelled sample before being used.
+
+    Args:
+        model (AutoModelForSequenceClassification): Loaded fp32 model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        device (torch.device): Device the model will run on.
+
+    Returns:
+        torch.nn.Module: The quantized model, or the original one if quantization
+        is disabled or not applicable.
+
+    Raises:
+        RuntimeError: If the quantized model agrees with the fp32 model on fewer
+            samples than ``settings.quantization_min_agreement``.
+    """
+    if settings.model_quantization == "none":
+        return model
+
+    if device.type != "cpu" or settings.inference_backend != "torch":
+        logger.warning(
+            "Dynamic int8 quantization only applies to the PyTorch CPU backend; "
+            "running the fp32 model."
+        )
+        return model
+
+    quantized = torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    quantized.eval()
+
+    report = validate_quantized_model(model, quantized, tokenizer)
+    logger.info(f"Dynamic int8 quantization report: {report}")
+
+    if report["agreement"] < settings.quantization_min_agreement:
+        raise RuntimeError(
+            f"Quantized model agrees with fp32 on {report['agreement']:.1%} of the "
+            f"validation sample (minimum {settings.quantization_min_agreement:.1%})."
+        )
+
+    logger.info(
+        f"Using dynamic int8 model: {report['int8_size_mb']} MB "
+        f"(fp32 {report['fp32_size_mb']} MB), {report['int8_latency_ms']} ms per "
+        f"sample batch (fp32 {report['fp32_latency_ms']} ms)"
+    )
+    return quantized
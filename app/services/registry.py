@@ -0,0 +1,425 @@
+"""Registry of named sentiment models, loaded lazily and unloaded under a budget."""
+
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+from app.core.logger import logger
+
+if TYPE_CHECKING:
+    from app.services.inference import BatchingEngine
+
+# Name under which ``settings.model_name`` is registered
+DEFAULT_MODEL = "default"
+
+
+class LoadedModel:
+    """
+    A model held by the registry, with the engine batching its requests.
+
+    Attributes:
+        name (str): Name the model is selected by.
+        model_id (str): Hugging Face model identifier.
+        model (AutoModelForSequenceClassification): Loaded transformer model.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        device (torch.device): Device the model runs on.
+        engine (BatchingEngine): Started engine serving the model.
+        size_bytes (int): Memory held by the model weights.
+        version (int): Number of times a model was loaded under this name.
+    """
+
+    __slots__ = (
+        "name",
+        "model_id",
+        "model",
+        "tokenizer",
+        "device",
+        "engine",
+        "size_bytes",
+        "version",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        model_id: str,
+        model: Any,
+        tokenizer: Any,
+        device: Any,
+        engine: "BatchingEngine",
+        size_bytes: int,
+        version: int = 1,
+    ):
+        self.name = name
+        self.model_id = model_id
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.engine = engine
+        self.size_bytes = size_bytes
+        self.version = version
+
+    @property
+    def namespace(self) -> str:
+        """
+        Prediction cache namespace, unique to this version of the model.
+        """
+        return f"{self.model_id}@{self.version}"
+
+
+class ModelRegistry:
+    """
+    Holds several named models, each behind its own batching engine.
+
+    Models are loaded (and warmed up) on first use. When the weights of the
+    loaded models exceed ``memory_budget_bytes``, the least recently used ones
+    are unloaded, once the requests already queued on them are served. The
+    default model is never unloaded.
+
+    A loaded model can be replaced by a new version without downtime: the new
+    version is loaded and warmed up in the background while the current one
+    keeps serving, then swapped in; the old version is stopped once the
+    requests already queued on it are served. The replaced model can be rolled
+    back to the same way. Reloads only accept model identifiers from
+    ``allowed_models``, so the runtime cannot be made to fetch and run
+    arbitrary Hub repos or local paths.
+
+    Attributes:
+        specs (Dict[str, str]): Hugging Face model identifier of each name.
+        allowed_models (Set[str]): Model identifiers a reload may load: the
+            registered ones plus any explicitly allowed.
+        memory_budget_bytes (int): Budget for loaded weights (0 = unlimited).
+        warmup_batch_sizes (List[int]): Batch sizes used to warm up each model.
+        on_swap (Callable[[LoadedModel], None]): Called whenever a model (or a
+            new version of it) starts serving.
+    """
+
+    def __init__(
+        self,
+        specs: Dict[str, str],
+        memory_budget_bytes: int = 0,
+        warmup_batch_sizes: Optional[List[int]] = None,
+        on_swap: Optional[Callable[[LoadedModel], None]] = None,
+        allowed_models: Optional[List[str]] = None,
+    ):
+        self.specs = specs
+        self.allowed_models = {*specs.values(), *(allowed_models or [])}
+        self.memory_budget_bytes = memory_budget_bytes
+        self.warmup_batch_sizes = warmup_batch_sizes or []
+        self.on_swap = on_swap
+
+        self._loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._reloading: Dict[str, asyncio.Task] = {}
+        self._retiring: Set[asyncio.Task] = set()
+        self._warming_up: Set[str] = set()
+        self._versions: Dict[str, int] = {}
+        self._previous: Dict[str, str] = {}
+        self._pending: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of every registered model.
+        """
+        return list(self.specs)
+
+    @property
+    def loaded(self) -> List[LoadedModel]:
+        """
+        Currently loaded models, least recently used first.
+        """
+        return list(self._loaded.values())
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Memory held by the weights of every loaded model.
+        """
+        return sum(loaded.size_bytes for loaded in self._loaded.values())
+
+    def state(self, name: str = DEFAULT_MODEL) -> str:
+        """
+        Lifecycle state of a model.
+
+        Args:
+            name (str): Registered model name.
+
+        Returns:
+            str: "reloading", "ready", "warming_up", "loading" or "unloaded".
+        """
+        if name in self._loaded:
+            return "reloading" if name in self._reloading else "ready"
+        if name in self._warming_up:
+            return "warming_up"
+        if name in self._loading:
+            return "loading"
+        return "unloaded"
+
+    async def get(self, name: str = DEFAULT_MODEL) -> LoadedModel:
+        """
+        Get a model by name, loading it first if needed.
+
+        Concurrent requests for a model that is loading share the same load.
+
+        Args:
+            name (str): Registered model name.
+
+        Returns:
+            LoadedModel: The loaded model and its running engine.
+
+        Raises:
+            KeyError: If no model is registered under ``name``.
+        """
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            self._loaded.move_to_end(name)
+            return loaded
+
+        if name not in self.specs:
+            raise KeyError(name)
+
+        task = self._loading.get(name)
+        if task is None:
+            task = asyncio.create_task(self._load(name))
+            self._loading[name] = task
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+
+        return await asyncio.shield(task)
+
+    def current(self, name: str = DEFAULT_MODEL) -> Optional[LoadedModel]:
+        """
+        The version of a model currently serving, if it is loaded.
+        """
+        return self._loaded.get(name)
+
+    def previous(self, name: str = DEFAULT_MODEL) -> Optional[str]:
+        """
+        Model identifier replaced by the last reload of a model, if any.
+        """
+        return self._previous.get(name)
+
+    def pending(self, name: str = DEFAULT_MODEL) -> Optional[str]:
+        """
+        Model identifier being loaded by an ongoing reload, if any.
+        """
+        return self._pending.get(name)
+
+    def last_error(self, name: str = DEFAULT_MODEL) -> Optional[str]:
+        """
+        Why the last reload of a model failed, if it did.
+        """
+        return self._errors.get(name)
+
+    def reload(self, name: str, model_id: Optional[str] = None) -> asyncio.Task:
+        """
+        Load a new version of a model in the background and swap it in.
+
+        The current version keeps serving until the new one is loaded and
+        warmed up. If the reload fails, the current version stays in place
+        and the error is reported by ``last_error``.
+
+        Args:
+            name (str): Registered model name.
+            model_id (Optional[str]): Hugging Face model identifier of the new
+                version (defaults to reloading the current one).
+
+        Returns:
+            asyncio.Task: Task resolving to the new ``LoadedModel`` (None if
+                the reload failed).
+
+        Raises:
+            KeyError: If no model is registered under ``name``.
+            PermissionError: If ``model_id`` is not in ``allowed_models``.
+            RuntimeError: If a reload of that model is already in progress.
+        """
+        if name not in self.specs:
+            raise KeyError(name)
+        model_id = model_id or self.specs[name]
+        if model_id not in self.allowed_models:
+            raise PermissionError(f"Model '{model_id}' is not allowed.")
+        if name in self._reloading:
+            raise RuntimeError(f"Model '{name}' is already being reloaded.")
+
+        self._pending[name] = model_id
+        self._errors.pop(name, None)
+
+        task = asyncio.create_task(self._reload(name, model_id))
+        self._reloading[name] = task
+
+        def done(_: asyncio.Task) -> None:
+            self._reloading.pop(name, None)
+            self._pending.pop(name, None)
+
+        task.add_done_callback(done)
+        return task
+
+    def rollback(self, name: str) -> asyncio.Task:
+        """
+        Reload the version a model had before its last reload.
+
+        Args:
+            name (str): Registered model name.
+
+        Returns:
+            asyncio.Task: Task resolving to the restored ``LoadedModel`` (None
+                if the reload failed).
+
+        Raises:
+            KeyError: If no model is registered under ``name``.
+            ValueError: If the model was never reloaded.
+            RuntimeError: If a reload of that model is already in progress.
+        """
+        if name not in self.specs:
+            raise KeyError(name)
+        if name not in self._previous:
+            raise ValueError(f"Model '{name}' has no previous version.")
+        return self.reload(name, self._previous[name])
+
+    async def unload(self, name: str) -> None:
+        """
+        Unload a model once the requests already queued on it are served.
+
+        Args:
+            name (str): Registered model name.
+        """
+        loaded = self._loaded.pop(name, None)
+        if loaded is not None:
+            await self._retire(loaded)
+
+    async def close(self) -> None:
+        """
+        Cancel pending loads and reloads, and unload every model.
+        """
+        pending = [*self._loading.values(), *self._reloading.values()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for name in list(self._loaded):
+            await self.unload(name)
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    async def _load(self, name: str) -> LoadedModel:
+        """
+        Load the registered version of a model and start serving it.
+        """
+        loaded = await self._build(name, self.specs[name], reload=False)
+        self._install(loaded)
+        return loaded
+
+    async def _reload(self, name: str, model_id: str) -> Optional[LoadedModel]:
+        """
+        Load a new version of a model, swap it in and retire the old one.
+        """
+        try:
+            loaded = await self._build(name, model_id, reload=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._errors[name] = str(e)
+            logger.exception(f"Failed to reload model '{name}' ({model_id}): {e}")
+            return None
+
+        # A first load started before the reload must not replace it afterwards
+        loading = self._loading.get(name)
+        if loading is not None:
+            await asyncio.wait([loading])
+
+        # No await between here and the swap: requests see one version or the
+        # other, and those already queued on the old one are still served
+        old = self._loaded.pop(name, None)
+        self.specs[name] = model_id
+        self._install(loaded)
+        if old is not None:
+            self._previous[name] = old.model_id
+            self._retire_later(old)
+        return loaded
+
+    async def _build(self, name: str, model_id: str, reload: bool) -> LoadedModel:
+        """
+        Load, start and warm up a model, without serving it yet.
+
+        A reload always reads the weights again, never reusing the model
+        preloaded by the multi-process launcher.
+        """
+        # Heavy imports (torch, transformers) are deferred to the first load
+        from app.services.model_loader import load_inference_engine, parameter_bytes
+
+        model, tokenizer, device, engine = await asyncio.to_thread(
+            load_inference_engine, model_id, use_preloaded=not reload
+        )
+        await engine.start()
+        if self.warmup_batch_sizes:
+            self._warming_up.add(name)
+            try:
+                await engine.warm_up(self.warmup_batch_sizes)
+            except BaseException:
+                await engine.stop()
+                raise
+            finally:
+                self._warming_up.discard(name)
+
+        return LoadedModel(
+            name, model_id, model, tokenizer, device, engine, parameter_bytes(model)
+        )
+
+    def _install(self, loaded: LoadedModel) -> None:
+        """
+        Start serving a loaded model, then enforce the memory budget.
+
+        A version of the model still installed is retired, so its engine is
+        never left running unreferenced.
+        """
+        loaded.version = self._versions.get(loaded.name, 0) + 1
+        self._versions[loaded.name] = loaded.version
+        old = self._loaded.pop(loaded.name, None)
+        if old is not None:
+            self._retire_later(old)
+        self._loaded[loaded.name] = loaded
+        if self.on_swap is not None:
+            self.on_swap(loaded)
+        logger.info(
+            f"Model '{loaded.name}' ({loaded.model_id}, version {loaded.version}) "
+            f"ready, {loaded.size_bytes / 2**20:.0f} MB of weights"
+        )
+
+        self._enforce_budget(keep=loaded.name)
+
+    def _enforce_budget(self, keep: str) -> None:
+        """
+        Unload least recently used models until the budget is met.
+
+        Args:
+            keep (str): Model that must stay loaded (the one just loaded).
+        """
+        if not self.memory_budget_bytes:
+            return
+
+        for name in list(self._loaded):
+            if self.size_bytes <= self.memory_budget_bytes:
+                break
+            if name in (keep, DEFAULT_MODEL):
+                continue
+            logger.info(f"Model memory budget exceeded; unloading '{name}'")
+            self._retire_later(self._loaded.pop(name))
+
+    def _retire_later(self, loaded: LoadedModel) -> None:
+        """
+        Retire a model in the background, so the one replacing it is served now.
+        """
+        task = asyncio.create_task(self._retire(loaded))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _retire(self, loaded: LoadedModel) -> None:
+        """
+        Stop a model's engine once the requests already queued on it are served.
+        """
+        await loaded.engine.drain()
+        await loaded.engine.stop()
+        logger.info(
+            f"Model '{loaded.name}' ({loaded.model_id}, version {loaded.version}) "
+            "unloaded"
+        )
@@ -0,0 +1,166 @@
+"""Priority and weighted-fair queue feeding the inference engine."""
+
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Traffic classes, highest priority first
+TRAFFIC_CLASSES = ("interactive", "bulk")
+
+
+class FairQueue:
+    """
+    Queue serving traffic classes by strict priority, and the clients of a
+    class by weighted fair share.
+
+    An item is only taken from a class once every higher-priority class is
+    empty, so bulk traffic only uses the capacity interactive traffic leaves.
+    Within a class, each item gets a virtual finish tag (self-clocked fair
+    queueing): a client's next item finishes ``1 / weight`` after its previous
+    one, or after the current virtual time if it was idle. Items are served by
+    increasing tag, so a client with weight 2 is served twice as often as one
+    with weight 1 while both have items queued, however many each queued.
+
+    Each class is bounded by ``maxsize`` separately, so a bulk backlog never
+    makes interactive callers wait for room. The API mirrors ``asyncio.Queue``.
+
+    Attributes:
+        maxsize (int): Maximum items queued per class (0 = unbounded).
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._seq = itertools.count()
+        self._heaps: Dict[str, List[Tuple[float, int, Any]]] = {
+            cls: [] for cls in TRAFFIC_CLASSES
+        }
+        self._virtual_time = dict.fromkeys(TRAFFIC_CLASSES, 0.0)
+        self._finish_tags: Dict[str, Dict[str, float]] = {
+            cls: {} for cls in TRAFFIC_CLASSES
+        }
+        self._getters: Deque[asyncio.Future] = deque()
+        self._putters: Dict[str, Deque[asyncio.Future]] = {
+            cls: deque() for cls in TRAFFIC_CLASSES
+        }
+
+    def qsize(self, traffic_class: Optional[str] = None) -> int:
+        """
+        Number of items queued in a class, or in all of them.
+        """
+        if traffic_class is not None:
+            return len(self._heaps[traffic_class])
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def qsize_ahead(self, traffic_class: str) -> int:
+        """
+        Number of items that would be served before a new item of a class.
+        """
+        ahead = 0
+        for cls in TRAFFIC_CLASSES:
+            ahead += len(self._heaps[cls])
+            if cls == traffic_class:
+                return ahead
+        raise KeyError(traffic_class)
+
+    def empty(self) -> bool:
+        return not any(self._heaps.values())
+
+    def full(self, traffic_class: str) -> bool:
+        return 0 < self.maxsize <= len(self._heaps[traffic_class])
+
+    async def put(
+        self, item: Any, traffic_class: str, client: str, weight: float = 1.0
+    ) -> None:
+        """
+        Queue an item, waiting for room in its class if it is full.
+
+        Args:
+            item (Any): Item to queue.
+            traffic_class (str): Class the item is served in.
+            client (str): Client the item belongs to, for fair sharing.
+            weight (float): Relative share of the class the client gets.
+        """
+        putters = self._putters[traffic_class]
+        while self.full(traffic_class):
+            putter = asyncio.get_running_loop().create_future()
+            putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()
+                try:
+                    putters.remove(putter)
+                except ValueError:
+                    pass
+                if not self.full(traffic_class) and not putter.cancelled():
+                    self._wake_next(putters)
+                raise
+        self.put_nowait(item, traffic_class, client, weight)
+
+    def put_nowait(
+        self, item: Any, traffic_class: str, client: str, weight: float = 1.0
+    ) -> None:
+        """
+        Queue an item without waiting.
+
+        Raises:
+            asyncio.QueueFull: If the item's class is full.
+        """
+        if self.full(traffic_class):
+            raise asyncio.QueueFull
+        finish_tags = self._finish_tags[traffic_class]
+        start = max(self._virtual_time[traffic_class], finish_tags.get(client, 0.0))
+        tag = start + 1 / weight
+        finish_tags[client] = tag
+        heapq.heappush(self._heaps[traffic_class], (tag, next(self._seq), item))
+        self._wake_next(self._getters)
+
+    async def get(self) -> Any:
+        """
+        Take the next item to serve, waiting for one if the queue is empty.
+        """
+        while self.empty():
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                try:
+                    self._getters.remove(getter)
+                except ValueError:
+                    pass
+                if not self.empty() and not getter.cancelled():
+                    self._wake_next(self._getters)
+                raise
+        return self.get_nowait()
+
+    def get_nowait(self) -> Any:
+        """
+        Take the next item to serve without waiting.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty.
+        """
+        for cls in TRAFFIC_CLASSES:
+            heap = self._heaps[cls]
+            if heap:
+                tag, _, item = heapq.heappop(heap)
+                self._virtual_time[cls] = tag
+                if not heap:
+                    # No backlog left to be fair about: forget past usage
+                    self._virtual_time[cls] = 0.0
+                    self._finish_tags[cls].clear()
+                self._wake_next(self._putters[cls])
+                return item
+        raise asyncio.QueueEmpty
+
+    @staticmethod
+    def _wake_next(waiters: Deque[asyncio.Future]) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
@@ -1,12 +1,149 @@
 """Business logic for sentiment analysis service."""
 
-import torch
-from torch.nn.functional import softmax
+import asyncio
+import hashlib
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.core.config import settings
 from app.core.context import context
-from app.core.logger import logger
-from app.models.review import ReviewRequest, ReviewResponse
-from app.repositories.review_repository import save_review
+from app.core.exceptions import (
+    ModelNotReadyError,
+    OverloadedError,
+    RequestAbandonedError,
+    bad_request_exception,
+)
+from app.core.logger import logger, request_logger
+from app.core.metrics import SENTIMENT_STAGE_SECONDS
+from app.models.review import (
+    BatchReviewItem,
+    BatchReviewResponse,
+    ReviewRequest,
+    ReviewResponse,
+)
+from app.repositories.review_repository import save_review, save_reviews
+from app.services.registry import DEFAULT_MODEL
+from app.services.stats import invalidate_sentiment_stats
+
+if TYPE_CHECKING:
+    from app.services.inference import BatchingEngine
+
+# Errors answered with their own status code, expected under load: never
+# logged with a traceback, so shedding load does not flood the log
+EXPECTED_ERRORS = (
+    HTTPException,
+    ModelNotReadyError,
+    OverloadedError,
+    RequestAbandonedError,
+)
+
+
+def _prediction_key(text: str, namespace: str) -> str:
+    """
+    Build the prediction cache key for a review text.
+
+    The key is scoped by model version so switching or reloading models never
+    serves stale predictions.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+async def _resolve_engine(model: Optional[str]) -> Tuple[str, "BatchingEngine"]:
+    """
+    Get the engine serving a model, loading the model on first use.
+
+    Args:
+        model (Optional[str]): Registered model name (None for the default one).
+
+    Returns:
+        Tuple[str, BatchingEngine]: Cache namespace of the model version and its
+            engine.
+
+    Raises:
+        HTTPException: If no model is registered under that name.
+        ModelNotReadyError: If the model is not ready or failed to load.
+    """
+    if model is None or model == DEFAULT_MODEL:
+        engine = context.get_engine()
+        return context.model_version or settings.model_name, engine
+
+    try:
+        loaded = await context.get_registry().get(model)
+    except KeyError:
+        raise bad_request_exception(f"Unknown model '{model}'.")
+    except Exception as e:
+        logger.exception(f"Failed to load model '{model}': {e}")
+        raise ModelNotReadyError(f"Model '{model}' failed to load.") from e
+
+    return loaded.namespace, loaded.engine
+
+
+async def _predict(text: str, model: Optional[str] = None) -> ReviewResponse:
+    """
+    Predict the sentiment of a review, serving repeated texts from the cache.
+    """
+    namespace, engine = await _resolve_engine(model)
+    cache = context.get_prediction_cache()
+    key = _prediction_key(text, namespace)
+
+    response = cache.get(key)
+    if response is None:
+        response = await engine.predict(text)
+        cache.set(key, response)
+
+    return response
+
+
+async def _predict_many(
+    texts: List[str], models: Optional[List[Optional[str]]] = None
+) -> List[Union[ReviewResponse, Exception]]:
+    """
+    Predict several reviews at once, sending only uncached, distinct texts to
+    the model each review selected. Each model's engine batches its own reviews,
+    concurrently with the others.
+    """
+    cache = context.get_prediction_cache()
+    results: List[Union[ReviewResponse, Exception, None]] = [None] * len(texts)
+
+    groups: Dict[Optional[str], List[int]] = {}
+    for i, model in enumerate(models or [None] * len(texts)):
+        groups.setdefault(model, []).append(i)
+
+    async def predict_group(model: Optional[str], positions: List[int]) -> None:
+        try:
+            namespace, engine = await _resolve_engine(model)
+        except Exception as e:
+            for i in positions:
+                results[i] = e
+            return
+
+        keys = {i: _prediction_key(texts[i], namespace) for i in positions}
+        misses = []
+        for i in positions:
+            results[i] = cache.get(keys[i])
+            if results[i] is None:
+                misses.append(i)
+
+        if misses:
+            unique = list(dict.fromkeys(texts[i] for i in misses))
+            try:
+                predicted = await engine.predict_many(unique)
+            except Exception as e:
+                # e.g. this model is overloaded: only its own reviews fail
+                for i in misses:
+                    results[i] = e
+                return
+            predictions = dict(zip(unique, predicted))
+            for i in misses:
+                results[i] = predictions[texts[i]]
+                if not isinstance(results[i], Exception):
+                    cache.set(keys[i], results[i])
+
+    await asyncio.gather(*(predict_group(m, pos) for m, pos in groups.items()))
+    return results
 
 
 async def analyze_and_store_sentiment(request: ReviewRequest) -> ReviewResponse:
@@ -14,58 +151,275 @@ async def analyze_and_store_sentiment(request: ReviewRequest) -> ReviewResponse:
     Analyze the sentiment of a product review using a pre-trained transformer model
     and store the result in the database.
 
+    Repeated texts are served from the prediction cache; the rest is delegated
+    to the batching engine, which groups concurrent requests into a single
+    forward pass. In write-behind mode the review is handed to the write buffer
+    and stored after the response is sent.
+
     Args:
         request (ReviewRequest): Review data including text and product ID.
 
     Returns:
         ReviewResponse: Sentiment label and confidence score.
     """
-    logger.info(f"Starting sentiment analysis for product: {request.product_id}")
-
-    # Get the model and tokenizer from context
-    model, tokenizer = context.get_model()
-    device = context.get_device()  # Get the device (CPU or GPU)
-    model.to(device)  # Move the model to the appropriate device
+    request_logger.info(
+        "Starting sentiment analysis for product: {product_id}",
+        product_id=request.product_id,
+    )
 
     try:
-        # Tokenize and encode the input review
-        inputs = tokenizer(
-            request.review,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=512,
+        with SENTIMENT_STAGE_SECONDS.labels(stage="predict").time():
+            response = await _predict(request.review, request.model)
+
+        request_logger.info(
+            "Predicted sentiment: {sentiment} (confidence={confidence:.2f}) "
+            "for product={product_id}",
+            sentiment=response.sentiment,
+            confidence=response.confidence,
+            product_id=request.product_id,
         )
-        inputs = {key: val.to(device) for key, val in inputs.items()}
 
-        logger.debug(f"Tokenized input: {inputs}")
+        # Save the result in MongoDB, or queue it when writes are buffered
+        with SENTIMENT_STAGE_SECONDS.labels(stage="store").time():
+            if context.review_writer is not None:
+                await context.review_writer.add(request, response)
+            else:
+                await save_review(context.get_db(), request, response)
+                invalidate_sentiment_stats(request.product_id)
 
-        # Run the model inference
-        with torch.no_grad():
-            outputs = model(**inputs)
-            probabilities = softmax(outputs.logits, dim=1).squeeze()
+        return response
+    except EXPECTED_ERRORS:
+        raise
+    except Exception as e:
+        logger.exception(f"Sentiment analysis failed due to unexpected error: {e}")
+        raise
 
-        # Determine sentiment label and confidence
-        confidence, predicted_class = torch.max(probabilities, dim=0)
-        sentiment_label = "neutral"
-        if confidence >= 0.75:
-            sentiment_label = "positive" if predicted_class == 1 else "negative"
 
-        logger.info(
-            f"Predicted sentiment: {sentiment_label} "
-            f"(confidence={confidence.item():.2f}) for product={request.product_id}"
-        )
+async def analyze_and_store_sentiment_batch(
+    requests: List[ReviewRequest],
+) -> BatchReviewResponse:
+    """
+    Analyze a batch of reviews and store all results with a single bulk insert.
+
+    Failures are reported per review: an empty review, a failed prediction or
+    a failed write only affects its own entry in the response, as does a model
+    refusing its reviews while the others serve theirs.
+
+    Args:
+        requests (List[ReviewRequest]): Reviews to analyze.
+
+    Returns:
+        BatchReviewResponse: One result or error per review, in request order.
+
+    Raises:
+        OverloadedError: If the inference backlog is too long to take any of the
+            reviews (an overloaded model otherwise only fails its own reviews).
+        RequestAbandonedError: If reviews were dropped because the request's
+            deadline passed or its client disconnected (nothing is stored).
+    """
+    request_logger.info(
+        "Starting batch sentiment analysis for {reviews} reviews",
+        reviews=len(requests),
+    )
+
+    items = [BatchReviewItem(index=i) for i in range(len(requests))]
 
-        db = context.get_db()  # Get the MongoDB database instance
+    pending = []
+    for i, request in enumerate(requests):
+        if request.review.strip():
+            pending.append(i)
+        else:
+            items[i].error = "Review text cannot be empty."
 
-        response = ReviewResponse(
-            sentiment=sentiment_label, confidence=round(confidence.item(), 2)
+    with SENTIMENT_STAGE_SECONDS.labels(stage="predict").time():
+        predictions = await _predict_many(
+            [requests[i].review for i in pending],
+            [requests[i].model for i in pending],
         )
 
-        # Save the result in MongoDB
-        await save_review(db, request, response)
+    # No one is waiting for the rest of the batch anymore
+    for prediction in predictions:
+        if isinstance(prediction, RequestAbandonedError):
+            raise prediction
 
-        return response
-    except Exception as e:
-        logger.exception(f"Sentiment analysis failed due to unexpected error: {e}")
+    # Nothing could be taken: refuse the whole batch so the client retries it
+    if predictions and all(isinstance(p, OverloadedError) for p in predictions):
+        raise predictions[0]
+
+    predicted = []
+    for i, prediction in zip(pending, predictions):
+        if isinstance(prediction, HTTPException):
+            items[i].error = prediction.detail
+        elif isinstance(prediction, EXPECTED_ERRORS):
+            items[i].error = str(prediction)
+        elif isinstance(prediction, Exception):
+            logger.error(f"Prediction failed for batch item {i}: {prediction}")
+            items[i].error = "Sentiment analysis failed."
+        else:
+            items[i].result = prediction
+            predicted.append(i)
+
+    db = context.get_db()  # Get the MongoDB database instance
+
+    try:
+        with SENTIMENT_STAGE_SECONDS.labels(stage="store").time():
+            failed = await save_reviews(
+                db,
+                [requests[i] for i in predicted],
+                [items[i].result for i in predicted],
+            )
+        failed = {predicted[pos] for pos in failed}
+    except EXPECTED_ERRORS:
         raise
+    except Exception as e:
+        logger.exception(f"Bulk insert failed due to unexpected error: {e}")
+        failed = set(predicted)
+
+    for i in failed:
+        items[i].result = None
+        items[i].error = "Failed to store review."
+
+    invalidate_sentiment_stats(*{requests[i].product_id for i in predicted})
+
+    request_logger.info(
+        "Batch sentiment analysis finished: {stored}/{reviews} reviews stored",
+        stored=len(predicted) - len(failed),
+        reviews=len(requests),
+    )
+
+    return BatchReviewResponse(results=items)
+
+
+async def _iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Union[str, Exception]]:
+    """
+    Split a byte stream into NDJSON lines without buffering the whole body.
+
+    Blank lines are skipped. A line longer than ``max_line_bytes`` is yielded as
+    an exception and discarded, so a malformed upload cannot grow the buffer.
+    """
+    buffer = b""
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            if oversized:
+                # Tail of a line that already overflowed
+                oversized = False
+                yield ValueError("Line exceeds the maximum allowed size.")
+            elif line.strip():
+                yield line.decode("utf-8", errors="replace")
+
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            oversized = True
+
+    if oversized:
+        yield ValueError("Line exceeds the maximum allowed size.")
+    elif buffer.strip():
+        yield buffer.decode("utf-8", errors="replace")
+
+
+async def _process_stream_chunk(
+    offset: int, chunk: List[Union[ReviewRequest, str]]
+) -> List[BatchReviewItem]:
+    """
+    Run one chunk of parsed NDJSON lines through batched inference and storage.
+
+    Args:
+        offset (int): Index of the first line of the chunk within the stream.
+        chunk (List[Union[ReviewRequest, str]]): Parsed reviews, or the error
+            message for lines that could not be parsed.
+
+    Returns:
+        List[BatchReviewItem]: One result per line, indexed within the stream.
+    """
+    valid = [i for i, item in enumerate(chunk) if isinstance(item, ReviewRequest)]
+    try:
+        batch = await analyze_and_store_sentiment_batch([chunk[i] for i in valid])
+    except (OverloadedError, RequestAbandonedError) as e:
+        # Report the chunk as failed and keep streaming the next ones
+        batch = BatchReviewResponse(
+            results=[BatchReviewItem(index=i, error=str(e)) for i in valid]
+        )
+
+    items = [
+        BatchReviewItem(index=offset + i, error=item)
+        for i, item in enumerate(chunk)
+        if isinstance(item, str)
+    ]
+    for i, item in zip(valid, batch.results):
+        items.append(item.model_copy(update={"index": offset + i}))
+
+    return sorted(items, key=lambda item: item.index)
+
+
+async def analyze_and_store_sentiment_stream(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[str]:
+    """
+    Analyze and store an NDJSON stream of reviews, yielding NDJSON results.
+
+    Lines are parsed incrementally and grouped into chunks of
+    ``settings.stream_chunk_size`` reviews. While one chunk goes through
+    inference and the bulk insert, the next one is being read and parsed, so at
+    most two chunks are held in memory regardless of the upload size.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw request body chunks.
+
+    Yields:
+        str: One JSON-encoded ``BatchReviewItem`` per input line, newline-terminated.
+    """
+    request_logger.info("Starting streaming sentiment analysis")
+
+    in_flight: Optional[asyncio.Task] = None
+    chunk: List[Union[ReviewRequest, str]] = []
+    offset = 0
+    total = 0
+
+    async def flush() -> AsyncIterator[str]:
+        nonlocal in_flight, chunk, offset
+        previous, in_flight = in_flight, asyncio.create_task(
+            _process_stream_chunk(offset, chunk)
+        )
+        offset += len(chunk)
+        chunk = []
+        if previous is not None:
+            for item in await previous:
+                yield item.model_dump_json() + "\n"
+
+    try:
+        async for line in _iter_ndjson_lines(chunks, settings.stream_max_line_bytes):
+            total += 1
+            if isinstance(line, Exception):
+                chunk.append(str(line))
+            else:
+                try:
+                    chunk.append(ReviewRequest.model_validate_json(line))
+                except ValidationError as e:
+                    chunk.append(f"Invalid review: {e.errors()[0]['msg']}")
+
+            if len(chunk) >= settings.stream_chunk_size:
+                async for result in flush():
+                    yield result
+
+        if chunk:
+            async for result in flush():
+                yield result
+
+        if in_flight is not None:
+            for item in await in_flight:
+                yield item.model_dump_json() + "\n"
+            in_flight = None
+    finally:
+        if in_flight is not None:
+            in_flight.cancel()
+
+    request_logger.info(
+        "Streaming sentiment analysis finished: {lines} lines processed", lines=total
+    )
@@ -1,15 +1,38 @@
 """Service layer for computing sentiment statistics."""
 
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
 from app.core.context import context
-from app.core.exceptions import not_found_exception
-from app.models.stats import SentimentStatsResponse
-from app.repositories.stats_repository import fetch_sentiment_distribution_by_product
+from app.core.exceptions import bad_request_exception, not_found_exception
+from app.core.metrics import STATS_QUERY_SECONDS
+from app.models.stats import (
+    BulkStatsResponse,
+    SentimentStatsResponse,
+    SentimentTrendBucket,
+    SentimentTrendResponse,
+)
+from app.repositories.stats_repository import (
+    ROLLUP_GRANULARITIES,
+    SENTIMENT_LABELS,
+    bucket_start,
+    fetch_sentiment_distribution_by_product,
+    fetch_sentiment_distributions,
+    fetch_sentiment_trend,
+)
+
+# Buckets covered by a trend request that does not set ``start``
+DEFAULT_TREND_BUCKETS = {"hour": 24, "day": 30}
 
 
 async def compute_sentiment_stats_by_product(product_id: str) -> SentimentStatsResponse:
     """
     Compute sentiment stats for a specific product.
 
+    Responses are served from the stats cache while fresh; new reviews for the
+    product invalidate its entry.
+
     Args:
         product_id (str): Product identifier.
 
@@ -19,11 +42,146 @@ async def compute_sentiment_stats_by_product(product_id: str) -> SentimentStatsR
     Raises:
         HTTPException: If no reviews are found for the product.
     """
+    cache = context.get_stats_cache()
+    cached = cache.get(product_id)
+    if cached is not None:
+        return cached
+
     db = context.get_db()  # Get the MongoDB database instance
 
-    stats = await fetch_sentiment_distribution_by_product(db, product_id)
+    with STATS_QUERY_SECONDS.time():
+        stats = await fetch_sentiment_distribution_by_product(db, product_id)
 
     if not stats:
         raise not_found_exception(f"No reviews found for product '{product_id}'")
 
-    return SentimentStatsResponse(product_id=product_id, **stats)
+    response = SentimentStatsResponse(product_id=product_id, **stats)
+    cache.set(product_id, response)
+
+    return response
+
+
+async def compute_sentiment_stats_bulk(product_ids: List[str]) -> BulkStatsResponse:
+    """
+    Compute the sentiment stats of several products at once.
+
+    Products whose stats are cached are served from the stats cache; all the
+    others are resolved together with one ``$in`` query. Products without
+    reviews are reported as missing rather than failing the request.
+
+    Args:
+        product_ids (List[str]): Product identifiers (duplicates are ignored).
+
+    Returns:
+        BulkStatsResponse: Stats by product ID and the products without reviews.
+    """
+    cache = context.get_stats_cache()
+    product_ids = list(dict.fromkeys(product_ids))
+
+    stats = {}
+    uncached = []
+    for product_id in product_ids:
+        cached = cache.get(product_id)
+        if cached is not None:
+            stats[product_id] = cached
+        else:
+            uncached.append(product_id)
+
+    if uncached:
+        db = context.get_db()  # Get the MongoDB database instance
+
+        with STATS_QUERY_SECONDS.time():
+            distributions = await fetch_sentiment_distributions(db, uncached)
+
+        for product_id, distribution in distributions.items():
+            response = SentimentStatsResponse(product_id=product_id, **distribution)
+            cache.set(product_id, response)
+            stats[product_id] = response
+
+    return BulkStatsResponse(
+        stats={pid: stats[pid] for pid in product_ids if pid in stats},
+        missing=[pid for pid in product_ids if pid not in stats],
+    )
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """
+    Make a timestamp timezone-aware, taking naive values as UTC.
+    """
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+async def compute_sentiment_trend(
+    product_id: str,
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> SentimentTrendResponse:
+    """
+    Compute a product's sentiment distribution per hour or day.
+
+    Only the pre-aggregated rollups are read. ``start`` is aligned down to the
+    start of its bucket; buckets without reviews are omitted.
+
+    Args:
+        product_id (str): Product identifier.
+        granularity (str): "hour" or "day".
+        start (Optional[datetime]): Start of the range (defaults to the last 24
+            hours or 30 days before ``end``).
+        end (Optional[datetime]): End of the range, exclusive (defaults to now).
+
+    Returns:
+        SentimentTrendResponse: Sentiment distribution per bucket, oldest first.
+
+    Raises:
+        HTTPException (400): If the range is empty or spans more than
+            ``settings.trend_max_buckets`` buckets.
+    """
+    width = ROLLUP_GRANULARITIES[granularity]
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = (
+        _as_utc(start) if start else end - DEFAULT_TREND_BUCKETS[granularity] * width
+    )
+    start = bucket_start(start, granularity)
+
+    if start >= end:
+        raise bad_request_exception("'from' must be earlier than 'to'.")
+    if (end - start) / width > settings.trend_max_buckets:
+        raise bad_request_exception(
+            f"A trend cannot span more than {settings.trend_max_buckets} "
+            f"{granularity} buckets."
+        )
+
+    db = context.get_db()  # Get the MongoDB database instance
+    rollups = await fetch_sentiment_trend(db, product_id, granularity, start, end)
+
+    return SentimentTrendResponse(
+        product_id=product_id,
+        granularity=granularity,
+        buckets=[
+            SentimentTrendBucket(
+                start=_as_utc(rollup["bucket"]),
+                total=rollup["total"],
+                **{
+                    label: round(rollup.get(label, 0) / rollup["total"], 2)
+                    for label in SENTIMENT_LABELS
+                },
+            )
+            for rollup in rollups
+            if rollup.get("total")
+        ],
+    )
+
+
+def invalidate_sentiment_stats(*product_ids: str) -> None:
+    """
+    Drop the cached stats of products that just received new reviews.
+
+    Args:
+        *product_ids (str): Products whose stats changed.
+    """
+    cache = context.get_stats_cache()
+    for product_id in product_ids:
+        cache.invalidate(product_id)
@@ -0,0 +1,248 @@
+"""Load-testing benchmark for the API hot paths.
+
+Boots the real application with an in-process MongoDB stand-in
+(mongomock-motor), replays an NDJSON workload of reviews at a fixed
+concurrency against ``/reviews/sentiment`` and ``/reviews/stats/{product_id}``,
+and reports latency percentiles and throughput.
+
+Usage:
+    python -m benchmarks.api [--concurrency 16] [--requests 500]
+                             [--workload FILE] [--output FILE]
+                             [--baseline FILE] [--max-regression 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from multiprocessing import Process
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.config import settings
+from tests.utils import get_open_port, run_server, wait_for_port, wait_for_ready
+
+DEFAULT_WORKLOAD = Path(__file__).resolve().parent / "workload.jsonl"
+
+# Metrics compared against the baseline, and whether higher is better
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+}
+
+
+def load_workload(path: Path) -> List[Dict[str, str]]:
+    """
+    Load an NDJSON workload of ``{"product_id": ..., "review": ...}`` lines.
+
+    Args:
+        path (Path): Workload file.
+
+    Returns:
+        List[Dict[str, str]]: Review payloads, in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Summarize a scenario run.
+
+    Args:
+        latencies (List[float]): Latency of every successful request (seconds).
+        errors (int): Number of failed requests.
+        elapsed (float): Wall-clock duration of the run (seconds).
+
+    Returns:
+        Dict: Request counts, p50/p95/p99 latency (ms) and throughput.
+    """
+    result = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        result.update(
+            {
+                "p50_ms": round(percentiles[49] * 1000, 2),
+                "p95_ms": round(percentiles[94] * 1000, 2),
+                "p99_ms": round(percentiles[98] * 1000, 2),
+            }
+        )
+    return result
+
+
+async def run_scenario(
+    client: AsyncClient,
+    make_request,
+    total: int,
+    concurrency: int,
+) -> Dict:
+    """
+    Send ``total`` requests with at most ``concurrency`` in flight.
+
+    Args:
+        client (AsyncClient): HTTP client bound to the server.
+        make_request (Callable[[AsyncClient, int], Awaitable[Response]]): Sends
+            the i-th request of the scenario.
+        total (int): Number of requests to send.
+        concurrency (int): Number of concurrent clients.
+
+    Returns:
+        Dict: Summary produced by :func:`summarize`.
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def client_loop():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                response.raise_for_status()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_benchmark(
+    port: int, workload: List[Dict[str, str]], total: int, concurrency: int
+) -> Dict:
+    """
+    Run the sentiment and stats scenarios against a running server.
+    """
+    headers = {"X-API-Key": settings.api_key}
+    product_ids = sorted({review["product_id"] for review in workload})
+
+    async def predict(client: AsyncClient, i: int):
+        return await client.post(
+            "/reviews/sentiment", json=workload[i % len(workload)], headers=headers
+        )
+
+    async def stats(client: AsyncClient, i: int):
+        product_id = product_ids[i % len(product_ids)]
+        return await client.get(f"/reviews/stats/{product_id}", headers=headers)
+
+    async with AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0) as client:
+        # Warm-up: send every workload review once, which also seeds each product
+        for i in range(len(workload)):
+            await predict(client, i)
+
+        return {
+            "sentiment": await run_scenario(client, predict, total, concurrency),
+            "stats": await run_scenario(client, stats, total, concurrency),
+        }
+
+
+def compare_with_baseline(
+    results: Dict, baseline: Dict, max_regression: float
+) -> List[str]:
+    """
+    List the metrics that regressed beyond ``max_regression`` versus a baseline.
+
+    Args:
+        results (Dict): Current benchmark results.
+        baseline (Dict): Stored benchmark results.
+        max_regression (float): Allowed relative regression (0.2 = 20%).
+
+    Returns:
+        List[str]: Human-readable description of each regression.
+    """
+    regressions = []
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {})
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in current or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            if (-change if higher_is_better else change) > max_regression:
+                regressions.append(
+                    f"{scenario}.{metric}: {previous[metric]} -> {current[metric]} "
+                    f"({change:+.1%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workload", type=Path, default=DEFAULT_WORKLOAD)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Baseline results to compare")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    args = parser.parse_args(argv)
+
+    workload = load_workload(args.workload)
+    port = get_open_port()
+
+    # The patch is inherited by the forked server process
+    with patch("app.get_mongo_client", AsyncMongoMockClient):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+    try:
+        asyncio.run(wait_for_port(port, timeout=args.startup_timeout))
+        asyncio.run(wait_for_ready(port, timeout=args.startup_timeout))
+        scenarios = asyncio.run(
+            run_benchmark(port, workload, args.requests, args.concurrency)
+        )
+    finally:
+        proc.terminate()
+        proc.join()
+
+    results = {
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "workload": str(args.workload),
+            "model_name": settings.model_name,
+            "inference_backend": settings.inference_backend,
+            "model_quantization": settings.model_quantization,
+            "batch_max_size": settings.batch_max_size,
+            "batch_max_wait_ms": settings.batch_max_wait_ms,
+        },
+        "scenarios": scenarios,
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; skipping comparison.")
+            return 0
+
+        regressions = compare_with_baseline(
+            results, json.loads(args.baseline.read_text()), args.max_regression
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regression beyond {args.max_regression:.0%} versus baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Benchmark of the PyTorch and ONNX Runtime inference backends.
+
+Usage:
+    python -m benchmarks.backends [--batch-size 32] [--repeat 20] [--output FILE]
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.services.backends import (
+    VALIDATION_TEXTS,
+    OnnxBackend,
+    TorchBackend,
+    compare_backends,
+    export_onnx,
+    onnx_model_path,
+)
+from app.services.inference import threads_per_worker
+
+
+def benchmark_backend(
+    backend, tokenizer: AutoTokenizer, texts: List[str], batch_size: int, repeat: int
+) -> Dict[str, float]:
+    """
+    Measure the forward-pass latency of a backend on a fixed batch.
+
+    Args:
+        backend (TorchBackend | OnnxBackend): Backend to measure.
+        tokenizer (AutoTokenizer): Tokenizer associated with the model.
+        texts (List[str]): Reviews to cycle through.
+        batch_size (int): Reviews per forward pass.
+        repeat (int): Number of timed forward passes.
+
+    Returns:
+        Dict[str, float]: Mean latency per batch (ms) and throughput (reviews/s).
+    """
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    inputs = tokenizer(batch, return_tensors=backend.tensor_type, padding=True)
+
+    backend.predict_proba(inputs)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        backend.predict_proba(inputs)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "batch_latency_ms": round(elapsed / repeat * 1000, 3),
+        "reviews_per_second": round(batch_size * repeat / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.batch_max_size)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    num_threads = threads_per_worker(1, settings.torch_num_threads)
+    torch.set_num_threads(num_threads)
+
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(settings.model_name)
+    model.eval()
+
+    path = onnx_model_path(settings.model_name)
+    if not path.exists():
+        export_onnx(model, tokenizer, path)
+
+    torch_backend = TorchBackend(model, torch.device("cpu"))
+    onnx_backend = OnnxBackend(path, num_threads)
+
+    results = {
+        "model_name": settings.model_name,
+        "batch_size": args.batch_size,
+        "num_threads": num_threads,
+        "max_abs_diff": compare_backends(tokenizer, torch_backend, onnx_backend),
+    }
+    for backend in (torch_backend, onnx_backend):
+        results[backend.name] = benchmark_backend(
+            backend, tokenizer, VALIDATION_TEXTS, args.batch_size, args.repeat
+        )
+    results["onnx_speedup"] = round(
+        results["torch"]["batch_latency_ms"] / results["onnx"]["batch_latency_ms"], 2
+    )
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
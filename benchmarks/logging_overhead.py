@@ -0,0 +1,185 @@
+"""Benchmark of the logging overhead per sentiment request.
+
+Replays the log calls made by one sentiment request under several logger
+configurations and reports the time each request spends logging, both as seen
+by the caller (what the event loop pays) and including the time to flush the
+records to the sink. ``--write-delay-us`` makes every write block, like a
+stdout pipe whose reader (e.g. a log collector) falls behind.
+
+Usage:
+    python -m benchmarks.logging_overhead [--requests 20000] [--level INFO]
+        [--sink FILE] [--write-delay-us 0] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, TextIO
+
+from app.core.config import settings
+from app.core.logger import configure_logger, logger, request_logger
+
+# (log_async, log_format, log_diagnose, log_sample_rate) of each configuration
+CONFIGURATIONS = {
+    "sync_fstrings": (False, "text", True, 1.0),
+    "sync_lazy": (False, "text", False, 1.0),
+    "async_lazy": (True, "text", False, 1.0),
+    "async_json": (True, "json", False, 1.0),
+    "async_sampled_10pct": (True, "text", False, 0.1),
+}
+
+
+def log_request_fstrings(product_id: str) -> None:
+    """
+    Log calls of a request before lazy messages: always formatted, even DEBUG.
+    """
+    logger.info(f"Starting sentiment analysis for product: {product_id}")
+    logger.info(
+        f"Predicted sentiment: positive (confidence={0.98:.2f}) "
+        f"for product={product_id}"
+    )
+    logger.debug(f"Ran batched inference on {32} reviews (padding efficiency 0.87)")
+
+
+def log_request_lazy(product_id: str) -> None:
+    """
+    Log calls of a request with lazy, structured messages.
+    """
+    request_logger.info(
+        "Starting sentiment analysis for product: {product_id}", product_id=product_id
+    )
+    request_logger.info(
+        "Predicted sentiment: {sentiment} (confidence={confidence:.2f}) "
+        "for product={product_id}",
+        sentiment="positive",
+        confidence=0.98,
+        product_id=product_id,
+    )
+    logger.debug(
+        "Ran batched inference on {reviews} reviews "
+        "(padding efficiency {efficiency:.2f})",
+        reviews=32,
+        efficiency=0.87,
+    )
+
+
+class SlowStream:
+    """
+    Stream whose writes block for a fixed time before reaching the file.
+    """
+
+    def __init__(self, stream: TextIO, delay: float):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, message: str) -> None:
+        time.sleep(self.delay)
+        self.stream.write(message)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+async def flush_logs() -> None:
+    """
+    Wait until every log record is written to the sink.
+    """
+    await logger.complete()
+
+
+def benchmark_configuration(
+    log_request: Callable[[str], None],
+    level: str,
+    sink: str,
+    write_delay: float,
+    requests: int,
+) -> Dict[str, float]:
+    """
+    Measure the logging time per request under the current ``settings``.
+
+    Args:
+        log_request (Callable[[str], None]): Log calls made by one request.
+        level (str): Logging level.
+        sink (str): File the logs are written to.
+        write_delay (float): Seconds each write to the sink blocks for.
+        requests (int): Number of simulated requests.
+
+    Returns:
+        Dict[str, float]: Mean caller and end-to-end time per request (µs).
+    """
+    stdout = sys.stdout
+    with open(sink, "w") as f:
+        sys.stdout = SlowStream(f, write_delay) if write_delay else f
+        try:
+            configure_logger(level)
+            for i in range(min(requests, 1000)):  # Warm-up
+                log_request(f"SKU-{i}")
+            asyncio.run(flush_logs())
+
+            start = time.perf_counter()
+            for i in range(requests):
+                log_request(f"SKU-{i}")
+            caller = time.perf_counter() - start
+            asyncio.run(flush_logs())
+            total = time.perf_counter() - start
+            logger.remove()
+        finally:
+            sys.stdout = stdout
+
+    return {
+        "caller_us_per_request": round(caller / requests * 1e6, 2),
+        "total_us_per_request": round(total / requests * 1e6, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--level", default="INFO")
+    parser.add_argument(
+        "--sink", default=os.devnull, help="File logs are written to (stdout stand-in)"
+    )
+    parser.add_argument(
+        "--write-delay-us",
+        type=float,
+        default=0.0,
+        help="Time each write to the sink blocks for",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {
+        "requests": args.requests,
+        "level": args.level,
+        "write_delay_us": args.write_delay_us,
+    }
+    for name, (log_async, log_format, diagnose, sample_rate) in CONFIGURATIONS.items():
+        settings.log_async = log_async
+        settings.log_format = log_format
+        settings.log_diagnose = diagnose
+        settings.log_sample_rate = sample_rate
+        log_request = (
+            log_request_fstrings if name == "sync_fstrings" else log_request_lazy
+        )
+        results[name] = benchmark_configuration(
+            log_request,
+            args.level,
+            args.sink,
+            args.write_delay_us / 1e6,
+            args.requests,
+        )
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""End-to-end tests for the model administration endpoints."""
+
+import asyncio
+from multiprocessing import Process
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.context import context
+from tests.utils import get_open_port, run_server, wait_for_port, wait_for_ready
+
+
+def fake_load(model_id: str, use_preloaded: bool = True):
+    engine = MagicMock()
+    for method in ("start", "warm_up", "drain", "stop"):
+        setattr(engine, method, AsyncMock())
+    engine.saturation = 0.0
+    engine.queue_depth = 0
+    engine.max_queue_size = 1024
+    return MagicMock(), MagicMock(), "cpu", engine
+
+
+@pytest.mark.asyncio
+async def test_model_reload_and_rollback():
+    port = get_open_port()
+
+    with patch(
+        "app.services.model_loader.load_inference_engine", side_effect=fake_load
+    ), patch("app.ensure_indexes", AsyncMock()), patch.object(
+        context, "get_db", return_value=AsyncMock()
+    ), patch.object(
+        settings, "admin_api_key", "admin-secret"
+    ), patch.object(
+        settings, "admin_allowed_models", ["new-model"]
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+    try:
+        await wait_for_port(port)
+        await wait_for_ready(port, timeout=5)
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            headers = {"X-Admin-Key": "admin-secret"}
+
+            response = await client.post("/admin/models/default/reload")
+            assert response.status_code == 401
+
+            # Client API keys cannot reach the admin endpoints
+            response = await client.post(
+                "/admin/models/default/reload",
+                headers={"X-API-Key": settings.api_key},
+            )
+            assert response.status_code == 401
+
+            response = await client.post(
+                "/admin/models/default/reload",
+                json={"model_id": "/tmp/untrusted-model"},
+                headers=headers,
+            )
+            assert response.status_code == 403
+
+            response = await client.post(
+                "/admin/models/default/rollback", headers=headers
+            )
+            assert response.status_code == 409
+
+            response = await client.post(
+                "/admin/models/missing/reload", headers=headers
+            )
+            assert response.status_code == 404
+
+            response = await client.post(
+                "/admin/models/default/reload",
+                json={"model_id": "new-model"},
+                headers=headers,
+            )
+            assert response.status_code == 202
+            assert response.json()["pending_model_id"] == "new-model"
+
+            for _ in range(50):
+                models = (await client.get("/admin/models", headers=headers)).json()
+                if models[0]["state"] == "ready":
+                    break
+                await asyncio.sleep(0.1)
+
+            assert models == [
+                {
+                    "name": "default",
+                    "state": "ready",
+                    "model_id": "new-model",
+                    "version": 2,
+                    "pending_model_id": None,
+                    "previous_model_id": settings.model_name,
+                    "error": None,
+                }
+            ]
+
+            # The swap never takes the instance out of service
+            response = await client.get("/health/ready")
+            assert response.status_code == 200
+
+            response = await client.post(
+                "/admin/models/default/rollback", headers=headers
+            )
+            assert response.status_code == 202
+            assert response.json()["pending_model_id"] == settings.model_name
+
+    finally:
+        proc.terminate()
+        proc.join()
@@ -1,11 +1,15 @@
-"""Test for the health check endpoint with real HTTP server and proper sync."""
+"""Tests for the liveness and readiness endpoints with a real HTTP server."""
 
+import asyncio
 from multiprocessing import Process
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
 
-from tests.utils import get_open_port, run_server, wait_for_port
+from app.core.config import settings
+from app.core.context import context
+from tests.utils import get_open_port, run_server, wait_for_port, wait_for_ready
 
 
 @pytest.mark.asyncio
@@ -18,9 +22,99 @@ async def test_health_check():
         await wait_for_port(port)
 
         async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            for path in ("/health/live", "/health"):
+                response = await client.get(path)
+                assert response.status_code == 200
+                assert response.json() == {"status": "healthy"}
+
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+@pytest.mark.asyncio
+async def test_readiness_check_once_model_loaded():
+    port = get_open_port()
+
+    mock_engine = MagicMock()
+    mock_engine.start = AsyncMock()
+    mock_engine.stop = AsyncMock()
+    mock_engine.warm_up = AsyncMock(return_value=0.1)
+    mock_engine.saturation = 0.0
+    mock_engine.queue_depth = 0
+    mock_engine.max_queue_size = 1024
+
+    with patch(
+        "app.services.model_loader.load_inference_engine",
+        return_value=(MagicMock(), MagicMock(), "cpu", mock_engine),
+    ), patch("app.ensure_indexes", AsyncMock()), patch.object(
+        context, "get_db", return_value=AsyncMock()
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+    try:
+        await wait_for_port(port)
+        await wait_for_ready(port, timeout=5)
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            response = await client.get("/health/ready")
+            assert response.status_code == 200
+
+            readiness = response.json()
+            assert readiness["status"] == "ready"
+            assert readiness["checks"]["model"] == {"ok": True, "detail": "ready"}
+            assert readiness["checks"]["mongo"]["ok"] is True
+            assert readiness["checks"]["queue"] == {
+                "ok": True,
+                "detail": "0/1024 queued",
+            }
+
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+@pytest.mark.asyncio
+async def test_readiness_check_when_model_fails_to_load():
+    port = get_open_port()
+
+    with patch(
+        "app.services.model_loader.load_inference_engine",
+        side_effect=OSError("model not found"),
+    ), patch.object(context, "get_db", return_value=AsyncMock()):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+    try:
+        await wait_for_port(port)
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            # Liveness does not depend on the model
             response = await client.get("/health")
             assert response.status_code == 200
-            assert response.json() == {"status": "healthy"}
+
+            for _ in range(50):
+                response = await client.get("/health/ready")
+                if response.json()["checks"]["model"]["detail"] != "loading":
+                    break
+                await asyncio.sleep(0.1)
+
+            assert response.status_code == 503
+            readiness = response.json()
+            assert readiness["status"] == "not_ready"
+            assert readiness["checks"]["model"] == {"ok": False, "detail": "failed"}
+
+            response = await client.post(
+                "/reviews/sentiment",
+                json={
+                    "product_id": "prod1",
+                    "review": "Great product, really love it!",
+                },
+                headers={"X-API-Key": settings.api_key},
+            )
+            assert response.status_code == 503
+            assert "Retry-After" in response.headers
 
     finally:
         proc.terminate()
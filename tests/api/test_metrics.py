@@ -0,0 +1,68 @@
+"""Test for the Prometheus metrics endpoint."""
+
+import os
+import subprocess
+import sys
+import textwrap
+from multiprocessing import Process
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from tests.utils import get_open_port, run_server, wait_for_port
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    port = get_open_port()
+    proc = Process(target=run_server, args=(port,))
+    proc.start()
+
+    try:
+        await wait_for_port(port)
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            response = await client.get("/metrics")
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/plain")
+            assert "inference_queue_depth" in response.text
+            assert "event_loop_lag_seconds" in response.text
+
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+# Two forked workers record metrics; the parent renders the scrape
+MULTIPROCESS_SCRIPT = textwrap.dedent(
+    """
+    import os
+    from prometheus_client import generate_latest
+    from app.core.metrics import INFERENCE_BATCH_SIZE, metrics_registry
+
+    for size in (4, 8):
+        pid = os.fork()
+        if pid == 0:
+            INFERENCE_BATCH_SIZE.observe(size)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+    print(generate_latest(metrics_registry()).decode())
+    """
+)
+
+
+def test_metrics_are_aggregated_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    result = subprocess.run(
+        [sys.executable, "-c", MULTIPROCESS_SCRIPT],
+        env=env,
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "inference_batch_size_count 2.0" in result.stdout
+    assert "inference_batch_size_sum 12.0" in result.stdout
@@ -0,0 +1,269 @@
+"""End-to-end tests for the sentiment analysis endpoints."""
+
+import json
+from multiprocessing import Process
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.context import context
+from app.core.exceptions import OverloadedError
+from app.models.review import ReviewResponse
+from tests.utils import get_open_port, run_server, wait_for_port
+
+
+@pytest.mark.asyncio
+async def test_batch_sentiment_endpoint_partial_failures():
+    """Per-review errors should not fail the rest of the batch."""
+    port = get_open_port()
+
+    mock_engine = MagicMock()
+    mock_engine.predict_many = AsyncMock(
+        return_value=[
+            ReviewResponse(sentiment="positive", confidence=0.98),
+            RuntimeError("boom"),
+            ReviewResponse(sentiment="negative", confidence=0.91),
+        ]
+    )
+
+    mock_collection = AsyncMock()
+    mock_collection.insert_many.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 1, "errmsg": "duplicate"}]}
+    )
+
+    mock_db = AsyncMock()
+    mock_db.reviews = mock_collection
+
+    payload = {
+        "reviews": [
+            {"product_id": "prod1", "review": "Absolutely loved this product!"},
+            {"product_id": "prod1", "review": "          "},
+            {"product_id": "prod1", "review": "It broke after a single day."},
+            {"product_id": "prod2", "review": "Arrived late and looks cheap."},
+        ]
+    }
+
+    with patch.object(context, "get_db", return_value=mock_db), patch.object(
+        context, "get_engine", return_value=mock_engine
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.post(
+                    "/reviews/sentiment/batch", json=payload, headers=headers
+                )
+
+                assert response.status_code == 201
+                assert response.json() == {
+                    "results": [
+                        {
+                            "index": 0,
+                            "result": {"sentiment": "positive", "confidence": 0.98},
+                            "error": None,
+                        },
+                        {
+                            "index": 1,
+                            "result": None,
+                            "error": "Review text cannot be empty.",
+                        },
+                        {
+                            "index": 2,
+                            "result": None,
+                            "error": "Sentiment analysis failed.",
+                        },
+                        {
+                            "index": 3,
+                            "result": None,
+                            "error": "Failed to store review.",
+                        },
+                    ]
+                }
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_batch_sentiment_endpoint_too_many_reviews():
+    """Should return 400 if the batch exceeds the configured maximum size."""
+    port = get_open_port()
+    proc = Process(target=run_server, args=(port,))
+    proc.start()
+
+    try:
+        await wait_for_port(port)
+
+        review = {"product_id": "prod1", "review": "Absolutely loved this product!"}
+        payload = {"reviews": [review] * (settings.batch_request_max_items + 1)}
+
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            headers = {"X-API-Key": settings.api_key}
+            response = await client.post(
+                "/reviews/sentiment/batch", json=payload, headers=headers
+            )
+            assert response.status_code == 400
+            assert "cannot contain more than" in response.json()["detail"]
+
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+@pytest.mark.asyncio
+async def test_sentiment_endpoint_sheds_load():
+    """Should return 429 with Retry-After when the backlog is too long, and
+    400 for an invalid deadline header."""
+    port = get_open_port()
+
+    mock_engine = MagicMock()
+    mock_engine.predict_many = AsyncMock(
+        side_effect=OverloadedError("Inference backlog too long.", retry_after=3)
+    )
+
+    review = {"product_id": "prod1", "review": "Absolutely loved this product!"}
+    payload = {"reviews": [review]}
+
+    with patch.object(context, "get_db", return_value=AsyncMock()), patch.object(
+        context, "get_engine", return_value=mock_engine
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.post(
+                    "/reviews/sentiment/batch", json=payload, headers=headers
+                )
+                assert response.status_code == 429
+                assert response.headers["retry-after"] == "3"
+
+                headers["X-Request-Deadline-Ms"] = "soon"
+                response = await client.post(
+                    "/reviews/sentiment/batch", json=payload, headers=headers
+                )
+                assert response.status_code == 400
+                assert "X-Request-Deadline-Ms" in response.json()["detail"]
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_stream_sentiment_endpoint():
+    """NDJSON lines should be streamed back as per-line results."""
+    port = get_open_port()
+
+    async def predict_many(texts):
+        return [ReviewResponse(sentiment="positive", confidence=0.97) for _ in texts]
+
+    mock_engine = MagicMock()
+    mock_engine.predict_many = predict_many
+
+    mock_db = AsyncMock()
+
+    body = (
+        b'{"product_id": "prod1", "review": "Absolutely loved this product!"}\n'
+        b"this is not json\n"
+        b"\n"
+        b'{"product_id": "prod2", "review": "Works exactly as described."}\n'
+    )
+
+    with patch.object(context, "get_db", return_value=mock_db), patch.object(
+        context, "get_engine", return_value=mock_engine
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {
+                    "X-API-Key": settings.api_key,
+                    "Content-Type": "application/x-ndjson",
+                }
+                response = await client.post(
+                    "/reviews/sentiment/stream", content=body, headers=headers
+                )
+
+                assert response.status_code == 200
+                assert response.headers["content-type"] == "application/x-ndjson"
+
+                lines = [json.loads(line) for line in response.text.splitlines()]
+                assert [line["index"] for line in lines] == [0, 1, 2]
+                assert lines[0]["result"]["sentiment"] == "positive"
+                assert lines[1]["error"].startswith("Invalid review")
+                assert lines[2]["result"]["sentiment"] == "positive"
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_batch_sentiment_endpoint_unknown_model():
+    """A review selecting an unregistered model should fail on its own."""
+    port = get_open_port()
+
+    mock_engine = MagicMock()
+    mock_engine.predict_many = AsyncMock(
+        return_value=[ReviewResponse(sentiment="positive", confidence=0.98)]
+    )
+
+    mock_db = AsyncMock()
+    mock_db.reviews = AsyncMock()
+
+    payload = {
+        "reviews": [
+            {"product_id": "prod1", "review": "Absolutely loved this product!"},
+            {
+                "product_id": "prod1",
+                "review": "It broke after a single day.",
+                "model": "missing",
+            },
+        ]
+    }
+
+    with patch.object(context, "get_db", return_value=mock_db), patch.object(
+        context, "get_engine", return_value=mock_engine
+    ):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.post(
+                    "/reviews/sentiment/batch", json=payload, headers=headers
+                )
+
+                assert response.status_code == 201
+                results = response.json()["results"]
+                assert results[0]["result"] == {
+                    "sentiment": "positive",
+                    "confidence": 0.98,
+                }
+                assert results[1] == {
+                    "index": 1,
+                    "result": None,
+                    "error": "Unknown model 'missing'.",
+                }
+
+        finally:
+            proc.terminate()
+            proc.join()
@@ -1,10 +1,12 @@
 """End-to-end test for sentiment stats endpoint."""
 
+from datetime import datetime
 from multiprocessing import Process
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
+from mongomock_motor import AsyncMongoMockClient
 
 from app.core.config import settings
 from app.core.context import context
@@ -17,18 +19,20 @@ async def test_stats_endpoint():
     port = get_open_port()
 
     # Setup mock data
-    mock_reviews = [
-        {"product_id": "prod1", "sentiment": "positive"},
-        {"product_id": "prod1", "sentiment": "neutral"},
-        {"product_id": "prod1", "sentiment": "positive"},
-        {"product_id": "prod1", "sentiment": "negative"},
-    ]
+    mock_counters = {
+        "_id": "prod1",
+        "positive": 2,
+        "neutral": 1,
+        "negative": 1,
+        "total": 4,
+        "backfilled": True,
+    }
 
     mock_collection = AsyncMock()
-    mock_collection.find = lambda *args, **kwargs: AsyncCursorMock(mock_reviews)
+    mock_collection.find_one.return_value = mock_counters
 
     mock_db = AsyncMock()
-    mock_db.reviews = mock_collection
+    mock_db.review_counters = mock_collection
 
     with patch.object(context, "get_db", return_value=mock_db):
         proc = Process(target=run_server, args=(port,))
@@ -80,10 +84,14 @@ async def test_stats_endpoint_product_not_found():
     port = get_open_port()
 
     mock_collection = AsyncMock()
-    mock_collection.find = lambda *args, **kwargs: AsyncCursorMock([])
+    mock_collection.find_one.return_value = None
+
+    mock_reviews = AsyncMock()
+    mock_reviews.aggregate = lambda *args, **kwargs: AsyncCursorMock([])
 
     mock_db = AsyncMock()
-    mock_db.reviews = mock_collection
+    mock_db.review_counters = mock_collection
+    mock_db.reviews = mock_reviews
 
     with patch.object(context, "get_db", return_value=mock_db):
         proc = Process(target=run_server, args=(port,))
@@ -102,3 +110,235 @@ async def test_stats_endpoint_product_not_found():
         finally:
             proc.terminate()
             proc.join()
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint_without_counters():
+    """Should aggregate the reviews collection if the product has no counters."""
+    port = get_open_port()
+
+    mock_counts = [
+        {"_id": "positive", "count": 3},
+        {"_id": "negative", "count": 1},
+    ]
+
+    mock_collection = AsyncMock()
+    mock_collection.find_one.return_value = None
+
+    mock_reviews = AsyncMock()
+    mock_reviews.aggregate = lambda *args, **kwargs: AsyncCursorMock(mock_counts)
+
+    mock_db = AsyncMock()
+    mock_db.review_counters = mock_collection
+    mock_db.reviews = mock_reviews
+
+    with patch.object(context, "get_db", return_value=mock_db):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.get("/reviews/stats/prod1", headers=headers)
+
+                assert response.status_code == 200
+                assert response.json() == {
+                    "positive": 0.75,
+                    "neutral": 0.0,
+                    "negative": 0.25,
+                    "product_id": "prod1",
+                }
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint_conditional_get():
+    """Should return 304 when If-None-Match carries the current ETag."""
+    port = get_open_port()
+
+    mock_collection = AsyncMock()
+    mock_collection.find_one.return_value = {
+        "_id": "prod1",
+        "positive": 1,
+        "total": 1,
+        "backfilled": True,
+    }
+
+    mock_db = AsyncMock()
+    mock_db.review_counters = mock_collection
+
+    with patch.object(context, "get_db", return_value=mock_db):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.get("/reviews/stats/prod1", headers=headers)
+
+                assert response.status_code == 200
+                assert "max-age" in response.headers["Cache-Control"]
+                etag = response.headers["ETag"]
+
+                headers["If-None-Match"] = etag
+                response = await client.get("/reviews/stats/prod1", headers=headers)
+
+                assert response.status_code == 304
+                assert response.headers["ETag"] == etag
+                assert response.content == b""
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_trend_endpoint():
+    """Should return the hourly sentiment distribution read from the rollups."""
+    port = get_open_port()
+
+    db = AsyncMongoMockClient()["test"]
+    await db.review_rollups.insert_many(
+        [
+            {
+                "product_id": "prod1",
+                "granularity": "hour",
+                "bucket": datetime(2025, 1, 1, hour),
+                "positive": positive,
+                "negative": 4 - positive,
+                "total": 4,
+            }
+            for hour, positive in ((12, 4), (13, 3), (15, 1))
+        ]
+    )
+
+    with patch.object(context, "get_db", return_value=db):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.get(
+                    "/reviews/stats/prod1/trend",
+                    params={
+                        "granularity": "hour",
+                        "from": "2025-01-01T13:30:00Z",
+                        "to": "2025-01-01T16:00:00Z",
+                    },
+                    headers=headers,
+                )
+
+                assert response.status_code == 200
+                assert response.json() == {
+                    "product_id": "prod1",
+                    "granularity": "hour",
+                    "buckets": [
+                        {
+                            "start": "2025-01-01T13:00:00Z",
+                            "total": 4,
+                            "positive": 0.75,
+                            "neutral": 0.0,
+                            "negative": 0.25,
+                        },
+                        {
+                            "start": "2025-01-01T15:00:00Z",
+                            "total": 4,
+                            "positive": 0.25,
+                            "neutral": 0.0,
+                            "negative": 0.75,
+                        },
+                    ],
+                }
+
+                response = await client.get(
+                    "/reviews/stats/prod1/trend",
+                    params={"from": "2025-01-01", "to": "2024-01-01"},
+                    headers=headers,
+                )
+                assert response.status_code == 400
+
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+@pytest.mark.asyncio
+async def test_bulk_stats_endpoint():
+    """Should resolve several products at once and report those without reviews."""
+    port = get_open_port()
+
+    db = AsyncMongoMockClient()["test"]
+    await db.review_counters.insert_one(
+        {
+            "_id": "prod1",
+            "positive": 3,
+            "negative": 1,
+            "total": 4,
+            "backfilled": True,
+        }
+    )
+    # prod2 has reviews but no backfilled counters yet
+    await db.reviews.insert_many(
+        [
+            {"product_id": "prod2", "sentiment": "negative"},
+            {"product_id": "prod2", "sentiment": "neutral"},
+        ]
+    )
+
+    with patch.object(context, "get_db", return_value=db):
+        proc = Process(target=run_server, args=(port,))
+        proc.start()
+
+        try:
+            await wait_for_port(port)
+
+            async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                headers = {"X-API-Key": settings.api_key}
+                response = await client.post(
+                    "/reviews/stats/bulk",
+                    json={"product_ids": ["prod1", "prod3", "prod2", "prod1"]},
+                    headers=headers,
+                )
+
+                assert response.status_code == 200
+                assert response.json() == {
+                    "stats": {
+                        "prod1": {
+                            "product_id": "prod1",
+                            "positive": 0.75,
+                            "neutral": 0.0,
+                            "negative": 0.25,
+                        },
+                        "prod2": {
+                            "product_id": "prod2",
+                            "positive": 0.0,
+                            "neutral": 0.5,
+                            "negative": 0.5,
+                        },
+                    },
+                    "missing": ["prod3"],
+                }
+
+                too_many = [
+                    f"prod{i}" for i in range(settings.bulk_stats_max_products + 1)
+                ]
+                response = await client.post(
+                    "/reviews/stats/bulk",
+                    json={"product_ids": too_many},
+                    headers=headers,
+                )
+                assert response.status_code == 400
+
+        finally:
+            proc.terminate()
+            proc.join()
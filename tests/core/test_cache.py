@@ -0,0 +1,87 @@
+"""Unit tests for the LRU/TTL cache."""
+
+from app.core.cache import LRUTTLCache, estimate_size
+from app.models.stats import SentimentStatsResponse
+
+
+class FakeClock:
+    """Manually advanced replacement for ``time.monotonic``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hits_and_misses():
+    cache = LRUTTLCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUTTLCache(max_entries=2, max_bytes=10_000, ttl_seconds=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes the least recently used entry
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_cache_respects_memory_budget():
+    cache = LRUTTLCache(
+        max_entries=100, max_bytes=25, ttl_seconds=60, sizeof=lambda k, v: 10
+    )
+
+    for key in "abc":
+        cache.set(key, key)
+
+    assert len(cache) == 2
+    assert cache.size_bytes == 20
+    assert cache.get("a") is None
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_entries=10, max_bytes=10_000, ttl_seconds=5, timer=clock)
+
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_disabled():
+    cache = LRUTTLCache(max_entries=0, max_bytes=10_000, ttl_seconds=60)
+
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_size_estimate_follows_references():
+    text = "x" * 10_000
+
+    # Shallow sizes would only count the containers, not the referenced text
+    assert estimate_size("key", {"review": text}) > 10_000
+    assert estimate_size("key", [(text,)]) > 10_000
+    stats = SentimentStatsResponse(
+        product_id=text, positive=0.5, neutral=0.25, negative=0.25
+    )
+    assert estimate_size("key", stats) > 10_000
+    # Shared objects are counted once
+    assert estimate_size("key", [text, text]) < 20_000
@@ -0,0 +1,52 @@
+"""Unit tests for the logging sinks and request-line sampling."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+from app.core.logger import BackgroundWriter, _sampling_filter, logger
+
+
+@pytest.mark.asyncio
+async def test_background_writer_writes_in_order():
+    stream = io.StringIO()
+    writer = BackgroundWriter(stream)
+    handler_id = logger.add(writer, format="{message}", level="INFO")
+
+    try:
+        for i in range(100):
+            logger.info("line {i}", i=i)
+        await logger.complete()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(100)]
+    finally:
+        logger.remove(handler_id)
+
+
+def test_sampling_filter_only_samples_request_info_lines():
+    stream = io.StringIO()
+    handler_id = logger.add(
+        stream, format="{message}", level="DEBUG", filter=_sampling_filter(0.0)
+    )
+
+    try:
+        sampled = logger.bind(sampled=True)
+        sampled.info("dropped")
+        sampled.warning("sampled warning")
+        logger.info("unsampled info")
+
+        assert stream.getvalue().splitlines() == [
+            "sampled warning",
+            "unsampled info",
+        ]
+    finally:
+        logger.remove(handler_id)
+
+
+def test_sampling_filter_keeps_expected_fraction():
+    keep = _sampling_filter(0.25)
+    record = {"extra": {"sampled": True}, "level": logger.level("INFO")}
+
+    with patch("app.core.logger.random.random", side_effect=[0.1, 0.3, 0.2, 0.9]):
+        assert [keep(record) for _ in range(4)] == [True, False, True, False]
@@ -0,0 +1,21 @@
+"""Unit tests for API key resolution."""
+
+from unittest.mock import patch
+
+from app.core.config import ApiKeyConfig, settings
+from app.core.security import DEFAULT_CLIENT, resolve_api_key
+
+
+def test_api_keys_resolve_to_their_client():
+    api_keys = {"backfill": ApiKeyConfig(key="bulk-key", traffic_class="bulk")}
+
+    with patch.object(settings, "api_keys", api_keys):
+        default = resolve_api_key(settings.api_key)
+        backfill = resolve_api_key("bulk-key")
+        unknown = resolve_api_key("wrong-key")
+
+    assert (default.name, default.traffic_class) == (DEFAULT_CLIENT, "interactive")
+    assert (backfill.name, backfill.traffic_class) == ("backfill", "bulk")
+    assert backfill.weight == 1.0
+    assert unknown is None
+    assert resolve_api_key(None) is None
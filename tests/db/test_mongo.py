@@ -0,0 +1,50 @@
+"""Tests for the MongoDB client options and pool metrics."""
+
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.db.mongo import PoolMetricsListener, client_options
+
+
+def test_client_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "mongo_max_pool_size", 50)
+    monkeypatch.setattr(settings, "mongo_min_pool_size", 5)
+    monkeypatch.setattr(settings, "mongo_wait_queue_timeout_ms", 250)
+    monkeypatch.setattr(settings, "mongo_compressors", "zstd,snappy")
+    monkeypatch.setattr(settings, "mongo_write_concern", "majority")
+    monkeypatch.setattr(settings, "mongo_journal", True)
+
+    options = client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["minPoolSize"] == 5
+    assert options["waitQueueTimeoutMS"] == 250
+    assert options["compressors"] == "zstd,snappy"
+    assert options["w"] == "majority"
+    assert options["journal"] is True
+
+
+def test_client_options_defaults_omit_unset_values(monkeypatch):
+    monkeypatch.setattr(settings, "mongo_wait_queue_timeout_ms", None)
+    monkeypatch.setattr(settings, "mongo_compressors", "")
+    monkeypatch.setattr(settings, "mongo_write_concern", "1")
+    monkeypatch.setattr(settings, "mongo_journal", None)
+
+    options = client_options()
+
+    assert options["w"] == 1
+    assert "waitQueueTimeoutMS" not in options
+    assert "compressors" not in options
+    assert "journal" not in options
+
+
+def test_pool_listener_records_checkout_wait():
+    labels = {"outcome": "ok"}
+    before = REGISTRY.get_sample_value("mongo_pool_checkout_seconds_count", labels)
+
+    PoolMetricsListener().connection_checked_out(SimpleNamespace(duration=0.002))
+
+    after = REGISTRY.get_sample_value("mongo_pool_checkout_seconds_count", labels)
+    assert after == (before or 0) + 1
@@ -0,0 +1,223 @@
+"""Tests for review persistence and the write-behind buffer."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.models.review import ReviewRequest, ReviewResponse
+from app.repositories import stats_repository
+from app.repositories.review_repository import (
+    ReviewWriteBuffer,
+    save_review,
+    save_reviews,
+)
+from app.repositories.stats_repository import (
+    fetch_sentiment_distribution_by_product,
+    fetch_sentiment_distributions,
+    fetch_sentiment_trend,
+    rebuild_sentiment_counters,
+)
+
+
+def _review(product_id: str = "product-1") -> tuple[ReviewRequest, ReviewResponse]:
+    return (
+        ReviewRequest(product_id=product_id, review="Great product!"),
+        ReviewResponse(sentiment="positive", confidence=0.99),
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_buffer_flushes_on_interval():
+    db = AsyncMongoMockClient()["test"]
+    flushed = []
+    writer = ReviewWriteBuffer(
+        db, max_batch_size=100, flush_interval_ms=10, on_flush=flushed.append
+    )
+    await writer.start()
+
+    await writer.add(*_review())
+    assert await db.reviews.count_documents({}) == 0
+
+    await asyncio.sleep(0.1)
+    assert await db.reviews.count_documents({}) == 1
+    assert await db.review_counters.find_one({"_id": "product-1"}) == {
+        "_id": "product-1",
+        "positive": 1,
+        "total": 1,
+        "backfilled": True,
+    }
+    assert flushed == [{"product-1"}]
+
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_write_buffer_applies_backpressure_and_drains_on_stop():
+    db = AsyncMongoMockClient()["test"]
+    writer = ReviewWriteBuffer(
+        db, max_batch_size=2, flush_interval_ms=60_000, max_pending=2
+    )
+    await writer.start()
+
+    await writer.add(*_review("product-a"))
+    await writer.add(*_review("product-b"))
+    # The buffer is full: the third review waits until a flush frees room
+    third = asyncio.create_task(writer.add(*_review("product-c")))
+    await asyncio.sleep(0.05)
+    assert third.done()
+    assert await db.reviews.count_documents({}) == 2
+
+    await writer.stop()
+    assert await db.reviews.count_documents({}) == 3
+    assert writer.written == 3
+    assert writer.depth == 0
+
+    with pytest.raises(RuntimeError):
+        await writer.add(*_review())
+
+
+@pytest.mark.asyncio
+async def test_save_reviews_maintains_hourly_and_daily_rollups():
+    db = AsyncMongoMockClient()["test"]
+    reviews = [ReviewRequest(product_id="product-1", review="Great product!")] * 3
+    results = [
+        ReviewResponse(sentiment="positive", confidence=0.9),
+        ReviewResponse(sentiment="negative", confidence=0.8),
+        ReviewResponse(sentiment="positive", confidence=0.7),
+    ]
+    created_at = [
+        datetime(2025, 1, 1, 13, 5, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, 13, 55, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, 14, 10, tzinfo=timezone.utc),
+    ]
+
+    await save_reviews(db, reviews, results, created_at)
+
+    review = await db.reviews.find_one({"sentiment": "negative"})
+    assert review["created_at"].replace(tzinfo=timezone.utc) == created_at[1]
+
+    hourly = await fetch_sentiment_trend(
+        db,
+        "product-1",
+        "hour",
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+    assert [(r["positive"], r.get("negative", 0), r["total"]) for r in hourly] == [
+        (1, 1, 2),
+        (1, 0, 1),
+    ]
+
+    daily = await fetch_sentiment_trend(
+        db,
+        "product-1",
+        "day",
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+    assert [(r["positive"], r["negative"], r["total"]) for r in daily] == [(2, 1, 3)]
+
+
+@pytest.mark.asyncio
+async def test_trend_merges_duplicate_rollups_of_a_bucket():
+    db = AsyncMongoMockClient()["test"]
+    bucket = datetime(2025, 1, 1, 13, tzinfo=timezone.utc)
+    # Concurrent upserts from before the unique rollup index existed
+    await db.review_rollups.insert_many(
+        [
+            {
+                "product_id": "product-1",
+                "granularity": "hour",
+                "bucket": bucket,
+                "positive": 2,
+                "total": 2,
+            },
+            {
+                "product_id": "product-1",
+                "granularity": "hour",
+                "bucket": bucket,
+                "negative": 1,
+                "total": 1,
+            },
+        ]
+    )
+
+    trend = await fetch_sentiment_trend(
+        db,
+        "product-1",
+        "hour",
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+
+    assert len(trend) == 1
+    assert (trend[0]["positive"], trend[0]["negative"], trend[0]["total"]) == (
+        2,
+        1,
+        3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_counters_created_after_existing_reviews_are_not_trusted():
+    db = AsyncMongoMockClient()["test"]
+    # Reviews stored before counters existed
+    await db.reviews.insert_many(
+        [
+            {"product_id": "product-1", "sentiment": "negative"},
+            {"product_id": "product-1", "sentiment": "negative"},
+            {"product_id": "product-1", "sentiment": "negative"},
+        ]
+    )
+
+    # The first write after deploy creates a counter covering only itself
+    await save_review(db, *_review())
+    review, result = _review("product-2")
+    await save_reviews(db, [review], [result])
+
+    counter = await db.review_counters.find_one({"_id": "product-1"})
+    assert counter["total"] == 1 and "backfilled" not in counter
+    expected = {"positive": 0.25, "neutral": 0.0, "negative": 0.75}
+    assert await fetch_sentiment_distribution_by_product(db, "product-1") == expected
+    assert await fetch_sentiment_distributions(db, ["product-1", "product-2"]) == {
+        "product-1": expected,
+        "product-2": {"positive": 1.0, "neutral": 0.0, "negative": 0.0},
+    }
+    # product-2 had no earlier reviews, so its counter is complete
+    assert (await db.review_counters.find_one({"_id": "product-2"}))["backfilled"]
+
+    await rebuild_sentiment_counters(db)
+    counter = await db.review_counters.find_one({"_id": "product-1"})
+    assert counter["total"] == 4 and counter["backfilled"]
+
+
+@pytest.mark.asyncio
+async def test_counter_rebuild_keeps_reviews_written_meanwhile():
+    db = AsyncMongoMockClient()["test"]
+    await db.reviews.insert_many(
+        [{"product_id": "product-1", "sentiment": "negative"} for _ in range(3)]
+    )
+    await save_review(db, *_review())
+
+    count = stats_repository.aggregate_sentiment_counts
+    written = []
+
+    async def count_then_write(*args, **kwargs):
+        counts = await count(*args, **kwargs)
+        if not written:
+            # A review stored between the recount and the counter update
+            written.append(await save_review(db, *_review()))
+        return counts
+
+    with patch.object(
+        stats_repository, "aggregate_sentiment_counts", side_effect=count_then_write
+    ):
+        assert await rebuild_sentiment_counters(db) == 1
+
+    counter = await db.review_counters.find_one({"_id": "product-1"})
+    assert (counter["total"], counter["negative"], counter["positive"]) == (5, 3, 2)
+    assert counter["backfilled"]
+    assert "review_counters_rebuild" not in await db.list_collection_names()
@@ -0,0 +1,51 @@
+"""Tests for the ONNX Runtime inference backend."""
+
+from unittest.mock import patch
+
+import pytest
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.services.backends import (
+    OnnxBackend,
+    TorchBackend,
+    compare_backends,
+    create_backend,
+    export_onnx,
+)
+
+pytest.importorskip("onnxruntime")
+
+
+def test_onnx_backend_matches_torch(tmp_path):
+    """The ONNX export should reproduce the PyTorch probabilities."""
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(settings.model_name)
+    model.eval()
+
+    path = export_onnx(model, tokenizer, tmp_path / "model.onnx")
+
+    diff = compare_backends(
+        tokenizer, TorchBackend(model, torch.device("cpu")), OnnxBackend(path)
+    )
+    assert diff <= settings.onnx_tolerance
+
+
+def test_export_checked_by_the_launcher_is_not_compared_again(tmp_path):
+    """Workers get a model whose weights were freed once the export was checked."""
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(settings.model_name)
+    model.eval()
+    path = export_onnx(model, tokenizer, tmp_path / "model.onnx")
+    model.to(torch.device("meta"))
+
+    with patch.object(settings, "inference_backend", "onnx"), patch(
+        "app.services.backends.onnx_model_path", return_value=path
+    ), patch("app.services.backends.compare_backends") as compare:
+        backend = create_backend(
+            model, tokenizer, torch.device("cpu"), settings.model_name
+        )
+
+    assert isinstance(backend, OnnxBackend)
+    compare.assert_not_called()
@@ -0,0 +1,200 @@
+"""Unit tests for the micro-batching inference engine."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.admission import RequestBudget, current_budget
+from app.core.exceptions import OverloadedError, RequestAbandonedError
+from app.services.inference import BatchingEngine, sentiment_labels
+
+
+class FakeTokenizer:
+    """Tokenizer producing one token per character."""
+
+    pad_token_id = 0
+
+    def __call__(self, texts, truncation=True, max_length=512):
+        ids = [[1] * min(len(text), max_length) for text in texts]
+        return {"input_ids": ids, "attention_mask": ids}
+
+
+class FakeBackend:
+    """Backend recording the shape of every forward pass."""
+
+    name = "fake"
+    tensor_type = "np"
+
+    def __init__(self):
+        self.shapes = []
+
+    def predict_proba(self, inputs):
+        self.shapes.append(inputs["input_ids"].shape)
+        return np.tile([0.1, 0.9], (len(inputs["input_ids"]), 1))
+
+
+def test_forward_pads_each_length_bucket_separately():
+    backend = FakeBackend()
+    engine = BatchingEngine(
+        backend, FakeTokenizer(), max_length=100, length_buckets=[4, 8, 256]
+    )
+
+    results = engine._forward(["ab", "abcdef", "abc", "x" * 50, "x" * 200])
+
+    assert len(results) == 5
+    assert all(r.sentiment == "positive" for r in results)
+    # Buckets above max_length are dropped; long reviews are truncated to it
+    assert backend.shapes == [(2, 3), (1, 6), (2, 100)]
+    assert engine.real_tokens == 2 + 6 + 3 + 50 + 100
+    assert engine.padded_tokens == 2 * 3 + 6 + 2 * 100
+
+
+@pytest.mark.asyncio
+async def test_concurrent_predictions_are_batched():
+    backend = FakeBackend()
+    engine = BatchingEngine(
+        backend, FakeTokenizer(), max_batch_size=8, length_buckets=[]
+    )
+    await engine.start()
+
+    try:
+        texts = [f"review {i}" for i in range(8)]
+        results = await engine.predict_many(texts)
+    finally:
+        await engine.stop()
+
+    assert len(results) == 8
+    assert backend.shapes == [(8, 8)]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_every_bucket_without_recording_stats():
+    backend = FakeBackend()
+    engine = BatchingEngine(
+        backend, FakeTokenizer(), max_batch_size=8, max_length=64, length_buckets=[16]
+    )
+    await engine.start()
+
+    try:
+        await engine.warm_up(batch_sizes=[1, 32])
+    finally:
+        await engine.stop()
+
+    # Batch sizes are capped at max_batch_size; max_length is always exercised
+    assert sorted(backend.shapes) == [(1, 16), (1, 64), (8, 16), (8, 64)]
+    assert engine.padded_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_refused_when_backlog_exceeds_latency_budget():
+    engine = BatchingEngine(
+        FakeBackend(),
+        FakeTokenizer(),
+        max_batch_size=4,
+        max_queue_latency_ms=1000,
+        length_buckets=[],
+    )
+    await engine.start()
+
+    try:
+        # As if every batch had taken 0.5s so far
+        engine.batch_seconds = 0.5
+        # 8 reviews = 2 batches = ~1s of queueing: admitted
+        assert len(await engine.predict_many(["ok"] * 8)) == 8
+        engine.batch_seconds = 0.5
+        with pytest.raises(OverloadedError) as exc:
+            await engine.predict_many(["ok"] * 12)
+    finally:
+        await engine.stop()
+
+    assert exc.value.retry_after == 2
+
+
+@pytest.mark.asyncio
+async def test_abandoned_requests_are_dropped_before_the_forward_pass():
+    backend = FakeBackend()
+    engine = BatchingEngine(backend, FakeTokenizer(), length_buckets=[])
+    await engine.start()
+
+    budget = RequestBudget()
+    token = current_budget.set(budget)
+    try:
+        budget.disconnected = True
+        results = await engine.predict_many(["gone", "away"])
+    finally:
+        current_budget.reset(token)
+        await engine.stop()
+
+    assert all(isinstance(r, RequestAbandonedError) for r in results)
+    assert backend.shapes == []
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_requests_waiting_for_room_in_the_queue():
+    engine = BatchingEngine(
+        FakeBackend(), FakeTokenizer(), max_queue_size=1, length_buckets=[]
+    )
+    # Not started: the first review fills the queue, the others wait for room
+    predictions = [asyncio.create_task(engine.predict(text)) for text in "abc"]
+    await asyncio.sleep(0.01)
+
+    await engine.stop()
+    results = await asyncio.wait_for(
+        asyncio.gather(*predictions, return_exceptions=True), 1
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class BlockingBackend(FakeBackend):
+    """Backend whose forward pass waits until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict_proba(self, inputs):
+        self.started.set()
+        self.release.wait(5)
+        return super().predict_proba(inputs)
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_requests_of_the_batch_in_flight():
+    backend = BlockingBackend()
+    engine = BatchingEngine(backend, FakeTokenizer(), length_buckets=[])
+    await engine.start()
+
+    prediction = asyncio.create_task(engine.predict("stuck in the model"))
+    await asyncio.to_thread(backend.started.wait, 5)
+
+    # stop() waits for the forward pass in progress to finish
+    threading.Timer(0.05, backend.release.set).start()
+    await engine.stop()
+
+    with pytest.raises(RuntimeError, match="shut down"):
+        await asyncio.wait_for(prediction, 1)
+
+
+def test_sentiment_labels_follow_model_config():
+    def model(id2label):
+        return SimpleNamespace(config=SimpleNamespace(id2label=id2label))
+
+    assert sentiment_labels(model({0: "NEGATIVE", 1: "POSITIVE"})) == [
+        "negative",
+        "positive",
+    ]
+    assert sentiment_labels(model({0: "neg", 1: "neutral", 2: "Positive"})) == [
+        "negative",
+        "neutral",
+        "positive",
+    ]
+    # Generic class names fall back to binary negative/positive
+    assert sentiment_labels(model({0: "LABEL_0", 1: "LABEL_1"})) == [
+        "negative",
+        "positive",
+    ]
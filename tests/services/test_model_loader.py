@@ -0,0 +1,35 @@
+"""Unit tests for model loading and reuse of the preloaded model."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services import model_loader
+
+
+@pytest.fixture
+def hub():
+    """Fake Hugging Face loaders, returning a new model on every call."""
+    with patch.object(model_loader, "AutoTokenizer"), patch.object(
+        model_loader, "AutoModelForSequenceClassification"
+    ) as model_class, patch.object(
+        model_loader, "quantize_model", side_effect=lambda model, *args: model
+    ):
+        model_class.from_pretrained.side_effect = lambda name: MagicMock()
+        yield model_class.from_pretrained
+
+
+def test_load_model_reuses_preloaded_model_unless_reloading(hub):
+    preloaded = (MagicMock(), MagicMock(), "cpu")
+
+    with patch.object(model_loader, "_preloaded", preloaded):
+        assert model_loader.load_model(settings.model_name) is preloaded
+        hub.assert_not_called()
+
+        model, _, _ = model_loader.load_model(
+            settings.model_name, "cpu", use_preloaded=False
+        )
+
+    hub.assert_called_once_with(settings.model_name)
+    assert model is not preloaded[0]
@@ -0,0 +1,29 @@
+"""Tests for dynamic int8 quantization of the sentiment model."""
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.core.config import settings
+from app.services.quantization import load_labelled_sample, validate_quantized_model
+
+
+def test_labelled_sample_is_balanced():
+    texts, labels = load_labelled_sample()
+
+    assert len(texts) == len(labels) > 0
+    assert labels.mean() == 0.5
+
+
+def test_quantized_model_agrees_with_fp32():
+    """The int8 model should stay above the configured agreement threshold."""
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(settings.model_name)
+    model.eval()
+
+    quantized = torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    report = validate_quantized_model(model, quantized, tokenizer)
+
+    assert report["agreement"] >= settings.quantization_min_agreement
+    assert report["int8_size_mb"] < report["fp32_size_mb"]
@@ -0,0 +1,204 @@
+"""Unit tests for the model registry."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.inference import BatchingEngine
+from app.services.registry import DEFAULT_MODEL, ModelRegistry
+
+SIZES = {"small-model": 100, "large-model": 300, "other-model": 200}
+
+
+def fake_engine() -> MagicMock:
+    engine = MagicMock()
+    for method in ("start", "warm_up", "drain", "stop"):
+        setattr(engine, method, AsyncMock())
+    return engine
+
+
+def fake_load(model_id: str, use_preloaded: bool = True):
+    model = MagicMock()
+    model.model_id = model_id
+    return model, MagicMock(), "cpu", fake_engine()
+
+
+class PositiveBackend:
+    """Backend classifying every review as positive."""
+
+    name = "fake"
+    tensor_type = "np"
+
+    def predict_proba(self, inputs):
+        return np.tile([0.1, 0.9], (len(inputs["input_ids"]), 1))
+
+
+def tokenize(texts, truncation=True, max_length=512):
+    ids = [[1] * min(len(text), max_length) for text in texts]
+    return {"input_ids": ids, "attention_mask": ids}
+
+
+def batching_load(model_id: str, use_preloaded: bool = True):
+    model = MagicMock()
+    model.model_id = model_id
+    tokenizer = MagicMock(side_effect=tokenize, pad_token_id=0)
+    engine = BatchingEngine(
+        PositiveBackend(), tokenizer, max_wait_ms=200, length_buckets=[]
+    )
+    return model, tokenizer, "cpu", engine
+
+
+@pytest.fixture
+def loader():
+    with patch(
+        "app.services.model_loader.load_inference_engine", side_effect=fake_load
+    ) as load, patch(
+        "app.services.model_loader.parameter_bytes",
+        side_effect=lambda model: SIZES[model.model_id],
+    ):
+        yield load
+
+
+@pytest.mark.asyncio
+async def test_registry_loads_models_lazily_once(loader):
+    registry = ModelRegistry(
+        {DEFAULT_MODEL: "small-model", "large": "large-model"},
+        warmup_batch_sizes=[1],
+    )
+
+    assert registry.state("large") == "unloaded"
+    first, second = await asyncio.gather(registry.get("large"), registry.get("large"))
+
+    assert first is second
+    assert first.model_id == "large-model"
+    assert registry.state("large") == "ready"
+    first.engine.warm_up.assert_awaited_once_with([1])
+    loader.assert_called_once_with("large-model", use_preloaded=True)
+
+    with pytest.raises(KeyError):
+        await registry.get("missing")
+
+
+@pytest.mark.asyncio
+async def test_registry_unloads_least_recently_used_over_budget(loader):
+    registry = ModelRegistry(
+        {DEFAULT_MODEL: "small-model", "large": "large-model", "other": "other-model"},
+        memory_budget_bytes=450,
+    )
+
+    default = await registry.get()
+    large = await registry.get("large")
+    other = await registry.get("other")
+    await registry.close()
+
+    # The default model is pinned; "large" was the least recently used
+    large.engine.drain.assert_awaited_once()
+    large.engine.stop.assert_awaited_once()
+    assert default.engine.stop.await_count == 1
+    assert other.engine.stop.await_count == 1
+    assert registry.loaded == []
+
+
+@pytest.mark.asyncio
+async def test_registry_reload_swaps_versions_and_rolls_back(loader):
+    swapped = []
+    registry = ModelRegistry(
+        {DEFAULT_MODEL: "small-model"},
+        on_swap=lambda loaded: swapped.append(loaded),
+        allowed_models=["large-model"],
+    )
+
+    with pytest.raises(ValueError):
+        registry.rollback(DEFAULT_MODEL)
+    # Only registered and explicitly allowed models can be loaded
+    with pytest.raises(PermissionError):
+        registry.reload(DEFAULT_MODEL, "/tmp/untrusted-model")
+
+    old = await registry.get()
+    new = await registry.reload(DEFAULT_MODEL, "large-model")
+
+    assert registry.current() is new
+    assert (new.model_id, new.version) == ("large-model", 2)
+    assert new.namespace != old.namespace
+    assert registry.previous() == "small-model"
+    assert swapped == [old, new]
+    # A reload never reuses the model preloaded by the launcher
+    assert [c.kwargs for c in loader.call_args_list] == [
+        {"use_preloaded": True},
+        {"use_preloaded": False},
+    ]
+    await asyncio.gather(*registry._retiring)
+    old.engine.drain.assert_awaited_once()
+    old.engine.stop.assert_awaited_once()
+
+    restored = await registry.rollback(DEFAULT_MODEL)
+    assert (restored.model_id, restored.version) == ("small-model", 3)
+    assert registry.specs[DEFAULT_MODEL] == "small-model"
+
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_reload_during_first_load_replaces_it(loader):
+    released = threading.Event()
+
+    def slow_first_load(model_id: str, use_preloaded: bool = True):
+        if model_id == "small-model":
+            released.wait(5)
+        return fake_load(model_id, use_preloaded)
+
+    loader.side_effect = slow_first_load
+    registry = ModelRegistry(
+        {DEFAULT_MODEL: "small-model"}, allowed_models=["large-model"]
+    )
+
+    first = asyncio.create_task(registry.get())
+    await asyncio.sleep(0.01)
+    reload = registry.reload(DEFAULT_MODEL, "large-model")
+    await asyncio.sleep(0.05)
+    released.set()
+    first, new = await asyncio.gather(first, reload)
+
+    assert registry.current() is new
+    assert registry.specs[DEFAULT_MODEL] == "large-model"
+    await asyncio.gather(*registry._retiring)
+    first.engine.stop.assert_awaited_once()
+
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_registry_failed_reload_keeps_current_version(loader):
+    registry = ModelRegistry(
+        {DEFAULT_MODEL: "small-model"}, allowed_models=["missing-model"]
+    )
+    current = await registry.get()
+
+    loader.side_effect = OSError("model not found")
+    assert await registry.reload(DEFAULT_MODEL, "missing-model") is None
+
+    assert registry.current() is current
+    assert registry.last_error() == "model not found"
+    current.engine.stop.assert_not_awaited()
+
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_reload_serves_the_batch_being_collected(loader):
+    loader.side_effect = batching_load
+    registry = ModelRegistry({DEFAULT_MODEL: "small-model"})
+    old = await registry.get()
+
+    # Taken off the queue, waiting in the batch window for more reviews
+    prediction = asyncio.create_task(old.engine.predict("Great product!"))
+    await asyncio.sleep(0.01)
+    await registry.reload(DEFAULT_MODEL)
+    await asyncio.gather(*registry._retiring)
+
+    assert (await prediction).sentiment == "positive"
+
+    await registry.close()
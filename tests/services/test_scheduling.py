@@ -0,0 +1,61 @@
+"""Unit tests for the priority and weighted-fair inference queue."""
+
+import asyncio
+
+import pytest
+
+from app.services.scheduling import FairQueue
+
+
+def drain(queue: FairQueue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_interactive_items_are_served_before_bulk_ones():
+    queue = FairQueue()
+    queue.put_nowait("bulk-1", "bulk", "backfill")
+    queue.put_nowait("bulk-2", "bulk", "backfill")
+    queue.put_nowait("web-1", "interactive", "web")
+
+    assert queue.qsize_ahead("interactive") == 1
+    assert queue.qsize_ahead("bulk") == 3
+    assert drain(queue) == ["web-1", "bulk-1", "bulk-2"]
+
+
+def test_clients_of_a_class_share_it_by_weight():
+    queue = FairQueue()
+    # One client floods the class before the others queue anything
+    for i in range(6):
+        queue.put_nowait(f"a{i}", "bulk", "a", weight=1)
+    for i in range(4):
+        queue.put_nowait(f"b{i}", "bulk", "b", weight=2)
+    queue.put_nowait("c0", "bulk", "c", weight=1)
+
+    served = drain(queue)
+
+    # b gets twice a's share, and c is served early despite arriving last
+    assert served[:6] == ["b0", "a0", "b1", "c0", "b2", "a1"]
+    assert sorted(served) == sorted(
+        [f"a{i}" for i in range(6)] + [f"b{i}" for i in range(4)] + ["c0"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_class_is_bounded_separately():
+    queue = FairQueue(maxsize=1)
+    await queue.put("bulk-1", "bulk", "backfill")
+
+    # A full bulk class does not block interactive callers
+    await asyncio.wait_for(queue.put("web-1", "interactive", "web"), 0.1)
+
+    blocked = asyncio.create_task(queue.put("bulk-2", "bulk", "backfill"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert await queue.get() == "web-1"
+    assert await queue.get() == "bulk-1"
+    await asyncio.wait_for(blocked, 0.1)
+    assert await queue.get() == "bulk-2"
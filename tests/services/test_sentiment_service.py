@@ -0,0 +1,73 @@
+"""Unit tests for the sentiment analysis service."""
+
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.cache import LRUTTLCache
+from app.core.context import context
+from app.core.exceptions import OverloadedError
+from app.core.logger import logger
+from app.models.review import ReviewRequest, ReviewResponse
+from app.services import sentiment
+from app.services.sentiment import (
+    analyze_and_store_sentiment,
+    analyze_and_store_sentiment_batch,
+)
+
+
+@pytest.mark.asyncio
+async def test_shed_requests_are_not_logged_as_errors():
+    engine = MagicMock()
+    engine.predict = AsyncMock(side_effect=OverloadedError("Backlog too long."))
+    stream = io.StringIO()
+    handler_id = logger.add(stream, format="{message}", level="ERROR")
+
+    try:
+        with patch.object(context, "get_engine", return_value=engine), patch.object(
+            context, "get_prediction_cache", return_value=LRUTTLCache(16, 2**20, 60)
+        ), pytest.raises(OverloadedError):
+            await analyze_and_store_sentiment(
+                ReviewRequest(product_id="prod1", review="Great product!")
+            )
+        await logger.complete()
+    finally:
+        logger.remove(handler_id)
+
+    assert stream.getvalue() == ""
+
+
+@pytest.mark.asyncio
+async def test_overloaded_model_only_fails_its_own_batch_reviews():
+    positive = ReviewResponse(sentiment="positive", confidence=0.9)
+    engines = {None: MagicMock(), "large": MagicMock()}
+    engines[None].predict_many = AsyncMock(return_value=[positive])
+    engines["large"].predict_many = AsyncMock(
+        side_effect=OverloadedError("Backlog too long.")
+    )
+
+    async def resolve_engine(model):
+        return str(model), engines[model]
+
+    requests = [
+        ReviewRequest(product_id="prod1", review="Great product!"),
+        ReviewRequest(product_id="prod1", review="Great product!", model="large"),
+    ]
+
+    with patch.object(
+        sentiment, "_resolve_engine", side_effect=resolve_engine
+    ), patch.object(
+        context, "get_prediction_cache", return_value=LRUTTLCache(16, 2**20, 60)
+    ), patch.object(
+        context, "get_db", return_value=AsyncMock()
+    ), patch.object(
+        sentiment, "save_reviews", AsyncMock(return_value=[])
+    ) as save_reviews, patch.object(
+        sentiment, "invalidate_sentiment_stats"
+    ):
+        response = await analyze_and_store_sentiment_batch(requests)
+
+    assert response.results[0].result == positive
+    assert response.results[1].error == "Backlog too long."
+    assert save_reviews.await_args.args[1:] == ([requests[0]], [positive])
@@ -0,0 +1,121 @@
+"""Unit tests for the multi-process launcher helpers."""
+
+import multiprocessing
+import os
+import signal
+import time
+from unittest.mock import MagicMock, patch
+
+import torch
+
+from app.core.config import settings
+from app.serve import core_slices, supervise, use_multiprocess_metrics
+from app.services import model_loader
+
+
+def test_core_slices_split_cores_evenly():
+    assert core_slices(2, [0, 1, 2, 3]) == [[0, 1], [2, 3]]
+    assert core_slices(3, [0, 1, 2, 3, 4, 5, 6]) == [[0, 1, 2], [3, 4], [5, 6]]
+    assert core_slices(1, [4, 5]) == [[4, 5]]
+
+
+def test_core_slices_share_cores_when_oversubscribed():
+    assert core_slices(3, [0, 1]) == [[0], [1], [0]]
+
+
+def test_metrics_dir_is_cleared_of_earlier_runs(tmp_path):
+    stale = tmp_path / "counter_1.db"
+    own = tmp_path / f"counter_{os.getpid()}.db"
+    stale.touch()
+    own.touch()
+
+    with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}):
+        assert use_multiprocess_metrics([]) == str(tmp_path)
+
+    assert not stale.exists()
+    assert own.exists()
+
+
+def test_preload_model_moves_weights_to_shared_memory():
+    model = torch.nn.Linear(4, 2)
+    loaded = (model, MagicMock(), torch.device("cpu"))
+
+    with patch.object(model_loader, "load_model", return_value=loaded), patch.object(
+        model_loader, "_preloaded", None
+    ), patch.object(settings, "inference_backend", "torch"):
+        model_loader.preload_model()
+        assert model_loader._preloaded == loaded
+
+    assert all(param.is_shared() for param in model.parameters())
+
+
+def test_preload_model_frees_torch_weights_with_onnx_backend():
+    model = torch.nn.Linear(4, 2)
+    loaded = (model, MagicMock(), torch.device("cpu"))
+
+    with patch.object(model_loader, "load_model", return_value=loaded), patch.object(
+        model_loader, "create_backend"
+    ) as create_backend, patch.object(model_loader, "_preloaded", None), patch.object(
+        settings, "inference_backend", "onnx"
+    ):
+        model_loader.preload_model()
+        assert model_loader._preloaded == loaded
+
+    # The export is checked once in the launcher, then the weights are dropped
+    create_backend.assert_called_once()
+    assert all(param.is_meta for param in model.parameters())
+
+
+def _report_preloaded_reuse(conn, preloaded_id):
+    with patch.object(
+        model_loader, "AutoModelForSequenceClassification"
+    ) as model_class:
+        model, _, _ = model_loader.load_model(settings.model_name)
+        conn.send(id(model) == preloaded_id and not model_class.called)
+    conn.close()
+
+
+def test_forked_worker_reuses_preloaded_model():
+    preloaded = (MagicMock(), MagicMock(), "cpu")
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+
+    with patch.object(model_loader, "_preloaded", preloaded):
+        worker = ctx.Process(
+            target=_report_preloaded_reuse, args=(child_conn, id(preloaded[0]))
+        )
+        worker.start()
+    worker.join(timeout=10)
+
+    assert worker.exitcode == 0
+    assert parent_conn.recv() is True
+
+
+def _stop_launcher():
+    time.sleep(0.2)  # Let the launcher register this worker first
+    os.kill(os.getppid(), signal.SIGTERM)
+    time.sleep(30)
+
+
+def test_dead_worker_is_restarted_on_the_same_cores(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    spawned = []
+
+    def spawn(cores):
+        # The first worker dies at once, its replacement stops the launcher
+        target = _stop_launcher if spawned else os._exit
+        args = () if spawned else (1,)
+        spawned.append(cores)
+        proc = ctx.Process(target=target, args=args)
+        proc.start()
+        return proc
+
+    handlers = signal.getsignal(signal.SIGTERM), signal.getsignal(signal.SIGINT)
+    try:
+        with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}):
+            supervise(spawn, [[2, 3]])
+    finally:
+        signal.signal(signal.SIGTERM, handlers[0])
+        signal.signal(signal.SIGINT, handlers[1])
+
+    assert spawned == [[2, 3], [2, 3]]
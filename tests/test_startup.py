@@ -0,0 +1,80 @@
+"""Import-time and startup regression tests for the application factory."""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from app import _ensure_indexes, _start_inference
+from app.core.context import context
+
+# Modules that must only be imported once the model starts loading
+HEAVY_MODULES = ("torch", "transformers", "onnxruntime", "numpy")
+
+# Generous bound on the cumulative import time of ``app.main`` (seconds)
+IMPORT_TIME_BUDGET = 3.0
+
+
+def test_import_does_not_load_ml_stack():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Each line: "import time: self [us] | cumulative | imported package"
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+
+    loaded = {name.split(".")[0] for name in profile}
+    assert not loaded & set(HEAVY_MODULES)
+    assert profile["app.main"] / 1e6 < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.asyncio
+async def test_model_is_not_ready_before_the_indexes_exist():
+    registry = MagicMock(get=AsyncMock())
+    indexes_created = asyncio.Event()
+
+    with patch.object(context, "registry", registry), patch.object(
+        context, "model_state", "loading"
+    ):
+        startup = asyncio.create_task(
+            _start_inference(asyncio.create_task(indexes_created.wait()))
+        )
+        await asyncio.sleep(0.05)
+        assert context.model_state == "loading"
+
+        indexes_created.set()
+        await startup
+        assert context.model_state == "ready"
+
+
+@pytest.mark.asyncio
+async def test_model_stays_not_ready_until_index_creation_succeeds():
+    ensure_indexes = AsyncMock(side_effect=[OperationFailure("duplicate key"), None])
+
+    with patch("app.ensure_indexes", ensure_indexes), patch(
+        "app.INDEX_RETRY_SECONDS", 0.05
+    ), patch.object(context, "registry", MagicMock(get=AsyncMock())), patch.object(
+        context, "model_state", "loading"
+    ):
+        indexes = asyncio.create_task(_ensure_indexes(MagicMock()))
+        startup = asyncio.create_task(_start_inference(indexes))
+        await asyncio.sleep(0.01)
+        assert context.model_state == "loading"
+
+        await startup
+        assert context.model_state == "ready"
+
+    assert ensure_indexes.await_count == 2
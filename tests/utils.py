@@ -4,6 +4,7 @@ import asyncio
 import socket
 
 import uvicorn
+from httpx import AsyncClient
 
 
 def get_open_port() -> int:
@@ -55,6 +56,23 @@ async def wait_for_port(port: int, host: str = "127.0.0.1", timeout: float = 20.
                 )
 
 
+async def wait_for_ready(port: int, host: str = "127.0.0.1", timeout: float = 20.0):
+    """
+    Wait until the readiness endpoint reports the model as ready.
+
+    Args:
+        port (int): Port the server listens on.
+        host (str): Host address of the server.
+        timeout (float): Max time to wait before raising TimeoutError.
+    """
+    start = asyncio.get_event_loop().time()
+    async with AsyncClient(base_url=f"http://{host}:{port}") as client:
+        while (await client.get("/health/ready")).status_code != 200:
+            await asyncio.sleep(0.1)
+            if asyncio.get_event_loop().time() - start > timeout:
+                raise TimeoutError(f"Timed out waiting for {host}:{port} to be ready")
+
+
 class AsyncCursorMock:
     """
     A simple async iterable to mock MongoDB cursors.